@@ -0,0 +1,236 @@
+"""Per-model circuit breakers with fallback routing.
+
+When a model degrades, ``async_retry`` keeps retrying it with exponential
+backoff and jobs stall.  A breaker per model ID watches call outcomes and
+opens after ``failure_threshold`` consecutive failures, or when the share of
+failed or slow calls in a sliding window reaches ``error_rate``.  While it is
+open, ``route()`` sends calls to the configured fallback model (e.g.
+``veo_fast_model`` for Veo, Flash for scripts).  After ``open_seconds`` the
+breaker goes half-open and lets a single probe call through to the primary
+model; a successful probe closes it again.
+
+Every state transition is passed to registered listeners so it can be
+surfaced as an SSE log event, and counted in ``stats()``.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from enum import Enum
+from typing import Callable
+
+from google.genai import errors as genai_errors
+
+logger = logging.getLogger(__name__)
+
+# Number of recent transitions kept for the metrics endpoint
+_TRANSITION_HISTORY = 50
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def _is_degradation(exc: BaseException) -> bool:
+    """Server-side failures count against a model; bad requests do not."""
+    if isinstance(exc, genai_errors.APIError):
+        code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+        return code == 429 or (isinstance(code, int) and code >= 500)
+    return isinstance(exc, (asyncio.TimeoutError, ConnectionError))
+
+
+class _Breaker:
+    def __init__(self, window: int):
+        self.state = BreakerState.CLOSED
+        self.outcomes: deque[bool] = deque(maxlen=window)  # True = healthy call
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started: float | None = None
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.fallback_calls = 0
+
+
+class CircuitBreakers:
+    def __init__(
+        self,
+        fallbacks: dict[str, str] | None = None,
+        enabled: bool = True,
+        failure_threshold: int = 5,
+        error_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 60.0,
+        latency_thresholds: dict[str, float] | None = None,
+        default_latency_threshold: float | None = None,
+    ):
+        """
+        Args:
+            fallbacks: Primary model ID -> model ID to route to while open.
+            latency_thresholds: Per-model seconds above which a successful
+                call still counts as unhealthy in the window.
+            default_latency_threshold: Slow-call threshold for models not in
+                *latency_thresholds*; None disables latency tripping.
+        """
+        self.fallbacks = {k: v for k, v in (fallbacks or {}).items() if k != v}
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.latency_thresholds = latency_thresholds or {}
+        self.default_latency_threshold = default_latency_threshold
+        self._breakers: dict[str, _Breaker] = {}
+        self._listeners: list[Callable[[dict], None]] = []
+        self.transitions: deque[dict] = deque(maxlen=_TRANSITION_HISTORY)
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        """Register a callback invoked with each state transition."""
+        self._listeners.append(listener)
+
+    def _breaker(self, model_id: str) -> _Breaker:
+        breaker = self._breakers.get(model_id)
+        if breaker is None:
+            breaker = _Breaker(self.window)
+            self._breakers[model_id] = breaker
+        return breaker
+
+    def state(self, model_id: str) -> BreakerState:
+        return self._breaker(model_id).state
+
+    def route(self, model_id: str) -> str:
+        """Return the model to call: *model_id*, or its fallback while open."""
+        fallback = self.fallbacks.get(model_id)
+        if not self.enabled or not fallback:
+            return model_id
+
+        breaker = self._breaker(model_id)
+        now = time.monotonic()
+        if breaker.state == BreakerState.OPEN and now - breaker.opened_at >= self.open_seconds:
+            self._transition(model_id, breaker, BreakerState.HALF_OPEN, "cooldown elapsed")
+
+        if breaker.state == BreakerState.HALF_OPEN:
+            # One probe at a time goes to the primary; a stale probe (its
+            # caller never reported back) is replaced after open_seconds
+            if breaker.probe_started is None or now - breaker.probe_started >= self.open_seconds:
+                breaker.probe_started = now
+                return model_id
+
+        if breaker.state == BreakerState.CLOSED:
+            return model_id
+
+        if self._breaker(fallback).state == BreakerState.OPEN:
+            # Both tiers are down; let the primary's own retries handle it
+            return model_id
+        breaker.fallback_calls += 1
+        return fallback
+
+    @asynccontextmanager
+    async def call(self, model_id: str):
+        """Record the outcome and latency of the call made inside the block."""
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as exc:
+            if _is_degradation(exc):
+                self._record(model_id, healthy=False, reason=f"{type(exc).__name__}: {exc}")
+            raise
+        else:
+            latency = time.monotonic() - start
+            threshold = self.latency_thresholds.get(model_id, self.default_latency_threshold)
+            if threshold is not None and latency > threshold:
+                self._record(model_id, healthy=False, slow=True, reason=f"latency {latency:.1f}s")
+            else:
+                self._record(model_id, healthy=True)
+
+    def _record(self, model_id: str, healthy: bool, slow: bool = False, reason: str = "") -> None:
+        breaker = self._breaker(model_id)
+        breaker.calls += 1
+        breaker.outcomes.append(healthy)
+        if slow:
+            breaker.slow_calls += 1
+        elif not healthy:
+            breaker.failures += 1
+
+        if healthy:
+            breaker.consecutive_failures = 0
+            if breaker.state == BreakerState.HALF_OPEN:
+                self._transition(model_id, breaker, BreakerState.CLOSED, "probe succeeded")
+            return
+
+        # Slow calls only count toward the window rate, not the consecutive run
+        if not slow:
+            breaker.consecutive_failures += 1
+        if not self.enabled or model_id not in self.fallbacks:
+            return
+        if breaker.state == BreakerState.HALF_OPEN:
+            self._transition(model_id, breaker, BreakerState.OPEN, f"probe failed ({reason})")
+        elif breaker.state == BreakerState.CLOSED:
+            unhealthy = breaker.outcomes.count(False)
+            if breaker.consecutive_failures >= self.failure_threshold:
+                self._transition(
+                    model_id, breaker, BreakerState.OPEN,
+                    f"{breaker.consecutive_failures} consecutive failures ({reason})",
+                )
+            elif (
+                len(breaker.outcomes) >= self.min_calls
+                and unhealthy / len(breaker.outcomes) >= self.error_rate
+            ):
+                self._transition(
+                    model_id, breaker, BreakerState.OPEN,
+                    f"{unhealthy}/{len(breaker.outcomes)} recent calls failed or slow ({reason})",
+                )
+
+    def _transition(self, model_id: str, breaker: _Breaker, state: BreakerState, reason: str) -> None:
+        previous = breaker.state
+        breaker.state = state
+        breaker.probe_started = None
+        if state == BreakerState.OPEN:
+            breaker.opened_at = time.monotonic()
+        elif state == BreakerState.CLOSED:
+            breaker.outcomes.clear()
+            breaker.consecutive_failures = 0
+
+        event = {
+            "model": model_id,
+            "from_state": previous.value,
+            "to_state": state.value,
+            "fallback": self.fallbacks.get(model_id),
+            "reason": reason,
+            "timestamp": datetime.now().isoformat(),
+        }
+        self.transitions.append(event)
+        logger.warning(
+            "Circuit breaker for %s: %s -> %s (%s); fallback=%s",
+            model_id, previous.value, state.value, reason, event["fallback"],
+        )
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Circuit breaker listener failed")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "fallbacks": self.fallbacks,
+            "models": {
+                model_id: {
+                    "state": breaker.state.value,
+                    "calls": breaker.calls,
+                    "failures": breaker.failures,
+                    "slow_calls": breaker.slow_calls,
+                    "consecutive_failures": breaker.consecutive_failures,
+                    "fallback_calls": breaker.fallback_calls,
+                }
+                for model_id, breaker in self._breakers.items()
+            },
+            "recent_transitions": list(self.transitions),
+        }
@@ -0,0 +1,134 @@
+"""AIMD adaptive concurrency limiting.
+
+Static concurrency caps either overshoot the Vertex quota (429s and wasted
+retries) or leave it idle.  ``AIMDLimiter`` adjusts its limit from
+back-pressure instead: every successful call adds ``1 / limit`` (about +1
+per window of ``limit`` completions), a 429/503 halves the limit, and a
+latency well above the observed baseline shrinks it gently.  Decreases are
+applied at most once per cooldown window (roughly one baseline latency) so
+a burst of failures from the same window only counts once.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from google.genai import errors as genai_errors
+
+logger = logging.getLogger(__name__)
+
+OVERLOAD_CODES = (429, 503)
+
+
+class AIMDLimiter:
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        backoff: float = 0.5,
+        latency_backoff: float = 0.9,
+        latency_tolerance: float = 2.0,
+    ):
+        """
+        Args:
+            initial: Starting limit.
+            max_limit: Ceiling for additive increase; defaults to *initial*.
+            backoff: Multiplier applied on an overload error (429/503).
+            latency_backoff: Multiplier applied when latency exceeds
+                ``latency_tolerance`` times the baseline.
+        """
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.latency_tolerance = latency_tolerance
+
+        self.in_flight = 0
+        self.baseline_latency: float | None = None
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+        self.successes = 0
+        self.overloads = 0
+        self.latency_backoffs = 0
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.current_limit)
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one slot; genai overload errors and latency feed the limit."""
+        await self.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except genai_errors.APIError as exc:
+            code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+            if code in OVERLOAD_CODES:
+                self.on_overload()
+            raise
+        else:
+            self.on_success(time.monotonic() - start)
+        finally:
+            await self.release()
+
+    def on_success(self, latency: float | None = None) -> None:
+        self.successes += 1
+        if latency is not None:
+            if self.baseline_latency is None:
+                self.baseline_latency = latency
+            elif latency > self.baseline_latency * self.latency_tolerance:
+                self._decrease(self.latency_backoff, "latency %.1fs" % latency)
+                self.latency_backoffs += 1
+                return
+            else:
+                self.baseline_latency += 0.1 * (latency - self.baseline_latency)
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_overload(self) -> None:
+        self.overloads += 1
+        self._decrease(self.backoff, "overload")
+
+    def _decrease(self, factor: float, reason: str) -> None:
+        now = time.monotonic()
+        cooldown = max(1.0, self.baseline_latency or 0.0)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        previous = self.current_limit
+        self.limit = max(self.min_limit, self.limit * factor)
+        if self.current_limit != previous:
+            logger.info(
+                "Concurrency limit for %s: %d -> %d (%s)",
+                self.name, previous, self.current_limit, reason,
+            )
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.current_limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "successes": self.successes,
+            "overloads": self.overloads,
+            "latency_backoffs": self.latency_backoffs,
+            "baseline_latency_seconds": (
+                round(self.baseline_latency, 3) if self.baseline_latency is not None else None
+            ),
+        }
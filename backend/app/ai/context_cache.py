@@ -0,0 +1,222 @@
+"""Per-run context caching for repeated system instructions and references.
+
+QC and storyboard calls resend the same system instruction and the same
+avatar/product reference parts for every scene of a run.  ``ContextCacheManager``
+creates one cached-content handle per (run, call kind, model, prefix) the
+first time it is needed, reuses it for every later call in the run, and
+deletes the run's handles when the job finishes (a TTL covers runs that are
+never released explicitly).
+
+Two backends implement the cache:
+
+* ``GenaiCacheBackend`` uses Vertex context caching (``client.caches``);
+  requests reference the handle via ``cached_content`` and send only the
+  per-call parts.
+* ``LocalCacheBackend`` keeps the prefix in memory and expands it back into
+  each request, so the whole path runs offline and in tests.
+
+If a handle cannot be created (e.g. the prefix is below the model's minimum
+cacheable size, or the model does not support caching), the manager
+remembers that and the call proceeds uncached.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from google import genai
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedContext:
+    name: str
+    model: str
+    system_instruction: str | None
+    prefix: list[types.Part]
+    # True when the backend holds the prefix server-side
+    remote: bool
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+    def apply(
+        self, contents: list, config: types.GenerateContentConfig, model: str
+    ) -> tuple[list, types.GenerateContentConfig]:
+        """Return request contents/config for a call to *model*.
+
+        *contents* holds only the per-call parts.  When the handle lives
+        server-side and the call still targets the model it was created for,
+        the request references it; otherwise (local backend, or the breaker
+        rerouted the call to a fallback model) the prefix is sent inline.
+        """
+        self.uses += 1
+        if self.remote and model == self.model:
+            return contents, config.model_copy(
+                update={"cached_content": self.name, "system_instruction": None}
+            )
+        return self.prefix + contents, config.model_copy(
+            update={"system_instruction": self.system_instruction}
+        )
+
+
+class GenaiCacheBackend:
+    remote = True
+
+    def __init__(self, client: genai.Client):
+        self.client = client
+
+    def create(
+        self,
+        model: str,
+        system_instruction: str | None,
+        prefix: list[types.Part],
+        ttl_seconds: float,
+        display_name: str,
+    ) -> str:
+        cache = self.client.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                contents=[types.Content(role="user", parts=prefix)] if prefix else None,
+                system_instruction=system_instruction,
+                ttl=f"{int(ttl_seconds)}s",
+                display_name=display_name,
+            ),
+        )
+        return cache.name
+
+    def delete(self, name: str) -> None:
+        self.client.caches.delete(name=name)
+
+
+class LocalCacheBackend:
+    """In-memory stand-in for offline runs and tests."""
+
+    remote = False
+
+    def __init__(self):
+        self.entries: dict[str, dict] = {}
+
+    def create(
+        self,
+        model: str,
+        system_instruction: str | None,
+        prefix: list[types.Part],
+        ttl_seconds: float,
+        display_name: str,
+    ) -> str:
+        name = f"local-caches/{uuid.uuid4().hex[:12]}"
+        self.entries[name] = {
+            "model": model,
+            "display_name": display_name,
+            "expires_at": time.monotonic() + ttl_seconds,
+        }
+        return name
+
+    def delete(self, name: str) -> None:
+        self.entries.pop(name, None)
+
+
+def _prefix_digest(system_instruction: str | None, prefix: list[types.Part]) -> str:
+    digest = hashlib.sha256((system_instruction or "").encode("utf-8"))
+    for part in prefix:
+        if part.inline_data is not None:
+            digest.update(part.inline_data.data or b"")
+        elif part.file_data is not None:
+            digest.update((part.file_data.file_uri or "").encode("utf-8"))
+        else:
+            digest.update((part.text or "").encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ContextCacheManager:
+    def __init__(
+        self,
+        backend: GenaiCacheBackend | LocalCacheBackend,
+        ttl_seconds: float = 3600.0,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._contexts: dict[tuple, CachedContext] = {}
+        self._failed: set[tuple] = set()
+        self._locks: dict[tuple, asyncio.Lock] = {}
+        self._stats = {"created": 0, "reused": 0, "failed": 0, "released": 0}
+
+    async def get(
+        self,
+        run_id: str | None,
+        kind: str,
+        model: str,
+        system_instruction: str | None,
+        prefix: list[types.Part],
+    ) -> CachedContext | None:
+        """Return the run's cached context for this prefix, creating it once.
+
+        Returns None when caching is disabled, no run scope is given, or the
+        handle could not be created.
+        """
+        if not self.enabled or not run_id:
+            return None
+        key = (run_id, kind, model, _prefix_digest(system_instruction, prefix))
+        if key in self._failed:
+            return None
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            context = self._contexts.get(key)
+            if context and time.monotonic() - context.created_at < self.ttl_seconds * 0.9:
+                self._stats["reused"] += 1
+                return context
+            try:
+                name = await asyncio.to_thread(
+                    self.backend.create,
+                    model,
+                    system_instruction,
+                    prefix,
+                    self.ttl_seconds,
+                    f"{run_id}-{kind}",
+                )
+            except Exception as exc:
+                logger.info("Context cache unavailable for %s/%s on %s: %s", run_id, kind, model, exc)
+                self._failed.add(key)
+                self._stats["failed"] += 1
+                return None
+            context = CachedContext(
+                name=name,
+                model=model,
+                system_instruction=system_instruction,
+                prefix=prefix,
+                remote=self.backend.remote,
+            )
+            self._contexts[key] = context
+            self._stats["created"] += 1
+            logger.info("Created context cache %s for %s/%s", name, run_id, kind)
+            return context
+
+    async def release(self, run_id: str) -> None:
+        """Delete every cached context created for *run_id*."""
+        keys = [k for k in self._contexts if k[0] == run_id]
+        for key in keys:
+            context = self._contexts.pop(key)
+            self._locks.pop(key, None)
+            try:
+                await asyncio.to_thread(self.backend.delete, context.name)
+                self._stats["released"] += 1
+            except Exception as exc:
+                logger.warning("Failed to delete context cache %s: %s", context.name, exc)
+        self._failed = {k for k in self._failed if k[0] != run_id}
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": "genai" if self.backend.remote else "local",
+            **self._stats,
+            "active": len(self._contexts),
+            "active_runs": len({k[0] for k in self._contexts}),
+        }
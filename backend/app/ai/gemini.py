@@ -1,21 +1,42 @@
 import logging
+import mimetypes
+from typing import Callable
 
 from google import genai
 from google.genai import types
+from pydantic import BaseModel, ValidationError, create_model
 
+from app.ai.breaker import CircuitBreakers
+from app.ai.context_cache import CachedContext, ContextCacheManager
+from app.ai.hedging import Hedger, api_call_timer
+from app.ai.image_prep import ImagePreparer, PreparedImage
 from app.ai.prompts import (
+    AVATAR_RANKING_PROMPT_TEMPLATE,
     PROMPT_REWRITE_TEMPLATE,
+    QC_REWRITE_SUFFIX,
     SCRIPT_SYSTEM_INSTRUCTION,
     SCRIPT_USER_PROMPT_TEMPLATE,
+    STORYBOARD_QC_BATCH_REWRITE_SUFFIX,
+    STORYBOARD_QC_BATCH_USER_PROMPT,
     STORYBOARD_QC_SYSTEM_INSTRUCTION,
     STORYBOARD_QC_USER_PROMPT,
+    VIDEO_QC_COMPARATIVE_USER_PROMPT,
     VIDEO_QC_SYSTEM_INSTRUCTION,
     VIDEO_QC_USER_PROMPT,
     build_narrative_arc,
 )
+from app.ai.rate_limit import RateLimiter
 from app.ai.retry import async_retry
+from app.ai.structured import StructuredOutput, response_model
 from app.config import Settings
+from app.models.avatar import AvatarRankingReport
+from app.models.script import AvatarProfile, VideoScript
+from app.models.storyboard import StoryboardQCReport
+from app.models.video import VideoQCReport
+from app.storage.reference_assets import ReferenceAssetStore
+from app.utils.images import sniff_mime
 from app.utils.json_parser import parse_json_response
+from app.utils.json_stream import JSONStreamParser
 
 logger = logging.getLogger(__name__)
 
@@ -38,11 +59,124 @@ ALL_SAFETY_OFF = [
     ),
 ]
 
+# Response schemas; QC reports require the dimensions QCService reads
+SCRIPT_RESPONSE = VideoScript
+STORYBOARD_QC_RESPONSE = response_model(StoryboardQCReport, "composition_quality")
+VIDEO_QC_RESPONSE = response_model(
+    VideoQCReport,
+    "technical_distortion",
+    "cinematic_imperfections",
+    "avatar_consistency",
+    "product_consistency",
+    "temporal_coherence",
+)
+# Fused QC + rewrite: the same reports plus the next attempt's prompt
+STORYBOARD_QC_REWRITE_RESPONSE = create_model(
+    "StoryboardQCRewriteResponse",
+    __base__=STORYBOARD_QC_RESPONSE,
+    rewritten_prompt=(str | None, None),
+)
+VIDEO_QC_REWRITE_RESPONSE = create_model(
+    "VideoQCRewriteResponse",
+    __base__=VIDEO_QC_RESPONSE,
+    rewritten_prompt=(str | None, None),
+)
+
+
+def _uri_image_mime(uri: str) -> str:
+    return mimetypes.guess_type(uri)[0] or "image/png"
+
 
 class GeminiService:
-    def __init__(self, client: genai.Client, settings: Settings):
+    def __init__(
+        self,
+        client: genai.Client,
+        settings: Settings,
+        limiter: RateLimiter | None = None,
+        breakers: CircuitBreakers | None = None,
+        hedger: Hedger | None = None,
+        context_cache: ContextCacheManager | None = None,
+        images: ImagePreparer | None = None,
+        assets: ReferenceAssetStore | None = None,
+        structured: StructuredOutput | None = None,
+    ):
         self.client = client
         self.settings = settings
+        self.limiter = limiter or RateLimiter()
+        self.breakers = breakers or CircuitBreakers()
+        self.hedger = hedger or Hedger(enabled=False)
+        self.context_cache = context_cache
+        self.images = images
+        self.assets = assets
+        self.structured = structured or StructuredOutput()
+
+    async def _generate(
+        self,
+        model_id: str,
+        contents,
+        config: types.GenerateContentConfig,
+        context: CachedContext | None = None,
+        routed_model: str | None = None,
+    ) -> types.GenerateContentResponse:
+        """Single generate_content call, routed and rate limited per model.
+
+        With a cached *context*, *contents* holds only the per-call parts.
+        *routed_model* is a ``breakers.route`` result the caller already has.
+        """
+        model = routed_model or self.breakers.route(model_id)
+        if context is not None:
+            contents, config = context.apply(contents, config, model)
+        async with self.limiter.slot(model), self.breakers.call(model):
+            with api_call_timer():
+                return await self.client.aio.models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=config,
+                )
+
+    async def _reask(self, prompt: str, schema: type[BaseModel]) -> str:
+        """Small Flash call that repairs an invalid structured response."""
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=self.structured.schema(schema),
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=0.0,
+        )
+        response = await self._generate(self.settings.gemini_flash_model, prompt, config)
+        return response.text
+
+    async def _image_part(
+        self, data: bytes, purpose: str, run_id: str | None = None
+    ) -> types.Part:
+        """Image Part, downscaled/re-encoded for *purpose* when configured.
+
+        Run references (*run_id* given) are passed by URI in asset mode and
+        uploaded once per run; everything else is sent inline.
+        """
+        if self.images is None:
+            prepared = PreparedImage(data, sniff_mime(data), len(data))
+        else:
+            prepared = await self.images.prepare(data, purpose, run_id)
+        if self.assets is not None and run_id:
+            try:
+                uri = await self.assets.uri(run_id, prepared.data, prepared.mime_type)
+                return types.Part.from_uri(file_uri=uri, mime_type=prepared.mime_type)
+            except Exception as exc:
+                logger.warning("Reference asset upload failed, sending inline: %s", exc)
+        return prepared.to_part()
+
+    async def _run_context(
+        self,
+        run_id: str | None,
+        kind: str,
+        model_id: str,
+        system_instruction: str,
+        prefix: list[types.Part],
+    ) -> CachedContext | None:
+        """Cached system instruction + reference parts for this run, if any."""
+        if self.context_cache is None:
+            return None
+        return await self.context_cache.get(run_id, kind, model_id, system_instruction, prefix)
 
     @async_retry(retries=3)
     async def generate_script(
@@ -56,12 +190,22 @@ class GeminiService:
         model_id: str | None = None,
         max_words: int = 25,
         custom_instructions: str = "",
-    ) -> dict:
+        run_id: str | None = None,
+        on_event: Callable[[tuple], None] | None = None,
+    ) -> tuple[dict, str]:
         """Generate video script using Gemini with structured JSON output.
 
+        Returns the script and the model that wrote it, which differs from
+        *model_id* while its circuit breaker routes to the fallback.
+
         Args:
             model_id: Optional model override. Falls back to settings.gemini_model.
             max_words: Maximum dialogue words per scene.
+            run_id: Run the product image is prepared (and memoized) for.
+            on_event: When given, the response is streamed and every
+                ``JSONStreamParser`` event (completed top-level fields and
+                array items) is passed to it as it arrives.  A retry after a
+                partial stream replays events from the start.
         """
         user_prompt = SCRIPT_USER_PROMPT_TEMPLATE.format(
             product_name=product_name,
@@ -76,21 +220,45 @@ class GeminiService:
         if custom_instructions:
             user_prompt += f"\n\nADDITIONAL CREATIVE DIRECTION FROM CLIENT:\n{custom_instructions}"
 
-        image_part = types.Part.from_bytes(data=image_bytes, mime_type="image/png")
+        image_part = await self._image_part(image_bytes, "script", run_id)
         text_part = types.Part.from_text(text=user_prompt)
 
-        response = await self.client.aio.models.generate_content(
-            model=model_id or self.settings.gemini_model,
-            contents=[image_part, text_part],
-            config=types.GenerateContentConfig(
-                system_instruction=SCRIPT_SYSTEM_INSTRUCTION,
-                response_mime_type="application/json",
-                safety_settings=ALL_SAFETY_OFF,
-                temperature=1.0,
-            ),
+        config = types.GenerateContentConfig(
+            system_instruction=SCRIPT_SYSTEM_INSTRUCTION,
+            response_mime_type="application/json",
+            response_schema=self.structured.schema(SCRIPT_RESPONSE),
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=1.0,
         )
+        model_id = model_id or self.settings.gemini_model
+        model = self.breakers.route(model_id)
+        if on_event is None:
+            response = await self._generate(
+                model_id, [image_part, text_part], config, routed_model=model
+            )
+            script = await self.structured.parse(
+                "script", model_id, response.text, SCRIPT_RESPONSE, self._reask
+            )
+            return script, model
 
-        return parse_json_response(response.text)
+        parser = JSONStreamParser()
+        chunks = []
+        async with self.limiter.slot(model), self.breakers.call(model):
+            stream = await self.client.aio.models.generate_content_stream(
+                model=model,
+                contents=[image_part, text_part],
+                config=config,
+            )
+            async for chunk in stream:
+                text = chunk.text or ""
+                chunks.append(text)
+                for event in parser.feed(text):
+                    on_event(event)
+
+        script = await self.structured.parse(
+            "script", model_id, "".join(chunks), SCRIPT_RESPONSE, self._reask
+        )
+        return script, model
 
     @async_retry(retries=3)
     async def analyze_product_image(self, image_bytes: bytes) -> dict:
@@ -102,17 +270,16 @@ class GeminiService:
             '"specifications": "Key specifications formatted as key: value lines"}'
         )
 
-        image_part = types.Part.from_bytes(data=image_bytes, mime_type="image/png")
+        image_part = await self._image_part(image_bytes, "script")
         text_part = types.Part.from_text(text=prompt)
 
-        response = await self.client.aio.models.generate_content(
-            model=self.settings.gemini_flash_model,
-            contents=[image_part, text_part],
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                safety_settings=ALL_SAFETY_OFF,
-                temperature=0.5,
-            ),
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=0.5,
+        )
+        response = await self._generate(
+            self.settings.gemini_flash_model, [image_part, text_part], config
         )
 
         return parse_json_response(response.text)
@@ -123,58 +290,288 @@ class GeminiService:
         avatar_bytes: bytes,
         product_bytes: bytes,
         storyboard_bytes: bytes,
+        run_id: str | None = None,
+        rewrite_prompt: str | None = None,
+        threshold: int | None = None,
+        include_composition: bool = True,
     ) -> dict:
-        """QC storyboard using Gemini 3 Flash for faster evaluation."""
-        avatar_part = types.Part.from_bytes(data=avatar_bytes, mime_type="image/png")
-        product_part = types.Part.from_bytes(
-            data=product_bytes, mime_type="image/png"
-        )
-        storyboard_part = types.Part.from_bytes(
-            data=storyboard_bytes, mime_type="image/png"
-        )
-        text_part = types.Part.from_text(text=STORYBOARD_QC_USER_PROMPT)
-
-        response = await self.client.aio.models.generate_content(
-            model=self.settings.gemini_flash_model,
-            contents=[avatar_part, product_part, storyboard_part, text_part],
-            config=types.GenerateContentConfig(
-                system_instruction=STORYBOARD_QC_SYSTEM_INSTRUCTION,
-                response_mime_type="application/json",
-                safety_settings=ALL_SAFETY_OFF,
-                temperature=1.0,
-            ),
+        """QC storyboard using Gemini 3 Flash for faster evaluation.
+
+        With a run_id, the system instruction and reference images are
+        served from the run's context cache instead of being resent.
+
+        With *rewrite_prompt* (the prompt the frame was generated from), the
+        same call also returns ``rewritten_prompt`` when a required score is
+        below *threshold*, saving a separate rewrite round trip.
+        """
+        avatar_part = await self._image_part(avatar_bytes, "qc", run_id)
+        product_part = await self._image_part(product_bytes, "qc", run_id)
+        storyboard_part = await self._image_part(storyboard_bytes, "qc")
+        kind, schema, prompt_text = "qc_storyboard", STORYBOARD_QC_RESPONSE, STORYBOARD_QC_USER_PROMPT
+        if rewrite_prompt is not None:
+            required = "avatar_validation, product_validation"
+            required += " and composition_quality" if include_composition else ""
+            kind, schema = "qc_storyboard_rewrite", STORYBOARD_QC_REWRITE_RESPONSE
+            prompt_text += QC_REWRITE_SUFFIX.format(
+                required=required,
+                threshold=threshold or self.settings.storyboard_qc_threshold,
+                original_prompt=rewrite_prompt,
+            )
+        text_part = types.Part.from_text(text=prompt_text)
+
+        config = types.GenerateContentConfig(
+            system_instruction=STORYBOARD_QC_SYSTEM_INSTRUCTION,
+            response_mime_type="application/json",
+            response_schema=self.structured.schema(schema),
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=1.0,
+        )
+        model_id = self.settings.gemini_flash_model
+        prefix = [avatar_part, product_part]
+        context = await self._run_context(
+            run_id, "storyboard_qc", model_id, STORYBOARD_QC_SYSTEM_INSTRUCTION, prefix
+        )
+        contents = [storyboard_part, text_part] if context else prefix + [storyboard_part, text_part]
+        # Latency-critical: hedge with a duplicate call past the observed p90
+        response = await self.hedger.run(
+            kind,
+            lambda: self._generate(model_id, contents, config, context),
         )
 
-        return parse_json_response(response.text)
+        return await self.structured.parse(kind, model_id, response.text, schema, self._reask)
+
+    @async_retry(retries=3)
+    async def qc_storyboard_batch(
+        self,
+        avatar_bytes: bytes,
+        product_bytes: bytes,
+        storyboard_frames: list[bytes],
+        run_id: str | None = None,
+        rewrite_prompts: list[str | None] | None = None,
+        threshold: int | None = None,
+        include_composition: bool = True,
+    ) -> list[dict]:
+        """QC several storyboard frames against the same references in one call.
+
+        The avatar and product references are sent once, followed by each
+        frame behind a "FRAME <n>:" label.  Returns one raw report per frame,
+        in input order.
+
+        *rewrite_prompts* fuses the prompt rewrite in as ``qc_storyboard``
+        does: a failing frame with a generation prompt also carries
+        ``rewritten_prompt``.
+        """
+        prefix = [
+            await self._image_part(avatar_bytes, "qc", run_id),
+            await self._image_part(product_bytes, "qc", run_id),
+        ]
+        frames = []
+        for n, frame in enumerate(storyboard_frames, start=1):
+            frames.append(types.Part.from_text(text=f"FRAME {n}:"))
+            frames.append(await self._image_part(frame, "qc"))
+        prompt_text = STORYBOARD_QC_BATCH_USER_PROMPT
+        kind, schema = "qc_storyboard_batch", STORYBOARD_QC_RESPONSE
+        if rewrite_prompts and any(rewrite_prompts):
+            required = "avatar_validation, product_validation"
+            required += " and composition_quality" if include_composition else ""
+            kind, schema = "qc_storyboard_batch_rewrite", STORYBOARD_QC_REWRITE_RESPONSE
+            prompt_text += STORYBOARD_QC_BATCH_REWRITE_SUFFIX.format(
+                required=required,
+                threshold=threshold or self.settings.storyboard_qc_threshold,
+                frame_prompts="\n\n".join(
+                    f"FRAME {n}:\n{p}" for n, p in enumerate(rewrite_prompts, start=1) if p
+                ),
+            )
+        frames.append(types.Part.from_text(text=prompt_text))
+
+        config = types.GenerateContentConfig(
+            system_instruction=STORYBOARD_QC_SYSTEM_INSTRUCTION,
+            response_mime_type="application/json",
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=1.0,
+        )
+        model_id = self.settings.gemini_flash_model
+        # Same handle as single-frame QC: same instruction, references and model
+        context = await self._run_context(
+            run_id, "storyboard_qc", model_id, STORYBOARD_QC_SYSTEM_INSTRUCTION, prefix
+        )
+        contents = frames if context else prefix + frames
+        response = await self.hedger.run(
+            kind,
+            lambda: self._generate(model_id, contents, config, context),
+        )
+
+        reports = parse_json_response(response.text).get("reports", [])
+        by_frame = {r.get("frame"): r for r in reports if isinstance(r, dict)}
+        if set(by_frame) != set(range(1, len(storyboard_frames) + 1)):
+            raise ValueError(
+                f"Batched storyboard QC returned frames {list(by_frame)} "
+                f"for {len(storyboard_frames)} inputs"
+            )
+        # Each report must hold what single-frame QC guarantees; a ValueError
+        # sends the whole batch to the per-frame fallback
+        for n, report in by_frame.items():
+            try:
+                schema.model_validate(report)
+            except ValidationError as exc:
+                raise ValueError(f"Batched storyboard QC report for frame {n} is invalid: {exc}") from exc
+        return [by_frame[n] for n in range(1, len(storyboard_frames) + 1)]
 
     @async_retry(retries=3)
     async def qc_video(
-        self, video_uri: str, reference_image_uri: str
+        self,
+        video_uri: str,
+        reference_image_uri: str,
+        run_id: str | None = None,
+        rewrite_prompt: str | None = None,
+        threshold: int | None = None,
     ) -> dict:
         """QC video using Gemini 3 Flash.
 
-        Accepts GCS URIs for the video and reference product image.
+        Accepts GCS URIs for the video and reference product image.  With
+        *rewrite_prompt*, a failing verdict also carries ``rewritten_prompt``
+        (see ``qc_storyboard``).
         """
         image_part = types.Part.from_uri(
-            file_uri=reference_image_uri, mime_type="image/png"
+            file_uri=reference_image_uri, mime_type=_uri_image_mime(reference_image_uri)
         )
         video_part = types.Part.from_uri(
             file_uri=video_uri, mime_type="video/mp4"
         )
-        text_part = types.Part.from_text(text=VIDEO_QC_USER_PROMPT)
+        kind, schema, prompt_text = "qc_video", VIDEO_QC_RESPONSE, VIDEO_QC_USER_PROMPT
+        if rewrite_prompt is not None:
+            kind, schema = "qc_video_rewrite", VIDEO_QC_REWRITE_RESPONSE
+            prompt_text += QC_REWRITE_SUFFIX.format(
+                required="all seven dimensions",
+                threshold=threshold or self.settings.video_qc_threshold,
+                original_prompt=rewrite_prompt,
+            )
+        text_part = types.Part.from_text(text=prompt_text)
+
+        config = types.GenerateContentConfig(
+            system_instruction=VIDEO_QC_SYSTEM_INSTRUCTION,
+            response_mime_type="application/json",
+            response_schema=self.structured.schema(schema),
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=1.0,
+        )
+        model_id = self.settings.gemini_flash_model
+        context = await self._run_context(
+            run_id, "video_qc", model_id, VIDEO_QC_SYSTEM_INSTRUCTION, [image_part]
+        )
+        contents = [video_part, text_part] if context else [image_part, video_part, text_part]
+        response = await self.hedger.run(
+            kind,
+            lambda: self._generate(model_id, contents, config, context),
+        )
+
+        return await self.structured.parse(kind, model_id, response.text, schema, self._reask)
+
+    @async_retry(retries=3)
+    async def qc_video_comparative(
+        self, video_uris: list[str], reference_image_uri: str, run_id: str | None = None
+    ) -> dict:
+        """QC and rank all video variants of a scene in one Gemini call.
 
-        response = await self.client.aio.models.generate_content(
-            model=self.settings.gemini_flash_model,
-            contents=[image_part, video_part, text_part],
-            config=types.GenerateContentConfig(
-                system_instruction=VIDEO_QC_SYSTEM_INSTRUCTION,
-                response_mime_type="application/json",
-                safety_settings=ALL_SAFETY_OFF,
-                temperature=1.0,
+        Returns ``{"reports": [...], "ranking": [...], "ranking_reasoning": str}``
+        where ``reports`` holds one raw report per input URI in input order
+        and ``ranking`` lists 0-based input indices, best first.
+        """
+        prefix = [
+            types.Part.from_uri(
+                file_uri=reference_image_uri, mime_type=_uri_image_mime(reference_image_uri)
             ),
+        ]
+        variants = []
+        for n, uri in enumerate(video_uris, start=1):
+            variants.append(types.Part.from_text(text=f"VARIANT {n}:"))
+            variants.append(types.Part.from_uri(file_uri=uri, mime_type="video/mp4"))
+        variants.append(types.Part.from_text(text=VIDEO_QC_COMPARATIVE_USER_PROMPT))
+
+        config = types.GenerateContentConfig(
+            system_instruction=VIDEO_QC_SYSTEM_INSTRUCTION,
+            response_mime_type="application/json",
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=1.0,
+        )
+        model_id = self.settings.gemini_flash_model
+        context = await self._run_context(
+            run_id, "video_qc", model_id, VIDEO_QC_SYSTEM_INSTRUCTION, prefix
         )
+        contents = variants if context else prefix + variants
+        response = await self._generate(model_id, contents, config, context)
 
-        return parse_json_response(response.text)
+        parsed = parse_json_response(response.text)
+        expected = set(range(1, len(video_uris) + 1))
+        by_variant = {r.get("variant"): r for r in parsed.get("variants", []) if isinstance(r, dict)}
+        if set(by_variant) != expected:
+            raise ValueError(
+                f"Comparative video QC returned variants {list(by_variant)} "
+                f"for {len(video_uris)} inputs"
+            )
+        ranking = [n for n in parsed.get("ranking", []) if n in expected]
+        # Keep the model's order, then append anything it left out
+        ranking = list(dict.fromkeys(ranking)) + sorted(expected - set(ranking))
+        return {
+            "reports": [by_variant[n] for n in range(1, len(video_uris) + 1)],
+            "ranking": [n - 1 for n in ranking],
+            "ranking_reasoning": parsed.get("ranking_reasoning", ""),
+        }
+
+    @async_retry(retries=3)
+    async def rank_avatars(
+        self,
+        avatar_variants: list[bytes],
+        avatar_profile: AvatarProfile,
+        run_id: str | None = None,
+    ) -> dict:
+        """Score and rank avatar variants against the profile in one call.
+
+        Returns ``{"scores": [...], "ranking": [...], "ranking_reasoning": str}``
+        where ``scores`` holds one ``{"variant", "score", "reasoning"}`` per
+        input in input order and both use 0-based input indices.
+        """
+        contents = []
+        for n, data in enumerate(avatar_variants, start=1):
+            contents.append(types.Part.from_text(text=f"VARIANT {n}:"))
+            contents.append(await self._image_part(data, "qc", run_id))
+        contents.append(types.Part.from_text(text=AVATAR_RANKING_PROMPT_TEMPLATE.format(
+            gender=avatar_profile.gender,
+            age_range=avatar_profile.age_range,
+            attire=avatar_profile.attire,
+            tone_of_voice=avatar_profile.tone_of_voice,
+            visual_description=avatar_profile.visual_description,
+        )))
+
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=self.structured.schema(AvatarRankingReport),
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=1.0,
+        )
+        model_id = self.settings.gemini_flash_model
+        response = await self._generate(model_id, contents, config)
+        parsed = await self.structured.parse(
+            "avatar_ranking", model_id, response.text, AvatarRankingReport, self._reask
+        )
+
+        expected = set(range(1, len(avatar_variants) + 1))
+        by_variant = {v["variant"]: v for v in parsed["variants"]}
+        if set(by_variant) != expected:
+            raise ValueError(
+                f"Avatar ranking returned variants {list(by_variant)} "
+                f"for {len(avatar_variants)} inputs"
+            )
+        ranking = list(dict.fromkeys(n for n in parsed["ranking"] if n in expected))
+        # Anything the model left out goes last, best score first
+        ranking += sorted(expected - set(ranking), key=lambda n: -by_variant[n]["score"])
+        return {
+            "scores": [
+                {**by_variant[n], "variant": n - 1} for n in range(1, len(avatar_variants) + 1)
+            ],
+            "ranking": [n - 1 for n in ranking],
+            "ranking_reasoning": parsed.get("ranking_reasoning", ""),
+        }
 
     @async_retry(retries=3)
     async def rewrite_prompt(
@@ -186,13 +583,13 @@ class GeminiService:
             qc_feedback=qc_feedback,
         )
 
-        response = await self.client.aio.models.generate_content(
-            model=self.settings.gemini_flash_model,
-            contents=prompt_text,
-            config=types.GenerateContentConfig(
-                safety_settings=ALL_SAFETY_OFF,
-                temperature=1.0,
-            ),
+        config = types.GenerateContentConfig(
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=1.0,
+        )
+        response = await self.hedger.run(
+            "rewrite_prompt",
+            lambda: self._generate(self.settings.gemini_flash_model, prompt_text, config),
         )
 
         return response.text.strip()
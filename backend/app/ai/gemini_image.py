@@ -4,8 +4,14 @@ import logging
 from google import genai
 from google.genai import types
 
+from app.ai.breaker import CircuitBreakers
+from app.ai.context_cache import ContextCacheManager
+from app.ai.image_prep import ImagePreparer, PreparedImage
+from app.ai.rate_limit import RateLimiter
 from app.ai.retry import async_retry
 from app.config import Settings
+from app.storage.reference_assets import ReferenceAssetStore
+from app.utils.images import sniff_mime
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +36,40 @@ ALL_SAFETY_OFF = [
 
 
 class GeminiImageService:
-    def __init__(self, client: genai.Client, settings: Settings):
+    def __init__(
+        self,
+        client: genai.Client,
+        settings: Settings,
+        limiter: RateLimiter | None = None,
+        breakers: CircuitBreakers | None = None,
+        context_cache: ContextCacheManager | None = None,
+        images: ImagePreparer | None = None,
+        assets: ReferenceAssetStore | None = None,
+    ):
         self.client = client
         self.settings = settings
+        self.limiter = limiter or RateLimiter()
+        self.breakers = breakers or CircuitBreakers()
+        self.context_cache = context_cache
+        self.images = images
+        self.assets = assets
+
+    async def _image_part(self, data: bytes, run_id: str | None = None) -> types.Part:
+        """Reference Part, downscaled/re-encoded for generation when configured.
+
+        Passed by URI (uploaded once per run) in asset mode, inline otherwise.
+        """
+        if self.images is None:
+            prepared = PreparedImage(data, sniff_mime(data), len(data))
+        else:
+            prepared = await self.images.prepare(data, "generation", run_id)
+        if self.assets is not None and run_id:
+            try:
+                uri = await self.assets.uri(run_id, prepared.data, prepared.mime_type)
+                return types.Part.from_uri(file_uri=uri, mime_type=prepared.mime_type)
+            except Exception as exc:
+                logger.warning("Reference asset upload failed, sending inline: %s", exc)
+        return prepared.to_part()
 
     @async_retry(retries=3)
     async def _generate_single_image(
@@ -41,6 +78,7 @@ class GeminiImageService:
         reference_bytes: bytes | None = None,
         aspect_ratio: str = "9:16",
         image_size: str = "2K",
+        run_id: str | None = None,
     ) -> bytes:
         """Generate a single image and return raw bytes.
 
@@ -48,27 +86,27 @@ class GeminiImageService:
         before the text prompt for style/appearance guidance.
         """
         if reference_bytes:
-            ref_part = types.Part.from_bytes(
-                data=reference_bytes, mime_type="image/png"
-            )
+            ref_part = await self._image_part(reference_bytes, run_id)
             text_part = types.Part.from_text(text=prompt)
             contents = [ref_part, text_part]
         else:
             contents = prompt
 
-        response = await self.client.aio.models.generate_content(
-            model=self.settings.image_model,
-            contents=contents,
-            config=types.GenerateContentConfig(
-                response_modalities=["IMAGE"],
-                safety_settings=ALL_SAFETY_OFF,
-                temperature=1.0,
-                image_config=types.ImageConfig(
-                    aspect_ratio=aspect_ratio,
-                    image_size=image_size,
+        model = self.breakers.route(self.settings.image_model)
+        async with self.limiter.slot(model), self.breakers.call(model):
+            response = await self.client.aio.models.generate_content(
+                model=model,
+                contents=contents,
+                config=types.GenerateContentConfig(
+                    response_modalities=["IMAGE"],
+                    safety_settings=ALL_SAFETY_OFF,
+                    temperature=1.0,
+                    image_config=types.ImageConfig(
+                        aspect_ratio=aspect_ratio,
+                        image_size=image_size,
+                    ),
                 ),
-            ),
-        )
+            )
 
         for part in response.candidates[0].content.parts:
             if part.inline_data and part.inline_data.data:
@@ -83,6 +121,7 @@ class GeminiImageService:
         reference_bytes: bytes | None = None,
         aspect_ratio: str = "9:16",
         image_size: str = "2K",
+        run_id: str | None = None,
     ) -> list[bytes]:
         """Generate avatar variants concurrently.
 
@@ -91,7 +130,8 @@ class GeminiImageService:
         """
         tasks = [
             self._generate_single_image(
-                prompt, reference_bytes, aspect_ratio=aspect_ratio, image_size=image_size
+                prompt, reference_bytes, aspect_ratio=aspect_ratio, image_size=image_size,
+                run_id=run_id,
             )
             for _ in range(num_variants)
         ]
@@ -118,33 +158,44 @@ class GeminiImageService:
         image_model: str | None = None,
         aspect_ratio: str = "9:16",
         image_size: str = "2K",
+        run_id: str | None = None,
     ) -> bytes:
         """Generate a storyboard image with avatar and product reference images.
 
         Reference images are passed as Parts before the text prompt so the
-        model can use them for visual consistency.
+        model can use them for visual consistency.  With a run_id they are
+        served from the run's context cache when the image model supports it.
         """
-        avatar_part = types.Part.from_bytes(
-            data=avatar_bytes, mime_type="image/png"
-        )
-        product_part = types.Part.from_bytes(
-            data=product_bytes, mime_type="image/png"
-        )
+        avatar_part = await self._image_part(avatar_bytes, run_id)
+        product_part = await self._image_part(product_bytes, run_id)
         text_part = types.Part.from_text(text=prompt)
 
-        response = await self.client.aio.models.generate_content(
-            model=image_model or self.settings.image_model,
-            contents=[avatar_part, product_part, text_part],
-            config=types.GenerateContentConfig(
-                response_modalities=["IMAGE"],
-                safety_settings=ALL_SAFETY_OFF,
-                temperature=1.0,
-                image_config=types.ImageConfig(
-                    aspect_ratio=aspect_ratio,
-                    image_size=image_size,
-                ),
+        model_id = image_model or self.settings.image_model
+        contents = [avatar_part, product_part, text_part]
+        config = types.GenerateContentConfig(
+            response_modalities=["IMAGE"],
+            safety_settings=ALL_SAFETY_OFF,
+            temperature=1.0,
+            image_config=types.ImageConfig(
+                aspect_ratio=aspect_ratio,
+                image_size=image_size,
             ),
         )
+        context = None
+        if self.context_cache is not None:
+            context = await self.context_cache.get(
+                run_id, "storyboard_image", model_id, None, [avatar_part, product_part]
+            )
+
+        model = self.breakers.route(model_id)
+        if context is not None:
+            contents, config = context.apply([text_part], config, model)
+        async with self.limiter.slot(model), self.breakers.call(model):
+            response = await self.client.aio.models.generate_content(
+                model=model,
+                contents=contents,
+                config=config,
+            )
 
         for part in response.candidates[0].content.parts:
             if part.inline_data and part.inline_data.data:
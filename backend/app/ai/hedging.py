@@ -0,0 +1,183 @@
+"""Hedged requests for latency-critical calls.
+
+QC and prompt-rewrite calls sit on the critical path of every regen loop, and
+their tail latency sets how long a scene takes.  ``Hedger.run`` starts a
+call and, if it has not returned by the observed latency percentile for that
+call type (p90 by default), fires a duplicate and takes whichever succeeds
+first; the loser is cancelled.
+
+Hedges are capped by a budget (a fraction of all calls), so at most
+``budget_ratio`` extra quota is spent.  No hedging happens until enough
+latency samples exist to estimate the percentile.
+
+Latency is the time spent inside ``api_call_timer`` blocks (the API call
+itself, after any rate-limiter queueing), so a backlog of queued calls does
+not inflate the percentile and trigger hedges that add more load.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Number of recent latencies kept per call type
+_LATENCY_SAMPLES = 200
+
+
+class _CallTiming:
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+
+
+# Set for the duration of a hedged attempt (each attempt runs in its own task)
+_call_timing: ContextVar[_CallTiming | None] = ContextVar("hedge_call_timing", default=None)
+
+
+@contextmanager
+def api_call_timer() -> Iterator[None]:
+    """Count the enclosed API call towards the current hedged attempt's latency."""
+    timing = _call_timing.get()
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        if timing is not None:
+            timing.seconds += time.monotonic() - start
+            timing.calls += 1
+
+
+class _HedgeStats:
+    def __init__(self):
+        self.latencies: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Hedger:
+    def __init__(
+        self,
+        enabled: bool = True,
+        percentile: float = 0.9,
+        budget_ratio: float = 0.1,
+        min_samples: int = 20,
+        min_delay: float = 1.0,
+    ):
+        """
+        Args:
+            percentile: Latency quantile after which a hedge is sent.
+            budget_ratio: Maximum hedges as a fraction of all calls.
+            min_samples: Latency samples required before hedging a call type.
+            min_delay: Floor for the hedge delay, in seconds.
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._stats: dict[str, _HedgeStats] = {}
+        self.calls = 0
+        self.hedged = 0
+
+    def _for(self, key: str) -> _HedgeStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = _HedgeStats()
+            self._stats[key] = stats
+        return stats
+
+    def _hedge_delay(self, stats: _HedgeStats) -> float | None:
+        if not self.enabled or len(stats.latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, stats.percentile(self.percentile))
+
+    async def _timed(self, stats: _HedgeStats, factory: Callable[[], Awaitable[T]]) -> T:
+        timing = _CallTiming()
+        _call_timing.set(timing)
+        start = time.monotonic()
+        result = await factory()
+        # Factories without an api_call_timer fall back to the wall clock
+        stats.latencies.append(timing.seconds if timing.calls else time.monotonic() - start)
+        return result
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await ``factory()``, hedging with a second call if it runs long.
+
+        *factory* must start a fresh, independent call each time it is invoked.
+        """
+        stats = self._for(key)
+        stats.calls += 1
+        self.calls += 1
+
+        delay = self._hedge_delay(stats)
+        primary = asyncio.create_task(self._timed(stats, factory))
+        hedge: asyncio.Task | None = None
+        # Cancelling the caller must cancel the attempts too, so a dropped
+        # call stops holding its rate-limiter slot and spending quota
+        try:
+            if delay is None:
+                return await primary
+
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            if self.hedged + 1 > self.budget_ratio * self.calls:
+                stats.budget_denied += 1
+                return await primary
+
+            self.hedged += 1
+            stats.hedged += 1
+            logger.info("Hedging %s after %.1fs", key, delay)
+            hedge = asyncio.create_task(self._timed(stats, factory))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        return task.result()
+            # Both attempts failed: surface the primary's error
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        keys = {}
+        for key, stats in self._stats.items():
+            p50 = stats.percentile(0.5)
+            tail = stats.percentile(self.percentile)
+            keys[key] = {
+                "calls": stats.calls,
+                "hedged": stats.hedged,
+                "hedge_wins": stats.hedge_wins,
+                "hedge_win_rate": round(stats.hedge_wins / stats.hedged, 3) if stats.hedged else 0.0,
+                "budget_denied": stats.budget_denied,
+                "p50_seconds": round(p50, 3) if p50 is not None else None,
+                "hedge_after_seconds": round(tail, 3) if tail is not None else None,
+            }
+        return {
+            "enabled": self.enabled,
+            "budget_ratio": self.budget_ratio,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "calls_by_type": keys,
+        }
@@ -0,0 +1,167 @@
+"""Reference-image preparation before inline upload to Gemini.
+
+Uploaded products may be JPEG or WebP and generated avatars are 2K PNGs,
+but every call used to send them as-is labelled ``image/png``.
+``ImagePreparer`` inspects each image once, labels it with its real MIME
+type and, per call purpose, downscales it to the longest side that purpose
+needs (QC does not need 2K) and re-encodes it compactly: JPEG, or PNG when
+the image has transparency.
+
+Results for a run's references are memoized per (run, image hash, purpose),
+so a reference is transcoded once per run however many scenes use it.
+Without ffmpeg, or when transcoding fails or would not shrink the image,
+the original bytes are sent with the correct MIME type.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from google.genai import types
+
+from app.utils.ffmpeg import check_ffmpeg, transcode_image
+from app.utils.images import GEMINI_IMAGE_MIME_TYPES, probe_image, sniff_mime
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    original_bytes: int
+
+    def to_part(self) -> types.Part:
+        return types.Part.from_bytes(data=self.data, mime_type=self.mime_type)
+
+
+class ImagePreparer:
+    def __init__(
+        self,
+        max_side: dict[str, int],
+        jpeg_qscale: int = 3,
+        enabled: bool = True,
+        max_runs: int = 16,
+    ):
+        """
+        Args:
+            max_side: Longest side in pixels per call purpose ("qc",
+                "script", "generation"); purposes not listed keep their size.
+            jpeg_qscale: ffmpeg JPEG quality scale (2-31, lower is better).
+            max_runs: Runs whose prepared references are kept in memory.
+        """
+        self.max_side = max_side
+        self.jpeg_qscale = jpeg_qscale
+        self.enabled = enabled and check_ffmpeg()
+        self.max_runs = max_runs
+        self._runs: OrderedDict[str, dict[tuple[str, str], asyncio.Task]] = OrderedDict()
+        self._stats = {
+            "prepared": 0,
+            "memo_hits": 0,
+            "transcoded": 0,
+            "transcode_failures": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "transcode_seconds": 0.0,
+        }
+
+    async def part(self, data: bytes, purpose: str, run_id: str | None = None) -> types.Part:
+        """Prepared inline Part for *data*; memoized when *run_id* is given."""
+        return (await self.prepare(data, purpose, run_id)).to_part()
+
+    async def prepare(self, data: bytes, purpose: str, run_id: str | None = None) -> PreparedImage:
+        if run_id is None:
+            return await self._prepare(data, purpose)
+
+        memo = self._runs.get(run_id)
+        if memo is None:
+            memo = self._runs[run_id] = {}
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+        else:
+            self._runs.move_to_end(run_id)
+
+        key = (hashlib.sha256(data).hexdigest(), purpose)
+        task = memo.get(key)
+        if task is None:
+            # Store the task so concurrent scenes share one transcode
+            task = memo[key] = asyncio.ensure_future(self._prepare(data, purpose))
+        else:
+            self._stats["memo_hits"] += 1
+        return await asyncio.shield(task)
+
+    def release(self, run_id: str) -> None:
+        """Drop the prepared references memoized for *run_id*."""
+        self._runs.pop(run_id, None)
+
+    async def _prepare(self, data: bytes, purpose: str) -> PreparedImage:
+        self._stats["prepared"] += 1
+        self._stats["bytes_in"] += len(data)
+        prepared = await self._transcode(data, purpose)
+        self._stats["bytes_out"] += len(prepared.data)
+        return prepared
+
+    async def _transcode(self, data: bytes, purpose: str) -> PreparedImage:
+        info = probe_image(data)
+        original = PreparedImage(data, sniff_mime(data), len(data))
+        if not self.enabled:
+            return original
+
+        max_side = self.max_side.get(purpose)
+        longest = max(info.width or 0, info.height or 0)
+        needs_resize = bool(max_side and longest > max_side)
+        supported = info.mime_type in GEMINI_IMAGE_MIME_TYPES
+        # Lossless PNGs without transparency are re-encoded even at size
+        compactable = info.mime_type == "image/png" and not info.has_alpha
+        if not (needs_resize or compactable or not supported):
+            return original
+
+        width, height = info.width, info.height
+        if not (width and height):
+            # Unknown dimensions: let ffmpeg keep the source size
+            width = height = -1
+        elif needs_resize:
+            scale = max_side / longest
+            # Even dimensions keep chroma-subsampled encoders happy
+            width = max(2, round(width * scale / 2) * 2)
+            height = max(2, round(height * scale / 2) * 2)
+
+        output_format = "png" if info.has_alpha else "jpeg"
+        start = time.perf_counter()
+        try:
+            encoded = await transcode_image(
+                data, width, height, output_format=output_format, jpeg_qscale=self.jpeg_qscale
+            )
+        except Exception as exc:
+            self._stats["transcode_failures"] += 1
+            logger.warning("Reference image transcode failed, sending original: %s", exc)
+            return original
+        finally:
+            self._stats["transcode_seconds"] += time.perf_counter() - start
+
+        if supported and not needs_resize and len(encoded) >= len(data):
+            return original
+        self._stats["transcoded"] += 1
+        logger.debug(
+            "Prepared %s reference for %s: %s %dB -> %s %dB",
+            purpose, info.mime_type, f"{info.width}x{info.height}", len(data),
+            output_format, len(encoded),
+        )
+        return PreparedImage(encoded, f"image/{output_format}", len(data))
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["transcode_seconds"] = round(stats["transcode_seconds"], 3)
+        stats["bytes_saved"] = stats["bytes_in"] - stats["bytes_out"]
+        stats["size_ratio"] = (
+            round(stats["bytes_out"] / stats["bytes_in"], 3) if stats["bytes_in"] else 1.0
+        )
+        return {
+            "enabled": self.enabled,
+            "max_side": self.max_side,
+            **stats,
+            "memoized_runs": len(self._runs),
+        }
@@ -12,6 +12,8 @@ import logging
 from google import genai
 from google.genai import types
 
+from app.ai.breaker import CircuitBreakers
+from app.ai.rate_limit import RateLimiter
 from app.ai.retry import async_retry
 from app.config import Settings
 
@@ -19,9 +21,17 @@ logger = logging.getLogger(__name__)
 
 
 class ImagenService:
-    def __init__(self, client: genai.Client, settings: Settings):
+    def __init__(
+        self,
+        client: genai.Client,
+        settings: Settings,
+        limiter: RateLimiter | None = None,
+        breakers: CircuitBreakers | None = None,
+    ):
         self.client = client
         self.settings = settings
+        self.limiter = limiter or RateLimiter()
+        self.breakers = breakers or CircuitBreakers()
 
     @async_retry(retries=3)
     async def generate_images(
@@ -36,7 +46,7 @@ class ImagenService:
         Returns a list of raw image bytes. Imagen 4's generate_images
         can produce up to 4 images per call, so for >4 we batch.
         """
-        effective_model = model or self.settings.imagen_model
+        effective_model = self.breakers.route(model or self.settings.imagen_model)
 
         config = types.GenerateImagesConfig(
             number_of_images=min(num_images, 4),
@@ -44,12 +54,13 @@ class ImagenService:
             aspect_ratio=aspect_ratio,
         )
 
-        response = await asyncio.to_thread(
-            self.client.models.generate_images,
-            model=effective_model,
-            prompt=prompt,
-            config=config,
-        )
+        async with self.limiter.slot(effective_model), self.breakers.call(effective_model):
+            response = await asyncio.to_thread(
+                self.client.models.generate_images,
+                model=effective_model,
+                prompt=prompt,
+                config=config,
+            )
 
         images: list[bytes] = []
         if response.generated_images:
@@ -0,0 +1,235 @@
+"""Process-wide tracker for long-running genai operations (Veo).
+
+Instead of one sleeping coroutine per ``generate_videos`` call, every
+operation is registered here and a single background loop polls all
+in-flight operations.  Each operation gets its own next-poll deadline that
+adapts to the model's expected completion time: sparse while the job is
+still far from done, dense around the expected finish, and backing off
+gently once it overruns.  Expected durations start from per-model defaults
+and are refined with an EWMA of observed completion times.
+
+Usage::
+
+    future = tracker.track(operation, model_id="veo-3.1-generate-preview")
+    completed = await future
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from google import genai
+
+logger = logging.getLogger(__name__)
+
+# Typical end-to-end generation time for an 8s clip, per model (seconds).
+_DEFAULT_EXPECTED_SECONDS: dict[str, float] = {
+    "veo-3.1-generate-preview": 90.0,
+    "veo-3.1-generate-001": 90.0,
+    "veo-3.1-fast-generate-001": 50.0,
+}
+# Weight of the newest observation in the expected-duration EWMA
+_EWMA_ALPHA = 0.3
+# Consecutive poll errors before an operation is failed
+_MAX_POLL_ERRORS = 5
+
+
+@dataclass
+class _TrackedOperation:
+    operation: object
+    model_id: str
+    future: asyncio.Future
+    started_at: float
+    next_poll_at: float
+    # Time of the last poll that saw the operation still running
+    last_poll_at: float | None = None
+    polls: int = 0
+    errors: int = 0
+
+
+@dataclass
+class OperationTrackerStats:
+    in_flight: int = 0
+    completed: int = 0
+    failed: int = 0
+    polls: int = 0
+    wasted_polls: int = 0
+    # Detection delay = time between the last "not done" poll and the poll
+    # that saw completion; the true delay lies within this window.  Only
+    # operations with a "not done" poll have a window.
+    detections: int = 0
+    detection_delay_total: float = 0.0
+    detection_delay_max: float = 0.0
+    expected_seconds: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        detected = self.completed + self.failed
+        return {
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "polls": self.polls,
+            "wasted_polls": self.wasted_polls,
+            "polls_per_operation": round(self.polls / detected, 2) if detected else 0.0,
+            "avg_detection_delay_seconds": (
+                round(self.detection_delay_total / self.detections, 2) if self.detections else 0.0
+            ),
+            "max_detection_delay_seconds": round(self.detection_delay_max, 2),
+            "expected_seconds": {k: round(v, 1) for k, v in self.expected_seconds.items()},
+        }
+
+
+class OperationTracker:
+    def __init__(
+        self,
+        client: genai.Client,
+        min_interval: float = 4.0,
+        max_interval: float = 30.0,
+        default_expected_seconds: float = 90.0,
+    ):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_expected_seconds = default_expected_seconds
+        self._ops: list[_TrackedOperation] = []
+        self._expected: dict[str, float] = dict(_DEFAULT_EXPECTED_SECONDS)
+        self._wakeup: asyncio.Event | None = None
+        self._loop_task: asyncio.Task | None = None
+        self._stats = OperationTrackerStats()
+
+    def track(self, operation, model_id: str) -> asyncio.Future:
+        """Register an operation and return a future resolved with the completed operation."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        if getattr(operation, "done", False):
+            future.set_result(operation)
+            return future
+
+        now = time.monotonic()
+        tracked = _TrackedOperation(
+            operation=operation,
+            model_id=model_id,
+            future=future,
+            started_at=now,
+            next_poll_at=now,
+        )
+        tracked.next_poll_at = now + self._next_interval(tracked, now)
+        self._ops.append(tracked)
+        self._ensure_loop()
+        self._wakeup.set()
+        logger.debug(
+            "Tracking operation %s (model=%s, in flight: %d)",
+            getattr(operation, "name", ""), model_id, len(self._ops),
+        )
+        return future
+
+    def stats(self) -> dict:
+        self._stats.in_flight = len(self._ops)
+        self._stats.expected_seconds = dict(self._expected)
+        return self._stats.to_dict()
+
+    def expected_seconds(self, model_id: str) -> float:
+        return self._expected.get(model_id, self.default_expected_seconds)
+
+    def _next_interval(self, tracked: _TrackedOperation, now: float) -> float:
+        """Pick the delay until the next poll for *tracked*.
+
+        Before the expected finish we sleep for half the remaining time
+        (so polls converge on the deadline); past it we back off in
+        proportion to the overrun.
+        """
+        expected = self.expected_seconds(tracked.model_id)
+        elapsed = now - tracked.started_at
+        remaining = expected - elapsed
+        if remaining > 0:
+            interval = remaining / 2
+        else:
+            interval = self.min_interval + (-remaining) * 0.25
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _ensure_loop(self) -> None:
+        if self._loop_task is None or self._loop_task.done():
+            self._wakeup = asyncio.Event()
+            self._loop_task = asyncio.create_task(self._run(), name="veo-operation-tracker")
+
+    async def _run(self) -> None:
+        while self._ops:
+            # Drop operations whose callers have gone away (cancelled)
+            self._ops = [t for t in self._ops if not t.future.done()]
+            if not self._ops:
+                break
+
+            now = time.monotonic()
+            due = [t for t in self._ops if t.next_poll_at <= now]
+            if not due:
+                sleep_for = min(t.next_poll_at for t in self._ops) - now
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self.client.operations.get, t.operation) for t in due),
+                return_exceptions=True,
+            )
+            polled_at = time.monotonic()
+            for tracked, result in zip(due, results):
+                self._handle_poll_result(tracked, result, polled_at)
+
+    def _handle_poll_result(self, tracked: _TrackedOperation, result, polled_at: float) -> None:
+        self._stats.polls += 1
+        tracked.polls += 1
+
+        if isinstance(result, Exception):
+            tracked.errors += 1
+            logger.warning(
+                "Polling operation %s failed (%d/%d): %s",
+                getattr(tracked.operation, "name", ""), tracked.errors, _MAX_POLL_ERRORS, result,
+            )
+            if tracked.errors >= _MAX_POLL_ERRORS:
+                self._finish(tracked, polled_at, exc=result)
+            else:
+                tracked.next_poll_at = polled_at + self._next_interval(tracked, polled_at)
+            return
+
+        tracked.errors = 0
+        tracked.operation = result
+        if getattr(result, "done", False):
+            self._finish(tracked, polled_at)
+            return
+
+        self._stats.wasted_polls += 1
+        tracked.last_poll_at = polled_at
+        tracked.next_poll_at = polled_at + self._next_interval(tracked, polled_at)
+
+    def _finish(self, tracked: _TrackedOperation, polled_at: float, exc: Exception | None = None) -> None:
+        self._ops.remove(tracked)
+        delay = None
+        if tracked.last_poll_at is not None:
+            delay = polled_at - tracked.last_poll_at
+            self._stats.detections += 1
+            self._stats.detection_delay_total += delay
+            self._stats.detection_delay_max = max(self._stats.detection_delay_max, delay)
+
+        if exc is not None:
+            self._stats.failed += 1
+            if not tracked.future.done():
+                tracked.future.set_exception(exc)
+            return
+
+        self._stats.completed += 1
+        duration = polled_at - tracked.started_at
+        previous = self.expected_seconds(tracked.model_id)
+        self._expected[tracked.model_id] = (
+            _EWMA_ALPHA * duration + (1 - _EWMA_ALPHA) * previous
+        )
+        logger.info(
+            "Operation %s done after %.0fs (%d polls, detection window %s)",
+            getattr(tracked.operation, "name", ""), duration, tracked.polls,
+            f"{delay:.1f}s" if delay is not None else "n/a (done on first poll)",
+        )
+        if not tracked.future.done():
+            tracked.future.set_result(tracked.operation)
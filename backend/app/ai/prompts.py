@@ -4,6 +4,8 @@ All prompt constants are defined here for centralized management.
 Templates use Python str.format() style placeholders.
 """
 
+import hashlib
+
 # ---------------------------------------------------------------------------
 # Script generation
 # ---------------------------------------------------------------------------
@@ -194,6 +196,38 @@ NOT an illustration, NOT a cartoon, NOT a 3D render. \
 Photorealistic only.\
 """
 
+# Ranking for unattended runs: every generated variant follows behind a
+# "VARIANT <n>:" label and the best one is used without a human pick.
+AVATAR_RANKING_PROMPT_TEMPLATE = """\
+You are casting the on-screen presenter for a product commercial. Several \
+AI-generated avatar portraits follow, each introduced by a "VARIANT <n>:" \
+label. The presenter must match this profile:
+
+Gender: {gender}
+Age range: {age_range}
+Attire: {attire}
+Tone of voice: {tone_of_voice}
+Description: {visual_description}
+
+Score each variant 0-10 on its fitness as the presenter, weighing:
+- Match to the profile above (gender, age, attire, look)
+- Photorealism: natural skin, no plastic, painted or 3D-render look
+- Anatomical integrity: face symmetry, eyes, teeth, hands and fingers if visible
+- Usability as a video reference: clear face, neutral framing, clean \
+backdrop, no text, watermarks or extra people
+
+Then rank all variants from best to worst.
+
+Return ONLY this JSON, with exactly one entry per variant:
+{{
+  "variants": [
+    {{"variant": <n>, "score": <0-10>, "reasoning": "Brief explanation"}}
+  ],
+  "ranking": [<variant numbers, best first>],
+  "ranking_reasoning": "Why the top variant is the best presenter"
+}}\
+"""
+
 # ---------------------------------------------------------------------------
 # Storyboard image generation
 # ---------------------------------------------------------------------------
@@ -286,14 +320,7 @@ STORYBOARD_QC_SYSTEM_INSTRUCTION = (
     "You ALWAYS output valid JSON with no additional text."
 )
 
-STORYBOARD_QC_USER_PROMPT = """\
-You are given three images:
-1. REFERENCE AVATAR - the approved avatar portrait
-2. REFERENCE PRODUCT - the original product photograph
-3. STORYBOARD FRAME - the generated storyboard image to evaluate
-
-Evaluate the storyboard frame on these dimensions:
-
+_STORYBOARD_QC_CRITERIA = """\
 AVATAR VALIDATION (0-100):
 - Face shape, skin tone, eye color match
 - Hair color, style, and length match
@@ -312,6 +339,20 @@ COMPOSITION QUALITY (0-100):
 - Background appropriateness
 - Overall advertising-ready quality
 
+"""
+
+STORYBOARD_QC_USER_PROMPT = (
+    """\
+You are given three images:
+1. REFERENCE AVATAR - the approved avatar portrait
+2. REFERENCE PRODUCT - the original product photograph
+3. STORYBOARD FRAME - the generated storyboard image to evaluate
+
+Evaluate the storyboard frame on these dimensions:
+
+"""
+    + _STORYBOARD_QC_CRITERIA
+    + """\
 Return ONLY this JSON:
 {{
   "avatar_validation": {{
@@ -328,6 +369,36 @@ Return ONLY this JSON:
   }}
 }}\
 """
+)
+
+# Batched variant: both references are sent once, followed by one labelled
+# image per storyboard frame ("FRAME <n>:" text part before each image).
+STORYBOARD_QC_BATCH_USER_PROMPT = (
+    """\
+You are given two reference images followed by several storyboard frames:
+1. REFERENCE AVATAR - the approved avatar portrait
+2. REFERENCE PRODUCT - the original product photograph
+Then each STORYBOARD FRAME to evaluate, introduced by a "FRAME <n>:" label.
+
+Evaluate EACH storyboard frame independently against the references on \
+these dimensions:
+
+"""
+    + _STORYBOARD_QC_CRITERIA
+    + """\
+Return ONLY this JSON, with exactly one report per frame in frame order:
+{
+  "reports": [
+    {
+      "frame": <n>,
+      "avatar_validation": {"score": <0-100>, "reason": "Brief explanation"},
+      "product_validation": {"score": <0-100>, "reason": "Brief explanation"},
+      "composition_quality": {"score": <0-100>, "reason": "Brief explanation"}
+    }
+  ]
+}\
+"""
+)
 
 # ---------------------------------------------------------------------------
 # Video QC
@@ -342,13 +413,7 @@ VIDEO_QC_SYSTEM_INSTRUCTION = (
     "You ALWAYS output valid JSON with no additional text."
 )
 
-VIDEO_QC_USER_PROMPT = """\
-Evaluate this AI-generated video clip for a product commercial.
-
-The first image is the reference product photo. The video follows.
-
-Score each dimension 0-10 (where 7+ is production-ready):
-
+_VIDEO_QC_DIMENSIONS = """\
 1. TECHNICAL DISTORTION: Artifacts, glitches, resolution drops, \
 encoding errors, frame drops
 2. CINEMATIC IMPERFECTIONS: Camera stability, lighting consistency, \
@@ -366,6 +431,19 @@ and objects, no extra or missing digits
 no competitor logos appear, product brand name spelled correctly if visible, \
 no text morphing or distortion across frames
 
+"""
+
+VIDEO_QC_USER_PROMPT = (
+    """\
+Evaluate this AI-generated video clip for a product commercial.
+
+The first image is the reference product photo. The video follows.
+
+Score each dimension 0-10 (where 7+ is production-ready):
+
+"""
+    + _VIDEO_QC_DIMENSIONS
+    + """\
 Return ONLY this JSON:
 {{
   "technical_distortion": {{
@@ -399,22 +477,52 @@ Return ONLY this JSON:
   "overall_verdict": "PASS or FAIL with brief summary"
 }}\
 """
+)
 
-# ---------------------------------------------------------------------------
-# Prompt rewriting
-# ---------------------------------------------------------------------------
+# Comparative variant: the reference image, then every Veo variant of a
+# scene behind a "VARIANT <n>:" label, judged side by side in one call.
+VIDEO_QC_COMPARATIVE_USER_PROMPT = (
+    """\
+Evaluate several AI-generated video variants of the same product commercial \
+scene and rank them against each other.
 
-PROMPT_REWRITE_TEMPLATE = """\
-The following prompt produced a result that failed quality control. \
-Rewrite the prompt to fix the specific issues identified.
+The first image is the reference product photo. Each variant video follows, \
+introduced by a "VARIANT <n>:" label.
 
-ORIGINAL PROMPT:
-{original_prompt}
+Score each variant on each dimension 0-10 (where 7+ is production-ready), \
+judging the variants side by side so scores are consistent across them:
 
-QC FEEDBACK:
-{qc_feedback}
+"""
+    + _VIDEO_QC_DIMENSIONS
+    + """\
+Then rank all variants from best to worst for use in the final commercial.
+
+Return ONLY this JSON, with exactly one entry per variant:
+{
+  "variants": [
+    {
+      "variant": <n>,
+      "technical_distortion": {"score": <0-10>, "reasoning": "Brief explanation"},
+      "cinematic_imperfections": {"score": <0-10>, "reasoning": "Brief explanation"},
+      "avatar_consistency": {"score": <0-10>, "reasoning": "Brief explanation"},
+      "product_consistency": {"score": <0-10>, "reasoning": "Brief explanation"},
+      "temporal_coherence": {"score": <0-10>, "reasoning": "Brief explanation"},
+      "hand_body_integrity": {"score": <0-10>, "reasoning": "Brief explanation"},
+      "brand_text_accuracy": {"score": <0-10>, "reasoning": "Brief explanation"},
+      "overall_verdict": "PASS or FAIL with brief summary"
+    }
+  ],
+  "ranking": [<variant numbers, best first>],
+  "ranking_reasoning": "Why the top variant beats the others"
+}\
+"""
+)
 
-INSTRUCTIONS:
+# ---------------------------------------------------------------------------
+# Prompt rewriting
+# ---------------------------------------------------------------------------
+
+_PROMPT_REWRITE_GUIDANCE = """\
 - Keep the same scene intent and composition
 - Add more specific details to address each QC issue
 - Strengthen identity-preservation language for the avatar if avatar score was low
@@ -429,7 +537,90 @@ logos other than the product's own label", reinforce product label \
 stability
 - If temporal coherence scored low: simplify motion instructions, reduce \
 camera movement complexity, add "continuous smooth motion"
+"""
+
+PROMPT_REWRITE_TEMPLATE = (
+    """\
+The following prompt produced a result that failed quality control. \
+Rewrite the prompt to fix the specific issues identified.
+
+ORIGINAL PROMPT:
+{original_prompt}
+
+QC FEEDBACK:
+{qc_feedback}
+
+INSTRUCTIONS:
+"""
+    + _PROMPT_REWRITE_GUIDANCE
+    + """\
 - Do NOT add JSON formatting — return only the improved prompt as plain text
 
 IMPROVED PROMPT:\
 """
+)
+
+# Fused QC + rewrite: appended to a single-item QC prompt (storyboard or
+# video) so a failing verdict comes back with the next attempt's prompt in
+# the same response.
+QC_REWRITE_SUFFIX = (
+    """
+
+The result above was generated from the GENERATION PROMPT below. It passes \
+quality control only if {required} each score at least {threshold}. If any \
+of them scores lower, also include a "rewritten_prompt" field in the JSON: \
+the generation prompt rewritten to fix the issues you found, following \
+these rules:
+"""
+    + _PROMPT_REWRITE_GUIDANCE
+    + """\
+- The rewritten prompt is plain text; do not put JSON or markdown inside it
+
+If the result passes, set "rewritten_prompt" to null.
+
+GENERATION PROMPT:
+{original_prompt}\
+"""
+)
+
+# Fused QC + rewrite for a storyboard batch: appended to
+# STORYBOARD_QC_BATCH_USER_PROMPT; {frame_prompts} holds a "FRAME <n>:"
+# block per frame that carries its generation prompt.
+STORYBOARD_QC_BATCH_REWRITE_SUFFIX = (
+    """
+
+Each frame listed under GENERATION PROMPTS below was generated from that \
+prompt. Such a frame passes quality control only if {required} each score at \
+least {threshold}. If any of them scores lower, also include a \
+"rewritten_prompt" field in that frame's report: its generation prompt \
+rewritten to fix the issues you found, following these rules:
+"""
+    + _PROMPT_REWRITE_GUIDANCE
+    + """\
+- The rewritten prompt is plain text; do not put JSON or markdown inside it
+
+For frames that pass, or that have no generation prompt, set \
+"rewritten_prompt" to null.
+
+GENERATION PROMPTS:
+{frame_prompts}\
+"""
+)
+
+
+# ---------------------------------------------------------------------------
+# Prompt versions (part of response cache keys)
+# ---------------------------------------------------------------------------
+
+
+def prompt_version(*templates: str) -> str:
+    """Short digest of prompt text; editing a prompt changes its version."""
+    digest = hashlib.sha256("\x00".join(templates).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+SCRIPT_PROMPT_VERSION = prompt_version(SCRIPT_SYSTEM_INSTRUCTION, SCRIPT_USER_PROMPT_TEMPLATE)
+STORYBOARD_QC_PROMPT_VERSION = prompt_version(
+    STORYBOARD_QC_SYSTEM_INSTRUCTION, STORYBOARD_QC_USER_PROMPT
+)
+VIDEO_QC_PROMPT_VERSION = prompt_version(VIDEO_QC_SYSTEM_INSTRUCTION, VIDEO_QC_USER_PROMPT)
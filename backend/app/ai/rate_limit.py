@@ -0,0 +1,241 @@
+"""Process-wide, per-model rate limiting for genai calls.
+
+``async_retry`` only reacts after a 429, and every decorated method backs off
+on its own, so under bulk load concurrent jobs collide into 429 storms and
+retry in lockstep.  ``RateLimiter`` gates every call up front instead: each
+model ID gets a token bucket (requests per minute) and a cap on concurrent
+operations, shared by all services in the process.
+
+With ``adaptive`` enabled the concurrency cap is an ``AIMDLimiter`` whose
+configured ``max_concurrent`` is the ceiling, so the effective limit tracks
+the actual quota from 429/503 and latency back-pressure.
+
+Queue-wait times are recorded per model so quotas can be sized from real
+traffic (see ``stats()``).
+
+``track_overloads`` scopes the 429/503 count to a unit of work (e.g. one bulk
+job): calls made from the block, and from tasks it starts, add to its
+counter instead of only to the process-wide total.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from google.genai import errors as genai_errors
+
+from app.ai.concurrency import OVERLOAD_CODES, AIMDLimiter
+
+logger = logging.getLogger(__name__)
+
+# Number of recent queue waits kept per model for percentile reporting
+_WAIT_SAMPLES = 500
+
+
+class OverloadCounter:
+    def __init__(self):
+        self.overloads = 0
+
+
+# Tasks copy the context when created, so subtasks share the same counter
+_overload_counter: ContextVar[OverloadCounter | None] = ContextVar(
+    "overload_counter", default=None
+)
+
+
+@contextmanager
+def track_overloads() -> Iterator[OverloadCounter]:
+    """Count 429/503 errors raised by calls made within the block."""
+    counter = OverloadCounter()
+    token = _overload_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _overload_counter.reset(token)
+
+
+class _ModelBucket:
+    def __init__(self, model_id: str, rpm: int, max_concurrent: int, adaptive: bool):
+        self.rpm = rpm
+        self.max_concurrent = max_concurrent
+        # Allow bursts of up to ten seconds' worth of requests
+        self.capacity = max(1.0, rpm / 6) if rpm > 0 else 0.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.concurrency = (
+            AIMDLimiter(model_id, initial=max_concurrent) if adaptive and max_concurrent > 0 else None
+        )
+        self.semaphore = (
+            asyncio.Semaphore(max_concurrent) if not adaptive and max_concurrent > 0 else None
+        )
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self.total_wait = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rpm / 60)
+        self.updated = now
+
+    async def take_token(self) -> None:
+        if self.rpm <= 0:
+            return
+        # The lock keeps waiters FIFO so one caller can't starve the rest
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * 60 / self.rpm)
+
+    async def acquire_concurrency(self) -> None:
+        if self.concurrency:
+            await self.concurrency.acquire()
+        elif self.semaphore:
+            await self.semaphore.acquire()
+
+    async def release_concurrency(self) -> None:
+        if self.concurrency:
+            await self.concurrency.release()
+        elif self.semaphore:
+            self.semaphore.release()
+
+    def drain(self) -> None:
+        """Empty the bucket after a 429 so queued callers slow down together."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+        self.throttled += 1
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        limits: dict[str, dict[str, int]] | None = None,
+        default_rpm: int = 0,
+        default_max_concurrent: int = 0,
+        adaptive: bool = False,
+    ):
+        """
+        Args:
+            limits: Per-model overrides, e.g.
+                ``{"veo-3.1-generate-preview": {"rpm": 10, "max_concurrent": 10}}``.
+            default_rpm: Requests/minute for models without an override.
+                0 disables the rate cap.
+            default_max_concurrent: Concurrent operations for models without
+                an override. 0 disables the concurrency cap.
+            adaptive: Treat ``max_concurrent`` as an AIMD ceiling rather
+                than a fixed cap.
+        """
+        self.limits = limits or {}
+        self.default_rpm = default_rpm
+        self.default_max_concurrent = default_max_concurrent
+        self.adaptive = adaptive
+        self._buckets: dict[str, _ModelBucket] = {}
+        self.overloads = 0
+
+    def _bucket(self, model_id: str) -> _ModelBucket:
+        bucket = self._buckets.get(model_id)
+        if bucket is None:
+            limit = self.limits.get(model_id, {})
+            bucket = _ModelBucket(
+                model_id,
+                rpm=limit.get("rpm", self.default_rpm),
+                max_concurrent=limit.get("max_concurrent", self.default_max_concurrent),
+                adaptive=self.adaptive,
+            )
+            self._buckets[model_id] = bucket
+        return bucket
+
+    @asynccontextmanager
+    async def slot(self, model_id: str):
+        """Hold one request/operation slot for *model_id* for the block's duration.
+
+        The concurrency slot is taken before the rate token so no token is
+        spent while waiting for an operation to finish.  A 429 raised inside
+        the block drains the model's bucket; 429/503 and call latency feed
+        the adaptive concurrency limit.
+        """
+        bucket = self._bucket(model_id)
+        start = time.monotonic()
+        bucket.waiting += 1
+        try:
+            await bucket.acquire_concurrency()
+            try:
+                await bucket.take_token()
+            except BaseException:
+                await bucket.release_concurrency()
+                raise
+        finally:
+            bucket.waiting -= 1
+
+        wait = time.monotonic() - start
+        bucket.waits.append(wait)
+        bucket.total_wait += wait
+        bucket.acquired += 1
+        bucket.in_flight += 1
+        if wait > 1.0:
+            logger.info("Waited %.1fs for a %s slot", wait, model_id)
+        call_start = time.monotonic()
+        try:
+            yield
+        except genai_errors.APIError as exc:
+            code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+            if code == 429:
+                bucket.drain()
+                logger.warning("429 from %s, draining its rate bucket", model_id)
+            if code in OVERLOAD_CODES:
+                self.overloads += 1
+                counter = _overload_counter.get()
+                if counter is not None:
+                    counter.overloads += 1
+                if bucket.concurrency:
+                    bucket.concurrency.on_overload()
+            raise
+        else:
+            if bucket.concurrency:
+                bucket.concurrency.on_success(time.monotonic() - call_start)
+        finally:
+            bucket.in_flight -= 1
+            await bucket.release_concurrency()
+
+    def stats(self) -> dict:
+        models = {}
+        for model_id, bucket in self._buckets.items():
+            waits = sorted(bucket.waits)
+            models[model_id] = {
+                "rpm": bucket.rpm,
+                "max_concurrent": bucket.max_concurrent,
+                "concurrency_limit": (
+                    bucket.concurrency.current_limit if bucket.concurrency else bucket.max_concurrent
+                ),
+                "in_flight": bucket.in_flight,
+                "queued": bucket.waiting,
+                "acquired": bucket.acquired,
+                "throttled": bucket.throttled,
+                "average_wait_seconds": (
+                    round(bucket.total_wait / bucket.acquired, 3) if bucket.acquired else 0.0
+                ),
+                "p50_wait_seconds": round(statistics.median(waits), 3) if waits else 0.0,
+                "p95_wait_seconds": (
+                    round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else 0.0
+                ),
+                "max_wait_seconds": round(waits[-1], 3) if waits else 0.0,
+            }
+        return {
+            "default_rpm": self.default_rpm,
+            "default_max_concurrent": self.default_max_concurrent,
+            "adaptive": self.adaptive,
+            "overloads": self.overloads,
+            "models": models,
+        }
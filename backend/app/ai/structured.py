@@ -0,0 +1,209 @@
+"""Schema-validated JSON responses with in-place repair.
+
+Gemini calls that return JSON are given a response schema derived from the
+Pydantic model the caller builds from the result.  ``StructuredOutput.parse``
+validates each response against that model; when it does not validate it
+tries, in order:
+
+1. a local repair of the text (code fences, trailing commas, truncation),
+2. one small re-ask on the Flash model with the validation error and the
+   broken output, constrained to the same schema,
+
+before giving up with ``StructuredOutputError``.  A malformed response thus
+costs at most one extra text-only call instead of failing the stage.
+Failures and repairs are counted per (call kind, model).
+"""
+
+import json
+import logging
+import re
+import types as pytypes
+from typing import Awaitable, Callable, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError, create_model
+
+from app.utils.json_parser import parse_json_response
+
+logger = logging.getLogger(__name__)
+
+REPAIR_PROMPT_TEMPLATE = """The JSON below was produced for a structured-output request but is invalid.
+
+SCHEMA:
+{schema}
+
+ERROR:
+{error}
+
+INVALID OUTPUT:
+{output}
+
+Return ONLY the corrected JSON object. Keep every value that is already
+valid exactly as it is; fix syntax, fill missing required fields and coerce
+types so that it satisfies the schema."""
+
+# Cap on how much of the broken output is echoed back in a re-ask
+_MAX_REPAIR_INPUT_CHARS = 30000
+
+
+class StructuredOutputError(ValueError):
+    """A response could not be parsed or repaired into its schema."""
+
+
+def response_model(model: type[BaseModel], *required: str) -> type[BaseModel]:
+    """Subclass of *model* whose listed optional fields are required.
+
+    Used where the application model tolerates missing fields (for display)
+    but the generation call must return them.
+    """
+    fields = {}
+    for name in required:
+        annotation = model.model_fields[name].annotation
+        if get_origin(annotation) in (Union, pytypes.UnionType):
+            args = [a for a in get_args(annotation) if a is not type(None)]
+            annotation = args[0] if len(args) == 1 else Union[tuple(args)]
+        fields[name] = (annotation, ...)
+    return create_model(f"{model.__name__}Response", __base__=model, **fields)
+
+
+def repair_json_text(text: str) -> str:
+    """Best-effort syntactic repair of a JSON object.
+
+    Strips text around the outermost object, drops trailing commas and
+    closes strings, arrays and objects left open by a truncated response.
+    """
+    start = text.find("{")
+    if start == -1:
+        return text
+    text = text[start:]
+    end = text.rfind("}")
+
+    stack: list[str] = []
+    in_string = escape = False
+    for c in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "{[":
+            stack.append("}" if c == "{" else "]")
+        elif c in "}]" and stack:
+            stack.pop()
+
+    if not stack and end != -1:
+        # Balanced: drop anything after the closing brace
+        text = text[: end + 1]
+    else:
+        if in_string:
+            text += '"'
+        # A dangling key or separator cannot be completed; cut back to it
+        text = re.sub(r'(,\s*"[^"]*"\s*:?\s*|,\s*|:\s*)$', "", text)
+        text += "".join(reversed(stack))
+    return re.sub(r",(\s*[}\]])", r"\1", text)
+
+
+class _KindStats:
+    def __init__(self):
+        self.calls = 0
+        self.parse_failures = 0
+        self.repaired_locally = 0
+        self.repaired_by_reask = 0
+        self.unrecovered = 0
+
+
+class StructuredOutput:
+    def __init__(self, enabled: bool = True, reask: bool = True):
+        """
+        Args:
+            enabled: Attach response schemas to requests.  Validation and
+                repair apply either way.
+            reask: Allow the re-ask step when local repair fails.
+        """
+        self.enabled = enabled
+        self.reask = reask
+        self._stats: dict[tuple[str, str], _KindStats] = {}
+
+    def schema(self, model: type[BaseModel]) -> type[BaseModel] | None:
+        """Value for ``GenerateContentConfig.response_schema``."""
+        return model if self.enabled else None
+
+    def _for(self, kind: str, model_id: str) -> _KindStats:
+        key = (kind, model_id)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _KindStats()
+        return stats
+
+    @staticmethod
+    def _validate(text: str, model: type[BaseModel]) -> dict:
+        raw = parse_json_response(text)
+        model.model_validate(raw)
+        return raw
+
+    async def parse(
+        self,
+        kind: str,
+        model_id: str,
+        text: str | None,
+        model: type[BaseModel],
+        reask: Callable[[str, type[BaseModel]], Awaitable[str]],
+    ) -> dict:
+        """Return the response as a dict that validates against *model*.
+
+        Args:
+            kind: Call type, used for stats ("script", "qc_storyboard", ...).
+            model_id: Model that produced *text*.
+            reask: ``reask(prompt, model)`` runs a repair prompt constrained
+                to *model* and returns the new response text.
+        """
+        stats = self._for(kind, model_id)
+        stats.calls += 1
+        text = text or ""
+        try:
+            return self._validate(text, model)
+        except (ValueError, ValidationError) as exc:
+            error = exc
+        stats.parse_failures += 1
+        logger.warning("Invalid %s response from %s: %s", kind, model_id, str(error)[:300])
+
+        try:
+            raw = self._validate(repair_json_text(text), model)
+            stats.repaired_locally += 1
+            logger.info("Repaired %s response locally", kind)
+            return raw
+        except (ValueError, ValidationError):
+            pass
+
+        if self.reask:
+            prompt = REPAIR_PROMPT_TEMPLATE.format(
+                schema=json.dumps(model.model_json_schema(), separators=(",", ":")),
+                error=str(error)[:2000],
+                output=text[:_MAX_REPAIR_INPUT_CHARS],
+            )
+            try:
+                raw = self._validate(await reask(prompt, model), model)
+                stats.repaired_by_reask += 1
+                logger.info("Repaired %s response with a re-ask", kind)
+                return raw
+            except Exception as exc:
+                logger.warning("Re-ask for %s response failed: %s", kind, exc)
+
+        stats.unrecovered += 1
+        raise StructuredOutputError(f"Invalid {kind} response from {model_id}: {error}") from error
+
+    def stats(self) -> dict:
+        calls = {}
+        for (kind, model_id), s in self._stats.items():
+            calls.setdefault(kind, {})[model_id] = {
+                "calls": s.calls,
+                "parse_failures": s.parse_failures,
+                "failure_rate": round(s.parse_failures / s.calls, 4) if s.calls else 0.0,
+                "repaired_locally": s.repaired_locally,
+                "repaired_by_reask": s.repaired_by_reask,
+                "unrecovered": s.unrecovered,
+            }
+        return {"schemas_enabled": self.enabled, "reask_enabled": self.reask, "calls": calls}
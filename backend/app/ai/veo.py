@@ -4,7 +4,10 @@ import logging
 from google import genai
 from google.genai import types
 
+from app.ai.breaker import CircuitBreakers
+from app.ai.operations import OperationTracker
 from app.ai.prompts import VIDEO_NEGATIVE_PROMPT
+from app.ai.rate_limit import RateLimiter
 from app.ai.retry import async_retry
 from app.config import Settings
 
@@ -12,18 +15,28 @@ logger = logging.getLogger(__name__)
 
 
 class VeoService:
-    def __init__(self, client: genai.Client, settings: Settings):
+    def __init__(
+        self,
+        client: genai.Client,
+        settings: Settings,
+        tracker: OperationTracker | None = None,
+        limiter: RateLimiter | None = None,
+        breakers: CircuitBreakers | None = None,
+    ):
         self.client = client
         self.settings = settings
+        self.limiter = limiter or RateLimiter()
+        self.breakers = breakers or CircuitBreakers()
+        self.tracker = tracker or OperationTracker(
+            client,
+            min_interval=settings.veo_poll_min_interval,
+            max_interval=settings.veo_poll_max_interval,
+            default_expected_seconds=settings.veo_expected_seconds,
+        )
 
-    async def poll_operation(self, operation) -> object:
-        """Poll an async operation until done, using asyncio.sleep between checks."""
-        while not operation.done:
-            await asyncio.sleep(20)
-            operation = await asyncio.to_thread(
-                self.client.operations.get, operation
-            )
-        return operation
+    async def poll_operation(self, operation, model_id: str | None = None) -> object:
+        """Wait for an async operation via the shared operation tracker."""
+        return await self.tracker.track(operation, model_id or self.settings.veo_model)
 
     # GA models that silently ignore reference_images
     GA_MODELS = {"veo-3.1-generate-001", "veo-3.1-fast-generate-001"}
@@ -105,7 +118,8 @@ class VeoService:
         if seed is not None:
             config_kwargs["seed"] = seed
 
-        model_id = veo_model or self.settings.veo_model
+        # While the preview model's breaker is open this routes to veo_fast_model
+        model_id = self.breakers.route(veo_model or self.settings.veo_model)
 
         # Veo API: `image` and `reference_images` are mutually exclusive.
         # When asset references are provided, use reference_images for
@@ -146,14 +160,17 @@ class VeoService:
                 mime_type="image/png",
             )
 
-        operation = await asyncio.to_thread(
-            self.client.models.generate_videos,
-            **generate_kwargs,
-        )
+        # The slot covers the whole long-running operation, so max_concurrent
+        # caps in-flight Veo operations rather than just start requests
+        async with self.limiter.slot(model_id), self.breakers.call(model_id):
+            operation = await asyncio.to_thread(
+                self.client.models.generate_videos,
+                **generate_kwargs,
+            )
 
-        logger.info("Veo operation started: %s (model=%s)", getattr(operation, "name", ""), model_id)
+            logger.info("Veo operation started: %s (model=%s)", getattr(operation, "name", ""), model_id)
 
-        completed = await self.poll_operation(operation)
+            completed = await self.poll_operation(operation, model_id)
 
         video_uris: list[str] = []
         if completed.response and completed.response.generated_videos:
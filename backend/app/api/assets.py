@@ -1,9 +1,11 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
 
-from app.dependencies import get_local_storage
+from app.dependencies import get_local_storage, get_variant_store
 from app.storage.local import LocalStorage
+from app.storage.variants import VariantStore
 
 logger = logging.getLogger(__name__)
 
@@ -31,3 +33,21 @@ async def list_assets(
         "subdir": subdir or None,
         "files": url_paths,
     }
+
+
+@router.get("/{run_id}/video-variants/{scene_number}/{variant_index}")
+async def get_video_variant(
+    run_id: str,
+    scene_number: int,
+    variant_index: int,
+    variants: VariantStore = Depends(get_variant_store),
+) -> FileResponse:
+    """Serve a video variant, downloading it from GCS on first access."""
+    try:
+        path = await variants.materialize(run_id, scene_number, variant_index)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except Exception as exc:
+        logger.exception("Video variant fetch failed")
+        raise HTTPException(status_code=502, detail=str(exc))
+    return FileResponse(path, media_type="video/mp4")
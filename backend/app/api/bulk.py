@@ -3,6 +3,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, UploadFile
 
 from app.dependencies import get_bulk_service
+from app.models.script import AvatarSelectionPolicy
 from app.services.bulk_service import BulkService
 
 logger = logging.getLogger(__name__)
@@ -39,11 +40,18 @@ async def upload_csv(
 async def start_bulk(
     bulk_id: str,
     concurrency: int = 2,
+    avatar_selection: AvatarSelectionPolicy | None = None,
     bulk_svc: BulkService = Depends(get_bulk_service),
 ) -> dict:
-    """Start bulk processing for all jobs in the batch."""
+    """Start bulk processing for all jobs in the batch.
+
+    ``avatar_selection`` ("gemini", "heuristic" or "manual") overrides the
+    configured bulk default for this batch.
+    """
     try:
-        await bulk_svc.start_bulk(bulk_id, concurrency=concurrency)
+        await bulk_svc.start_bulk(
+            bulk_id, concurrency=concurrency, avatar_selection=avatar_selection
+        )
         return {"status": "started", "bulk_id": bulk_id}
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
@@ -52,6 +60,29 @@ async def start_bulk(
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+@router.post("/{bulk_id}/retry")
+async def retry_bulk(
+    bulk_id: str,
+    concurrency: int = 2,
+    bulk_svc: BulkService = Depends(get_bulk_service),
+) -> dict:
+    """Resume the batch's failed and cancelled jobs from their checkpoints."""
+    try:
+        job_ids = await bulk_svc.retry_failed(bulk_id, concurrency=concurrency)
+        return {
+            "status": "started" if job_ids else "nothing_to_retry",
+            "bulk_id": bulk_id,
+            "job_ids": job_ids,
+        }
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        logger.exception("Bulk retry failed")
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
 @router.get("/{bulk_id}")
 async def get_bulk_status(
     bulk_id: str,
@@ -3,11 +3,12 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 
-from app.dependencies import get_broadcaster, get_job_store, get_task_runner
+from app.dependencies import get_broadcaster, get_job_store, get_pipeline_service, get_task_runner
 from app.jobs.events import SSEBroadcaster
 from app.jobs.runner import TaskRunner
 from app.jobs.store import JobStore
-from app.models.job import Job
+from app.models.job import Job, JobStatus
+from app.services.pipeline_service import PipelineService
 
 logger = logging.getLogger(__name__)
 
@@ -74,3 +75,30 @@ async def cancel_job(
     else:
         job_store.cancel_job(job_id)
         return {"status": "cancelled", "job_id": job_id, "note": "No running task found"}
+
+
+@router.post("/{job_id}/resume")
+async def resume_job(
+    job_id: str,
+    job_store: JobStore = Depends(get_job_store),
+    pipeline_svc: PipelineService = Depends(get_pipeline_service),
+    task_runner: TaskRunner = Depends(get_task_runner),
+) -> dict:
+    """Resume a failed or cancelled job from its first incomplete unit.
+
+    Stages and scenes with an intact checkpoint are reused, not regenerated.
+    """
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job.status not in (JobStatus.FAILED, JobStatus.CANCELLED):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Only failed or cancelled jobs can be resumed (job is {job.status.value})",
+        )
+    if task_runner.is_running(job_id):
+        raise HTTPException(status_code=400, detail=f"Job {job_id} is still running")
+
+    skipped = pipeline_svc.resumable_units(job_id)
+    task_runner.start_pipeline(job_id, pipeline_svc, job.request, resume=True)
+    return {"status": "resumed", "job_id": job_id, "skipped_units": skipped}
@@ -0,0 +1,170 @@
+import logging
+
+from fastapi import APIRouter, Depends
+
+from app.ai.breaker import CircuitBreakers
+from app.ai.context_cache import ContextCacheManager
+from app.ai.gemini import GeminiService
+from app.ai.hedging import Hedger
+from app.ai.image_prep import ImagePreparer
+from app.ai.operations import OperationTracker
+from app.ai.rate_limit import RateLimiter
+from app.jobs.store import JobStore
+from app.dependencies import (
+    get_bulk_service,
+    get_circuit_breakers,
+    get_context_cache,
+    get_gcs_storage,
+    get_gemini_service,
+    get_hedger,
+    get_image_preparer,
+    get_job_store,
+    get_qc_memo,
+    get_qc_service,
+    get_operation_tracker,
+    get_rate_limiter,
+    get_reference_assets,
+    get_script_cache,
+)
+from app.services.bulk_service import BulkService
+from app.services.qc_memo import QCMemo
+from app.services.qc_service import QCService
+from app.storage.gcs import GCSStorage
+from app.storage.reference_assets import ReferenceAssetStore
+from app.storage.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/metrics", tags=["metrics"])
+
+
+@router.get("/veo-operations")
+async def get_veo_operation_metrics(
+    tracker: OperationTracker = Depends(get_operation_tracker),
+) -> dict:
+    """Poll count, wasted polls and completion-detection delay for Veo operations."""
+    return tracker.stats()
+
+
+@router.get("/gcs-uploads")
+async def get_gcs_upload_metrics(
+    gcs: GCSStorage = Depends(get_gcs_storage),
+) -> dict:
+    """Hit-rate counters for the content-addressed GCS upload cache."""
+    return gcs.upload_stats()
+
+
+@router.get("/rate-limits")
+async def get_rate_limit_metrics(
+    limiter: RateLimiter = Depends(get_rate_limiter),
+) -> dict:
+    """Per-model limits, in-flight/queued calls and queue-wait percentiles."""
+    return limiter.stats()
+
+
+@router.get("/concurrency")
+async def get_concurrency_metrics(
+    limiter: RateLimiter = Depends(get_rate_limiter),
+    bulk_svc: BulkService = Depends(get_bulk_service),
+) -> dict:
+    """Effective adaptive concurrency limits per genai model and running bulk batch."""
+    stats = limiter.stats()
+    return {
+        "adaptive": stats["adaptive"],
+        "models": {
+            model_id: {
+                "limit": model["concurrency_limit"],
+                "max_concurrent": model["max_concurrent"],
+                "in_flight": model["in_flight"],
+                "queued": model["queued"],
+            }
+            for model_id, model in stats["models"].items()
+        },
+        "bulk": bulk_svc.concurrency_stats(),
+    }
+
+
+@router.get("/circuit-breakers")
+async def get_circuit_breaker_metrics(
+    breakers: CircuitBreakers = Depends(get_circuit_breakers),
+) -> dict:
+    """Breaker state, failure counts and recent transitions per model."""
+    return breakers.stats()
+
+
+@router.get("/hedging")
+async def get_hedging_metrics(
+    hedger: Hedger = Depends(get_hedger),
+) -> dict:
+    """Hedge counts, budget denials and hedge win rates per call type."""
+    return hedger.stats()
+
+
+@router.get("/script-cache")
+async def get_script_cache_metrics(
+    cache: ResponseCache | None = Depends(get_script_cache),
+) -> dict:
+    """Hit rate, size and evictions for the on-disk script response cache."""
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/qc-memo")
+async def get_qc_memo_metrics(
+    memo: QCMemo | None = Depends(get_qc_memo),
+) -> dict:
+    """Hit rate and stored entries for the storyboard/video QC memo."""
+    if memo is None:
+        return {"enabled": False}
+    return {"enabled": True, **memo.stats()}
+
+
+@router.get("/storyboard-qc-batching")
+async def get_storyboard_qc_batching_metrics(
+    qc: QCService = Depends(get_qc_service),
+) -> dict:
+    """Number of batched storyboard QC requests and frames per request."""
+    return qc.storyboard_batcher.stats()
+
+
+@router.get("/context-cache")
+async def get_context_cache_metrics(
+    cache: ContextCacheManager = Depends(get_context_cache),
+) -> dict:
+    """Cached-content handles created, reused and released across runs."""
+    return cache.stats()
+
+
+@router.get("/image-prep")
+async def get_image_prep_metrics(
+    images: ImagePreparer = Depends(get_image_preparer),
+) -> dict:
+    """Reference images prepared, memo hits and payload bytes saved."""
+    return images.stats()
+
+
+@router.get("/reference-assets")
+async def get_reference_asset_metrics(
+    assets: ReferenceAssetStore | None = Depends(get_reference_assets),
+) -> dict:
+    """Reference images uploaded once per run and reused by URI."""
+    if assets is None:
+        return {"enabled": False}
+    return {"enabled": True, **assets.stats()}
+
+
+@router.get("/structured-output")
+async def get_structured_output_metrics(
+    gemini: GeminiService = Depends(get_gemini_service),
+) -> dict:
+    """Parse-failure rates and repairs of schema-validated responses per model."""
+    return gemini.structured.stats()
+
+
+@router.get("/job-signals")
+async def get_job_signal_metrics(
+    job_store: JobStore = Depends(get_job_store),
+) -> dict:
+    """Jobs parked on a job-store signal and the wake-ups delivered."""
+    return job_store.signals.stats()
@@ -3,11 +3,16 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from app.ai.context_cache import ContextCacheManager
+from app.ai.image_prep import ImagePreparer
 from app.dependencies import (
     get_avatar_service,
     get_broadcaster,
+    get_context_cache,
+    get_image_preparer,
     get_job_store,
     get_pipeline_service,
+    get_reference_assets,
     get_script_service,
     get_stitch_service,
     get_storyboard_service,
@@ -34,6 +39,7 @@ from app.services.script_service import ScriptService
 from app.services.stitch_service import StitchService
 from app.services.storyboard_service import StoryboardService
 from app.services.video_service import VideoService
+from app.storage.reference_assets import ReferenceAssetStore
 from app.utils.sse_log_handler import pipeline_run_id
 
 logger = logging.getLogger(__name__)
@@ -160,7 +166,8 @@ async def select_avatar(
 ) -> AvatarSelectResponse:
     """User selects an avatar variant.
 
-    Also updates any job that references this run_id with the selected avatar.
+    Also updates any job that references this run_id with the selected avatar,
+    which wakes a pipeline waiting on that selection.
     """
     token = pipeline_run_id.set(request.run_id)
     try:
@@ -170,8 +177,9 @@ async def select_avatar(
         )
 
         # Update any matching job with the selected avatar
-        for job in job_store.list_jobs():
-            if job.avatar_variants:
+        for job_id in job_store.job_ids_for_run(request.run_id):
+            job = job_store.get_job(job_id)
+            if job and job.avatar_variants:
                 for variant in job.avatar_variants:
                     if request.run_id in variant.image_path:
                         job_store.update_job(job.job_id, selected_avatar=selected_path)
@@ -274,7 +282,7 @@ async def generate_video(
     token = pipeline_run_id.set(request.run_id)
     try:
         def on_progress(data: dict) -> None:
-            if data.get("event") == "video_completed":
+            if data.get("event") in ("video_completed", "variant_qc"):
                 broadcaster.emit(request.run_id, SSEEventType.SCENE_PROGRESS, data)
 
         response = await video_svc.generate_videos(
@@ -295,6 +303,7 @@ async def generate_video(
             use_reference_images=request.use_reference_images,
             negative_prompt_extra=request.negative_prompt_extra,
             generate_audio=request.generate_audio,
+            continuity_mode=request.continuity_mode,
         )
         if job_store.get_job(request.run_id):
             job_store.update_job(request.run_id, video_results=response.results)
@@ -387,6 +396,9 @@ async def stitch_video(
     request: StitchRequest,
     stitch_svc: StitchService = Depends(get_stitch_service),
     job_store: JobStore = Depends(get_job_store),
+    context_cache: ContextCacheManager = Depends(get_context_cache),
+    reference_assets: ReferenceAssetStore | None = Depends(get_reference_assets),
+    image_preparer: ImagePreparer = Depends(get_image_preparer),
 ) -> dict:
     """Stitch scene videos into final commercial."""
     run_id = request.run_id
@@ -398,6 +410,12 @@ async def stitch_video(
         )
         if job_store.get_job(run_id):
             job_store.update_job(run_id, final_video_path=path, status=JobStatus.COMPLETED)
+        # The run is finished: drop its cached QC/storyboard contexts and
+        # its uploaded and prepared reference images
+        await context_cache.release(run_id)
+        if reference_assets:
+            await reference_assets.release(run_id)
+        image_preparer.release(run_id)
         return {"status": "success", "path": path}
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
@@ -1,5 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings
@@ -39,17 +40,139 @@ class Settings(BaseSettings):
     imagen_model: str = "imagen-4.0-generate-001"
 
     output_dir: str = "output"
+    # Reuse identical GCS uploads across runs, not just within a run
+    gcs_upload_global_dedup: bool = False
+    # Upload index size (LRU-evicted) and minimum seconds between writes
+    gcs_upload_index_max_entries: int = 50_000
+    gcs_upload_index_flush_seconds: float = 30.0
+    # Local directory used instead of the real bucket (offline dev/benchmarks)
+    gcs_fake_root: str = ""
+    # Ranged parallel downloads for large blobs (Veo 1080p/4k outputs)
+    gcs_download_chunk_bytes: int = 16 * 1024 * 1024
+    gcs_download_parallel_threshold_bytes: int = 32 * 1024 * 1024
+    gcs_download_max_workers: int = 8
     storyboard_qc_threshold: int = 60
     video_qc_threshold: int = 6
+    # Persist QC reports keyed by input content hashes; identical
+    # evaluations are answered from SQLite instead of Gemini. Entries expire
+    # after ttl_days and the oldest go beyond max_entries
+    qc_memo_enabled: bool = True
+    qc_memo_max_entries: int = 20_000
+    qc_memo_ttl_days: float = 30.0
+    # Score storyboard frames of the same run in one Gemini request; frames
+    # finishing within the window are batched (up to max_frames), and a
+    # batch goes out early once every scene still in its QC loop is in it
+    storyboard_qc_batching: bool = True
+    storyboard_qc_batch_window_seconds: float = 1.5
+    storyboard_qc_batch_max_frames: int = 6
+    # Regen loops ask QC for the rewritten prompt in the same request as the
+    # scores, instead of a separate rewrite call after a failing verdict;
+    # fused storyboard requests are still micro-batched
+    qc_fused_rewrite: bool = True
     max_regen_attempts: int = 3
     max_video_variants: int = 4
     max_avatar_variants: int = 4
     max_concurrent_scenes: int = 5
+    # Ceiling the adaptive bulk limit may grow to from the requested concurrency
+    bulk_max_concurrency: int = 8
+    # Default avatar selection for bulk batches: "gemini" ranks the variants,
+    # "heuristic" picks by resolution/detail, "manual" waits for a human
+    bulk_avatar_selection: Literal["manual", "gemini", "heuristic"] = "gemini"
 
     # Video generation settings
     default_video_duration: int = 8
     default_video_compression: str = "optimized"
     max_video_qc_regen_attempts: int = 2
+    # Stop waiting on remaining variant QC once one variant scores at least
+    # video_qc_threshold + margin on every dimension
+    video_qc_early_accept: bool = True
+    video_qc_early_accept_margin: int = 1
+    # "per_variant": one QC call per variant, streamed as they finish;
+    # "comparative": all variants scored and ranked side by side in one call
+    video_qc_mode: Literal["per_variant", "comparative"] = "per_variant"
+    video_continuity_mode: Literal["strict", "parallel"] = "strict"
+    # Byte budget for non-winning video variants downloaded on demand
+    variant_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+    # Minimum SSIM between a scene's first frame and the previous scene's
+    # last frame before a parallel-mode scene is regenerated for continuity
+    continuity_ssim_threshold: float = 0.35
+    # "dag": storyboard, video and stitch prep run per scene, each scene
+    # moving on as soon as its own previous unit is done
+    # "stages": every storyboard, then every video, then stitch
+    pipeline_executor: Literal["dag", "stages"] = "dag"
+
+    # Veo operation polling (shared tracker, adaptive intervals)
+    veo_poll_min_interval: float = 4.0
+    veo_poll_max_interval: float = 30.0
+    veo_expected_seconds: float = 90.0
+
+    # Process-wide per-model limits shared by every genai call (0 = no cap).
+    # Override per model via JSON, e.g.
+    # GENAI_RATE_LIMITS='{"veo-3.1-generate-preview": {"rpm": 10, "max_concurrent": 10}}'
+    genai_default_rpm: int = 120
+    genai_default_max_concurrent: int = 16
+    genai_rate_limits: dict[str, dict[str, int]] = Field(
+        default_factory=lambda: {
+            "gemini-3-pro-image-preview": {"rpm": 30, "max_concurrent": 8},
+            "veo-3.1-generate-preview": {"rpm": 10, "max_concurrent": 10},
+            "veo-3.1-fast-generate-001": {"rpm": 10, "max_concurrent": 10},
+        }
+    )
+    # Treat max_concurrent as an AIMD ceiling driven by 429/503 and latency
+    genai_adaptive_concurrency: bool = True
+
+    # Per-model circuit breakers; while open, calls route to the fallback
+    # model. Defaults: veo_model -> veo_fast_model, gemini_model ->
+    # gemini_flash_model; MODEL_FALLBACKS adds or overrides entries.
+    circuit_breaker_enabled: bool = True
+    model_fallbacks: dict[str, str] = Field(default_factory=dict)
+    breaker_failure_threshold: int = 5
+    breaker_error_rate: float = 0.5
+    breaker_window: int = 20
+    breaker_min_calls: int = 10
+    breaker_open_seconds: float = 60.0
+    # Calls slower than this count as unhealthy in the breaker window; models
+    # not listed are tracked for errors only unless a default is set
+    breaker_latency_thresholds: dict[str, float] = Field(
+        default_factory=lambda: {
+            "veo-3.1-generate-preview": 360.0,
+            "gemini-3-pro-image-preview": 120.0,
+        }
+    )
+    breaker_default_latency_threshold: float | None = None
+
+    # Hedge QC/rewrite calls with a duplicate once they pass the observed
+    # latency percentile; hedges are capped at hedge_budget_ratio of calls
+    hedge_enabled: bool = True
+    hedge_percentile: float = 0.9
+    hedge_budget_ratio: float = 0.1
+    hedge_min_samples: int = 20
+    hedge_min_delay_seconds: float = 1.0
+    # Per-run cached contents for the QC system instructions and the
+    # avatar/product references, deleted when the job finishes.
+    # Backend "genai" uses Vertex context caching; "local" keeps the
+    # prefix in memory and resends it (offline dev/tests)
+    context_cache_enabled: bool = True
+    context_cache_backend: Literal["genai", "local"] = "genai"
+    context_cache_ttl_seconds: float = 3600.0
+
+    # Reference images are labelled with their real MIME type and, per call
+    # purpose, downscaled to this longest side and re-encoded (JPEG, or PNG
+    # with transparency) once per run before inline upload. Needs ffmpeg.
+    image_prep_enabled: bool = True
+    image_prep_max_side: dict[str, int] = Field(
+        default_factory=lambda: {"qc": 768, "script": 1024, "generation": 1536}
+    )
+    image_prep_jpeg_qscale: int = 3
+    # "inline": reference images are sent as bytes in every request;
+    # "gcs": uploaded once per run to the bucket (or the fake bucket under
+    # gcs_fake_root) and passed to Gemini by gs:// URI
+    reference_asset_mode: Literal["inline", "gcs"] = "inline"
+    # Attach response schemas derived from the Pydantic models to script and
+    # QC calls; invalid responses are repaired locally or with one small
+    # Flash re-ask instead of failing the stage
+    structured_output_schemas: bool = True
+    structured_output_reask: bool = True
 
     # Script generation settings
     script_default_scene_count: int = 3
@@ -57,6 +180,15 @@ class Settings(BaseSettings):
     script_min_scene_count: int = 2
     script_default_total_duration: int = 30
     script_max_dialogue_words_per_scene: int = 25
+    # On-disk cache of script responses keyed by image hash, inputs, model
+    # and prompt version (output_dir/cache/scripts)
+    script_cache_enabled: bool = True
+    script_cache_max_bytes: int = 64 * 1024 * 1024
+    script_cache_ttl_seconds: float = 7 * 24 * 3600
+    # Stream the script response in the full pipeline: avatar_profile and
+    # scenes are published over SSE as they complete and avatar generation
+    # starts from the streamed profile before the scenes finish
+    script_streaming: bool = True
 
     model_config = {
         "env_file": _find_env_file(),
@@ -32,7 +32,9 @@ class Database:
                     storyboard_results_json TEXT,
                     video_results_json TEXT,
                     final_video_path TEXT,
-                    error TEXT
+                    error TEXT,
+                    metadata_json TEXT,
+                    checkpoints_json TEXT
                 );
 
                 CREATE TABLE IF NOT EXISTS reviews (
@@ -52,9 +54,26 @@ class Database:
                     metadata_json TEXT,
                     FOREIGN KEY (job_id) REFERENCES jobs(job_id)
                 );
+
+                CREATE TABLE IF NOT EXISTS qc_memo (
+                    memo_key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    report_json TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                );
             """)
+            self._migrate(conn)
         logger.info("Database initialized at %s", self.db_path)
 
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add columns introduced after the initial schema to existing databases."""
+        columns = {r["name"] for r in conn.execute("PRAGMA table_info(jobs)")}
+        if "metadata_json" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN metadata_json TEXT")
+        if "checkpoints_json" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN checkpoints_json TEXT")
+
     def connect(self) -> sqlite3.Connection:
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
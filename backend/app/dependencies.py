@@ -1,31 +1,47 @@
 from functools import lru_cache
+from pathlib import Path
 
 from google import genai
 from google.cloud import storage
 
+from app.ai.breaker import CircuitBreakers
+from app.ai.context_cache import ContextCacheManager, GenaiCacheBackend, LocalCacheBackend
 from app.ai.gemini import GeminiService
 from app.ai.gemini_image import GeminiImageService
+from app.ai.hedging import Hedger
+from app.ai.image_prep import ImagePreparer
 from app.ai.imagen import ImagenService
+from app.ai.operations import OperationTracker
+from app.ai.rate_limit import RateLimiter
+from app.ai.structured import StructuredOutput
 from app.ai.veo import VeoService
 from app.config import Settings
 from app.config import get_settings as _get_settings
 from app.db import Database
+from app.jobs.checkpoints import CheckpointStore
 from app.jobs.events import SSEBroadcaster
 from app.jobs.runner import TaskRunner
 from app.jobs.store import JobStore
+from app.models.sse import SSEEventType
 from app.services.avatar_service import AvatarService
 from app.services.bulk_service import BulkService
 from app.services.input_service import InputService
 from app.services.log_service import LogService
 from app.services.pipeline_service import PipelineService
+from app.services.qc_memo import QCMemo
 from app.services.qc_service import QCService
 from app.services.review_service import ReviewService
 from app.services.script_service import ScriptService
 from app.services.stitch_service import StitchService
 from app.services.storyboard_service import StoryboardService
 from app.services.video_service import VideoService
+from app.storage.downloader import RangeDownloader
 from app.storage.gcs import GCSStorage
 from app.storage.local import LocalStorage
+from app.storage.reference_assets import ReferenceAssetStore
+from app.storage.response_cache import ResponseCache
+from app.storage.variants import VariantStore
+from app.utils.sse_log_handler import pipeline_run_id
 
 
 def get_settings() -> Settings:
@@ -58,6 +74,7 @@ _broadcaster: SSEBroadcaster | None = None
 _task_runner: TaskRunner | None = None
 _review_service: ReviewService | None = None
 _log_service: LogService | None = None
+_bulk_service: BulkService | None = None
 
 
 def get_database() -> Database:
@@ -92,6 +109,11 @@ def get_task_runner() -> TaskRunner:
 # Storage
 # ---------------------------------------------------------------------------
 
+@lru_cache
+def get_checkpoint_store() -> CheckpointStore:
+    return CheckpointStore(job_store=get_job_store(), storage=get_local_storage())
+
+
 @lru_cache
 def get_local_storage() -> LocalStorage:
     settings = get_settings()
@@ -104,6 +126,37 @@ def get_gcs_storage() -> GCSStorage:
     return GCSStorage(
         bucket_name=settings.gcs_bucket_name,
         project_id=settings.project_id,
+        index_path=str(Path(settings.output_dir) / "gcs_upload_index.json"),
+        global_dedup=settings.gcs_upload_global_dedup,
+        index_max_entries=settings.gcs_upload_index_max_entries,
+        index_flush_interval=settings.gcs_upload_index_flush_seconds,
+        downloader=RangeDownloader(
+            chunk_size=settings.gcs_download_chunk_bytes,
+            max_workers=settings.gcs_download_max_workers,
+            min_parallel_size=settings.gcs_download_parallel_threshold_bytes,
+        ),
+        fake_root=settings.gcs_fake_root,
+    )
+
+
+@lru_cache
+def get_script_cache() -> ResponseCache | None:
+    settings = get_settings()
+    if not settings.script_cache_enabled:
+        return None
+    return ResponseCache(
+        root=str(Path(settings.output_dir) / "cache" / "scripts"),
+        max_bytes=settings.script_cache_max_bytes,
+        ttl_seconds=settings.script_cache_ttl_seconds,
+    )
+
+
+@lru_cache
+def get_variant_store() -> VariantStore:
+    return VariantStore(
+        local=get_local_storage(),
+        gcs=get_gcs_storage(),
+        max_cached_bytes=get_settings().variant_cache_max_bytes,
     )
 
 
@@ -111,24 +164,166 @@ def get_gcs_storage() -> GCSStorage:
 # AI services
 # ---------------------------------------------------------------------------
 
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    settings = get_settings()
+    return RateLimiter(
+        limits=settings.genai_rate_limits,
+        default_rpm=settings.genai_default_rpm,
+        default_max_concurrent=settings.genai_default_max_concurrent,
+        adaptive=settings.genai_adaptive_concurrency,
+    )
+
+
+@lru_cache
+def get_circuit_breakers() -> CircuitBreakers:
+    settings = get_settings()
+    breakers = CircuitBreakers(
+        fallbacks={
+            settings.veo_model: settings.veo_fast_model,
+            settings.gemini_model: settings.gemini_flash_model,
+            **settings.model_fallbacks,
+        },
+        enabled=settings.circuit_breaker_enabled,
+        failure_threshold=settings.breaker_failure_threshold,
+        error_rate=settings.breaker_error_rate,
+        window=settings.breaker_window,
+        min_calls=settings.breaker_min_calls,
+        open_seconds=settings.breaker_open_seconds,
+        latency_thresholds=settings.breaker_latency_thresholds,
+        default_latency_threshold=settings.breaker_default_latency_threshold,
+    )
+
+    def broadcast(event: dict) -> None:
+        level = "warn" if event["to_state"] == "open" else "info"
+        message = (
+            f"Circuit breaker for {event['model']}: {event['from_state']} -> "
+            f"{event['to_state']} ({event['reason']})"
+        )
+        if event["to_state"] == "open" and event["fallback"]:
+            message += f"; routing to {event['fallback']}"
+        # The run that tripped the breaker already gets the log record via
+        # SSELogHandler; fan the transition out to every other open stream
+        get_broadcaster().emit_all(
+            SSEEventType.LOG,
+            {
+                "message": message,
+                "level": level,
+                "logger_name": "app.ai.breaker",
+                "circuit_breaker": event,
+            },
+            exclude=pipeline_run_id.get(),
+        )
+
+    breakers.add_listener(broadcast)
+    return breakers
+
+
+@lru_cache
+def get_hedger() -> Hedger:
+    settings = get_settings()
+    return Hedger(
+        enabled=settings.hedge_enabled,
+        percentile=settings.hedge_percentile,
+        budget_ratio=settings.hedge_budget_ratio,
+        min_samples=settings.hedge_min_samples,
+        min_delay=settings.hedge_min_delay_seconds,
+    )
+
+
+@lru_cache
+def get_context_cache() -> ContextCacheManager:
+    settings = get_settings()
+    if settings.context_cache_backend == "local":
+        backend = LocalCacheBackend()
+    else:
+        backend = GenaiCacheBackend(get_genai_client())
+    return ContextCacheManager(
+        backend,
+        ttl_seconds=settings.context_cache_ttl_seconds,
+        enabled=settings.context_cache_enabled,
+    )
+
+
+@lru_cache
+def get_image_preparer() -> ImagePreparer:
+    settings = get_settings()
+    return ImagePreparer(
+        max_side=settings.image_prep_max_side,
+        jpeg_qscale=settings.image_prep_jpeg_qscale,
+        enabled=settings.image_prep_enabled,
+    )
+
+
+@lru_cache
+def get_reference_assets() -> ReferenceAssetStore | None:
+    if get_settings().reference_asset_mode != "gcs":
+        return None
+    return ReferenceAssetStore(get_gcs_storage())
+
+
 @lru_cache
 def get_gemini_service() -> GeminiService:
-    return GeminiService(client=get_genai_client(), settings=get_settings())
+    settings = get_settings()
+    return GeminiService(
+        client=get_genai_client(),
+        settings=settings,
+        limiter=get_rate_limiter(),
+        breakers=get_circuit_breakers(),
+        hedger=get_hedger(),
+        context_cache=get_context_cache(),
+        images=get_image_preparer(),
+        assets=get_reference_assets(),
+        structured=StructuredOutput(
+            enabled=settings.structured_output_schemas,
+            reask=settings.structured_output_reask,
+        ),
+    )
 
 
 @lru_cache
 def get_gemini_image_service() -> GeminiImageService:
-    return GeminiImageService(client=get_genai_client(), settings=get_settings())
+    return GeminiImageService(
+        client=get_genai_client(),
+        settings=get_settings(),
+        limiter=get_rate_limiter(),
+        breakers=get_circuit_breakers(),
+        context_cache=get_context_cache(),
+        images=get_image_preparer(),
+        assets=get_reference_assets(),
+    )
 
 
 @lru_cache
 def get_imagen_service() -> ImagenService:
-    return ImagenService(client=get_genai_client(), settings=get_settings())
+    return ImagenService(
+        client=get_genai_client(),
+        settings=get_settings(),
+        limiter=get_rate_limiter(),
+        breakers=get_circuit_breakers(),
+    )
+
+
+@lru_cache
+def get_operation_tracker() -> OperationTracker:
+    settings = get_settings()
+    return OperationTracker(
+        client=get_genai_client(),
+        min_interval=settings.veo_poll_min_interval,
+        max_interval=settings.veo_poll_max_interval,
+        default_expected_seconds=settings.veo_expected_seconds,
+    )
 
 
 @lru_cache
 def get_veo_service() -> VeoService:
-    return VeoService(client=get_genai_client(), settings=get_settings())
+    return VeoService(
+        client=get_genai_client(),
+        settings=get_settings(),
+        tracker=get_operation_tracker(),
+        limiter=get_rate_limiter(),
+        breakers=get_circuit_breakers(),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -145,9 +340,26 @@ def get_input_service() -> InputService:
     )
 
 
+@lru_cache
+def get_qc_memo() -> QCMemo | None:
+    settings = get_settings()
+    if not settings.qc_memo_enabled:
+        return None
+    return QCMemo(
+        db=get_database(),
+        max_entries=settings.qc_memo_max_entries,
+        ttl_days=settings.qc_memo_ttl_days,
+    )
+
+
 @lru_cache
 def get_qc_service() -> QCService:
-    return QCService(gemini=get_gemini_service(), settings=get_settings())
+    return QCService(
+        gemini=get_gemini_service(),
+        settings=get_settings(),
+        memo=get_qc_memo(),
+        gcs=get_gcs_storage(),
+    )
 
 
 @lru_cache
@@ -156,6 +368,7 @@ def get_script_service() -> ScriptService:
         gemini=get_gemini_service(),
         storage=get_local_storage(),
         settings=get_settings(),
+        cache=get_script_cache(),
     )
 
 
@@ -166,6 +379,7 @@ def get_avatar_service() -> AvatarService:
         imagen=get_imagen_service(),
         storage=get_local_storage(),
         settings=get_settings(),
+        gemini=get_gemini_service(),
     )
 
 
@@ -186,6 +400,7 @@ def get_video_service() -> VideoService:
         gcs=get_gcs_storage(),
         qc=get_qc_service(),
         storage=get_local_storage(),
+        variants=get_variant_store(),
         settings=get_settings(),
     )
 
@@ -219,11 +434,22 @@ def get_pipeline_service() -> PipelineService:
         review_svc=get_review_service(),
         job_store=get_job_store(),
         event_broadcaster=get_broadcaster(),
+        settings=get_settings(),
+        context_cache=get_context_cache(),
+        checkpoints=get_checkpoint_store(),
+        reference_assets=get_reference_assets(),
+        image_preparer=get_image_preparer(),
     )
 
 
 def get_bulk_service() -> BulkService:
-    return BulkService(
-        pipeline_svc=get_pipeline_service(),
-        job_store=get_job_store(),
-    )
+    # Singleton: bulk batches, their tasks and adaptive limits live on the instance
+    global _bulk_service
+    if _bulk_service is None:
+        _bulk_service = BulkService(
+            pipeline_svc=get_pipeline_service(),
+            job_store=get_job_store(),
+            max_concurrency=get_settings().bulk_max_concurrency,
+            avatar_selection=get_settings().bulk_avatar_selection,
+        )
+    return _bulk_service
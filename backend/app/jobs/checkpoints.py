@@ -0,0 +1,72 @@
+"""Durable checkpoints of completed pipeline units.
+
+A unit is a stage ("script", "avatar", "avatar_selection", "stitch") or a
+scene of a stage ("storyboard:3", "video:3").  When a unit finishes, the
+pipeline records it in the job row together with the size of every file it
+produced.  Resuming a failed job skips a unit only if its checkpoint exists
+and all of its artifacts are still on disk with the recorded size; a
+re-generated or deleted file makes the unit run again.
+"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+from app.jobs.store import JobStore
+from app.models.job import Job
+from app.storage.local import LocalStorage
+
+logger = logging.getLogger(__name__)
+
+
+def scene_unit(stage: str, scene_number: int) -> str:
+    return f"{stage}:{scene_number}"
+
+
+class CheckpointStore:
+    def __init__(self, job_store: JobStore, storage: LocalStorage):
+        self.job_store = job_store
+        self.storage = storage
+
+    def record(self, job_id: str, units: dict[str, Iterable[str]]) -> None:
+        """Mark *units* (unit -> artifact paths) complete."""
+        now = datetime.now().isoformat()
+        entries = {}
+        for unit, artifacts in units.items():
+            sizes = {}
+            for artifact in artifacts:
+                path = self._resolve(artifact)
+                sizes[artifact] = path.stat().st_size if path.exists() else None
+            entries[unit] = {"completed_at": now, "artifacts": sizes}
+        self.job_store.update_checkpoints(job_id, entries)
+
+    def clear(self, job_id: str) -> None:
+        self.job_store.update_job(job_id, checkpoints={})
+
+    def verified(self, job: Job) -> set[str]:
+        """Units of *job* whose checkpointed artifacts are all intact."""
+        units = set()
+        for unit, entry in job.checkpoints.items():
+            stale = [
+                artifact
+                for artifact, size in entry.get("artifacts", {}).items()
+                if size is None or not self._intact(artifact, size)
+            ]
+            if stale:
+                logger.info(
+                    "Checkpoint %s of job %s is stale (%s)", unit, job.job_id, ", ".join(stale)
+                )
+            else:
+                units.add(unit)
+        return units
+
+    def _intact(self, artifact: str, size: int) -> bool:
+        path = self._resolve(artifact)
+        return path.is_file() and path.stat().st_size == size
+
+    def _resolve(self, artifact: str) -> Path:
+        # Artifacts are URL paths (/output/...) or filesystem paths
+        if artifact.startswith("/output/"):
+            return self.storage.base_dir / artifact[len("/output/"):]
+        return Path(artifact)
@@ -55,6 +55,21 @@ class SSEBroadcaster:
         except RuntimeError:
             logger.warning("No running event loop, cannot emit SSE event for job %s", job_id)
 
+    def emit_all(
+        self,
+        event_type: SSEEventType,
+        data: dict | None = None,
+        exclude: str | None = None,
+    ):
+        """Emit an event to every job/run that currently has subscribers.
+
+        Used for process-wide events (e.g. circuit breaker transitions) that
+        affect all in-flight work.
+        """
+        for job_id in list(self._subscribers):
+            if job_id != exclude:
+                self.emit(job_id, event_type, data)
+
     async def event_generator(self, job_id: str):
         """Async generator that yields SSE-formatted strings for StreamingResponse.
 
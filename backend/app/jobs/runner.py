@@ -8,13 +8,16 @@ class TaskRunner:
     def __init__(self):
         self._tasks: dict[str, asyncio.Task] = {}
 
-    def start_pipeline(self, job_id: str, pipeline_svc, request) -> asyncio.Task:
+    def start_pipeline(
+        self, job_id: str, pipeline_svc, request, resume: bool = False
+    ) -> asyncio.Task:
         """Create an asyncio task for pipeline execution.
 
-        The pipeline_svc.run_full_pipeline coroutine runs in the background.
+        The pipeline_svc.run_full_pipeline coroutine runs in the background;
+        with *resume* it continues from the job's checkpoints.
         """
         task = asyncio.create_task(
-            pipeline_svc.run_full_pipeline(job_id, request),
+            pipeline_svc.run_full_pipeline(job_id, request, resume=resume),
             name=f"pipeline-{job_id}",
         )
         self._tasks[job_id] = task
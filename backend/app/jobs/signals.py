@@ -0,0 +1,109 @@
+"""In-process wake-ups for jobs waiting on a change to their row.
+
+A pipeline parked on human input (avatar selection) subscribes to its job
+and sleeps until ``JobStore`` saves that job, instead of re-reading the row
+on a timer.  Saves made by another process are not seen here, so waiters
+still re-check at a long fallback interval.
+
+Jobs parked without a task (see ``PipelineService.park_for_avatar_selection``)
+register a ``listen`` callback instead of a waiter.
+"""
+
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class JobWaiter:
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def _wake(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # Loop already closed; nobody is waiting any more
+            pass
+
+    async def wait(self, timeout: float) -> bool:
+        """Sleep until the job changes or *timeout* passes; True if woken."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._event.clear()
+
+
+class JobListener:
+    def __init__(self, job_id: str, callback: Callable[[str], None]):
+        self.job_id = job_id
+        self.callback = callback
+        self._loop = asyncio.get_running_loop()
+
+    def _wake(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self.callback, self.job_id)
+        except RuntimeError:
+            pass
+
+
+class JobSignals:
+    def __init__(self):
+        self._waiters: dict[str, set[JobWaiter | JobListener]] = {}
+        self.notifications = 0
+        self.wakeups = 0
+
+    @contextmanager
+    def subscribe(self, job_id: str) -> Iterator[JobWaiter]:
+        """Register a waiter for *job_id*; subscribe before reading state so
+        a change between the read and the wait is not missed."""
+        waiter = JobWaiter(job_id)
+        self._add(waiter)
+        try:
+            yield waiter
+        finally:
+            self._remove(waiter)
+
+    def listen(self, job_id: str, callback: Callable[[str], None]) -> Callable[[], None]:
+        """Call ``callback(job_id)`` on the current loop whenever the job is
+        saved; returns a function that removes the listener."""
+        listener = JobListener(job_id, callback)
+        self._add(listener)
+        return lambda: self._remove(listener)
+
+    def _add(self, waiter: JobWaiter | JobListener) -> None:
+        self._waiters.setdefault(waiter.job_id, set()).add(waiter)
+
+    def _remove(self, waiter: JobWaiter | JobListener) -> None:
+        waiters = self._waiters.get(waiter.job_id)
+        if waiters is not None:
+            waiters.discard(waiter)
+            if not waiters:
+                del self._waiters[waiter.job_id]
+
+    def notify(self, job_id: str) -> int:
+        """Wake every waiter of *job_id*; safe to call from any thread."""
+        waiters = list(self._waiters.get(job_id, ()))
+        self.notifications += 1
+        for waiter in waiters:
+            waiter._wake()
+        self.wakeups += len(waiters)
+        return len(waiters)
+
+    def waiting_jobs(self) -> list[str]:
+        return list(self._waiters)
+
+    def stats(self) -> dict:
+        return {
+            "waiting_jobs": len(self._waiters),
+            "waiters": sum(len(w) for w in self._waiters.values()),
+            "notifications": self.notifications,
+            "wakeups": self.wakeups,
+        }
@@ -4,6 +4,7 @@ import uuid
 from datetime import datetime
 
 from app.db import Database
+from app.jobs.signals import JobSignals
 from app.models.job import Job, JobProgress, JobStatus, JobStep
 from app.models.script import ScriptRequest
 
@@ -11,8 +12,10 @@ logger = logging.getLogger(__name__)
 
 
 class JobStore:
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, signals: JobSignals | None = None):
         self.db = db
+        # Every save wakes in-process waiters of that job
+        self.signals = signals or JobSignals()
 
     def create_job(self, request: ScriptRequest, job_id: str | None = None) -> Job:
         job_id = job_id or uuid.uuid4().hex[:12]
@@ -41,6 +44,25 @@ class JobStore:
             return None
         return self._row_to_job(row)
 
+    def get_wait_state(self, job_id: str) -> tuple[JobStatus, str | None] | None:
+        """(status, selected_avatar) without loading the rest of the row."""
+        with self.db.connect() as conn:
+            row = conn.execute(
+                "SELECT status, selected_avatar FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return JobStatus(row["status"]), row["selected_avatar"]
+
+    def job_ids_for_run(self, run_id: str) -> list[str]:
+        """Jobs whose avatar variants were generated under *run_id*."""
+        with self.db.connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id FROM jobs WHERE avatar_variants_json LIKE ?",
+                (f"%{run_id}%",),
+            ).fetchall()
+        return [r["job_id"] for r in rows]
+
     def list_jobs(self) -> list[Job]:
         with self.db.connect() as conn:
             rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC").fetchall()
@@ -84,13 +106,28 @@ class JobStore:
             progress=JobProgress(current_step=step, step_index=step_index, detail=detail),
         )
 
+    def update_metadata(self, job_id: str, **values) -> Job:
+        """Merge *values* into the job's metadata dict."""
+        job = self.get_job(job_id)
+        if job is None:
+            raise ValueError(f"Job {job_id} not found")
+        return self.update_job(job_id, metadata={**job.metadata, **values})
+
+    def update_checkpoints(self, job_id: str, entries: dict[str, dict]) -> Job:
+        """Merge *entries* (unit -> checkpoint) into the job's checkpoints."""
+        job = self.get_job(job_id)
+        if job is None:
+            raise ValueError(f"Job {job_id} not found")
+        return self.update_job(job_id, checkpoints={**job.checkpoints, **entries})
+
     def _save_job(self, job: Job):
         with self.db.connect() as conn:
             conn.execute(
                 """UPDATE jobs SET status=?, updated_at=?, request_json=?,
                    progress_json=?, script_json=?, avatar_variants_json=?,
                    selected_avatar=?, storyboard_results_json=?,
-                   video_results_json=?, final_video_path=?, error=?
+                   video_results_json=?, final_video_path=?, error=?,
+                   metadata_json=?, checkpoints_json=?
                    WHERE job_id=?""",
                 (
                     job.status.value if isinstance(job.status, JobStatus) else job.status,
@@ -104,9 +141,12 @@ class JobStore:
                     json.dumps([r.model_dump() for r in job.video_results]) if job.video_results else None,
                     job.final_video_path,
                     job.error,
+                    json.dumps(job.metadata) if job.metadata else None,
+                    json.dumps(job.checkpoints) if job.checkpoints else None,
                     job.job_id,
                 ),
             )
+        self.signals.notify(job.job_id)
 
     def _row_to_job(self, row) -> Job:
         data = dict(row)
@@ -120,6 +160,8 @@ class JobStore:
         data["avatar_variants"] = json.loads(data.pop("avatar_variants_json")) if data.get("avatar_variants_json") else None
         data["storyboard_results"] = json.loads(data.pop("storyboard_results_json")) if data.get("storyboard_results_json") else None
         data["video_results"] = json.loads(data.pop("video_results_json")) if data.get("video_results_json") else None
+        data["metadata"] = json.loads(data.pop("metadata_json")) if data.get("metadata_json") else None
+        data["checkpoints"] = json.loads(data.pop("checkpoints_json")) if data.get("checkpoints_json") else None
         # Remove None fields to let Pydantic handle defaults
         data = {k: v for k, v in data.items() if v is not None}
         return Job(**data)
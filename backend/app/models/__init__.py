@@ -28,6 +28,7 @@ from app.models.video import (
     VideoRequest,
     VideoResponse,
     VideoResult,
+    VideoTiming,
     VideoVariant,
 )
 
@@ -62,5 +63,6 @@ __all__ = [
     "VideoResponse",
     "VideoResult",
     "VideoScript",
+    "VideoTiming",
     "VideoVariant",
 ]
@@ -37,3 +37,32 @@ class AvatarSelectRequest(BaseModel):
 class AvatarSelectResponse(BaseModel):
     status: str = "success"
     selected_path: str
+
+
+class AvatarScore(BaseModel):
+    variant: int
+    score: int
+    reasoning: str = ""
+
+
+class AvatarRankingReport(BaseModel):
+    """Gemini's side-by-side ranking of avatar variants (1-based labels)."""
+
+    variants: list[AvatarScore]
+    ranking: list[int]
+    ranking_reasoning: str = ""
+
+
+class AvatarAutoSelection(BaseModel):
+    """Avatar picked without a human, recorded in job metadata for review."""
+
+    policy: str
+    # "gemini" or "heuristic"; differs from policy when Gemini ranking failed
+    method: str
+    selected_index: int
+    # 0-based variant indices, best first
+    ranking: list[int]
+    # variant is the 0-based index here
+    scores: list[AvatarScore]
+    reasoning: str
+    fallback_reason: str | None = None
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.models.avatar import AvatarVariant
 from app.models.script import ScriptRequest, VideoScript
@@ -48,3 +48,8 @@ class Job(BaseModel):
     video_results: list[VideoResult] | None = None
     final_video_path: str | None = None
     error: str | None = None
+    # Free-form run facts (e.g. script_cache_hit)
+    metadata: dict = Field(default_factory=dict)
+    # Completed pipeline units ("script", "storyboard:3", ...) -> artifacts;
+    # see app/jobs/checkpoints.py
+    checkpoints: dict[str, dict] = Field(default_factory=dict)
@@ -1,5 +1,10 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+# "manual" waits for a human pick; "gemini" / "heuristic" pick automatically
+AvatarSelectionPolicy = Literal["manual", "gemini", "heuristic"]
+
 
 class ScriptRequest(BaseModel):
     product_name: str
@@ -11,6 +16,9 @@ class ScriptRequest(BaseModel):
     max_dialogue_words_per_scene: int = Field(default=25, ge=10, le=50)
     custom_instructions: str = Field(default="")
     run_id: str | None = None  # Pre-generated run_id for SSE log streaming
+    # Reuse a cached script for identical inputs instead of sampling a new one
+    use_cache: bool = False
+    avatar_selection: AvatarSelectionPolicy = "manual"
 
 
 class AvatarProfile(BaseModel):
@@ -65,6 +73,7 @@ class ScriptResponse(BaseModel):
     run_id: str
     product_image_path: str
     script: VideoScript
+    cached: bool = False
 
 
 # ---------------------------------------------------------------------------
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 from app.models.script import AvatarProfile, Scene
@@ -21,6 +23,10 @@ class VideoRequest(BaseModel):
     use_reference_images: bool = True
     negative_prompt_extra: str = ""
     generate_audio: bool = True
+    # "strict": scenes run in order, each using the previous scene's last frame.
+    # "parallel": all scenes start at once; only scenes failing the continuity
+    # check are regenerated with the real previous last frame.
+    continuity_mode: Literal["strict", "parallel"] = "strict"
 
 
 class VideoQCDimension(BaseModel):
@@ -48,8 +54,12 @@ class VideoQCReport(BaseModel):
 
 class VideoVariant(BaseModel):
     index: int
+    # Local /output path once materialized, otherwise the variant proxy URL
     video_path: str
+    gcs_uri: str | None = None
     qc_report: VideoQCReport | None = None
+    # 1 = best, set when variants were ranked side by side (comparative QC)
+    qc_rank: int | None = None
 
 
 class VideoResult(BaseModel):
@@ -89,6 +99,18 @@ class VideoSelectRequest(BaseModel):
     variant_index: int
 
 
+class VideoTiming(BaseModel):
+    """Wall-clock accounting for a generate_videos run."""
+    continuity_mode: str
+    wall_clock_seconds: float
+    scene_seconds: dict[int, float] = Field(default_factory=dict)
+    # Sum of per-scene durations, i.e. what a fully serial run would have cost
+    serial_seconds: float = 0.0
+    saved_seconds: float = 0.0
+    continuity_regen_scenes: list[int] = Field(default_factory=list)
+
+
 class VideoResponse(BaseModel):
     status: str = "success"
     results: list[VideoResult]
+    timing: VideoTiming | None = None
@@ -2,16 +2,25 @@ import logging
 import shutil
 from pathlib import Path
 
+from app.ai.gemini import GeminiService
 from app.ai.gemini_image import GeminiImageService
 from app.ai.imagen import ImagenService
 from app.ai.prompts import AVATAR_PROMPT_TEMPLATE
 from app.config import Settings
-from app.models.avatar import AvatarResponse, AvatarVariant
+from app.models.avatar import (
+    AvatarAutoSelection,
+    AvatarResponse,
+    AvatarScore,
+    AvatarVariant,
+)
 from app.models.script import AvatarProfile
 from app.storage.local import LocalStorage
+from app.utils.images import probe_image
 
 logger = logging.getLogger(__name__)
 
+AUTO_SELECTION_POLICIES = ("gemini", "heuristic")
+
 
 class AvatarService:
     def __init__(
@@ -20,11 +29,13 @@ class AvatarService:
         imagen: ImagenService,
         storage: LocalStorage,
         settings: Settings,
+        gemini: GeminiService | None = None,
     ):
         self.gemini_image = gemini_image
         self.imagen = imagen
         self.storage = storage
         self.settings = settings
+        self.gemini = gemini
 
     async def generate_avatars(
         self,
@@ -93,6 +104,7 @@ class AvatarService:
                 reference_bytes=reference_bytes,
                 aspect_ratio=aspect_ratio,
                 image_size=image_size,
+                run_id=run_id,
             )
 
         variants: list[AvatarVariant] = []
@@ -138,3 +150,113 @@ class AvatarService:
             run_id,
         )
         return self.storage.to_url_path(str(dest_path))
+
+    async def auto_select(
+        self,
+        run_id: str,
+        variants: list[AvatarVariant],
+        avatar_profile: AvatarProfile,
+        policy: str,
+    ) -> AvatarAutoSelection:
+        """Pick an avatar variant without a human; select it with ``select_avatar``.
+
+        ``policy`` is "gemini" (rank the variants against the profile in one
+        call, falling back to the heuristic if that fails) or "heuristic"
+        (resolution and detail only, no API call).
+        """
+        if policy not in AUTO_SELECTION_POLICIES:
+            raise ValueError(f"Unknown avatar selection policy: {policy}")
+        if not variants:
+            raise ValueError(f"No avatar variants to select from for run {run_id}")
+
+        images = [
+            self.storage.get_path(
+                run_id=run_id, filename=f"variant_{v.index}.png", subdir="avatar_variants"
+            ).read_bytes()
+            for v in variants
+        ]
+
+        selection: AvatarAutoSelection | None = None
+        fallback_reason: str | None = None
+        if policy == "gemini":
+            if self.gemini is None:
+                fallback_reason = "Gemini ranking is not configured"
+            else:
+                try:
+                    ranked = await self.gemini.rank_avatars(images, avatar_profile, run_id=run_id)
+                    selection = AvatarAutoSelection(
+                        policy=policy,
+                        method="gemini",
+                        selected_index=variants[ranked["ranking"][0]].index,
+                        ranking=[variants[i].index for i in ranked["ranking"]],
+                        scores=[
+                            AvatarScore(
+                                variant=variants[s["variant"]].index,
+                                score=s["score"],
+                                reasoning=s.get("reasoning", ""),
+                            )
+                            for s in ranked["scores"]
+                        ],
+                        reasoning=ranked["ranking_reasoning"],
+                    )
+                except Exception as exc:
+                    logger.warning(
+                        "Gemini avatar ranking failed for run_id=%s, using heuristic: %s",
+                        run_id,
+                        exc,
+                    )
+                    fallback_reason = f"Gemini ranking failed: {exc}"
+
+        if selection is None:
+            selection = self._heuristic_selection(variants, images, policy)
+            selection.fallback_reason = fallback_reason
+
+        logger.info(
+            "Auto-picked avatar variant %d for run_id=%s (policy=%s, method=%s)",
+            selection.selected_index,
+            run_id,
+            policy,
+            selection.method,
+        )
+        return selection
+
+    @staticmethod
+    def _heuristic_selection(
+        variants: list[AvatarVariant], images: list[bytes], policy: str
+    ) -> AvatarAutoSelection:
+        """Rank variants by resolution and compressed bytes per pixel.
+
+        At equal resolution a lossless PNG of a sharp, detailed render is
+        larger than one of a soft or flat render, so bytes per pixel serves as
+        a cheap detail proxy.  Transparent backgrounds are penalised since the
+        avatar is composited into full-frame scenes.
+        """
+        infos = [probe_image(data) for data in images]
+        pixels = [(i.width or 0) * (i.height or 0) for i in infos]
+        detail = [len(data) / p if p else 0.0 for data, p in zip(images, pixels)]
+        max_pixels = max(pixels) or 1
+        max_detail = max(detail) or 1.0
+
+        raw: dict[int, float] = {}
+        scores: list[AvatarScore] = []
+        for variant, info, p, d in zip(variants, infos, pixels, detail):
+            raw[variant.index] = 5 * p / max_pixels + 5 * d / max_detail - (2 if info.has_alpha else 0)
+            size = f"{info.width}x{info.height}" if p else "unknown size"
+            scores.append(AvatarScore(
+                variant=variant.index,
+                score=max(1, min(10, round(raw[variant.index]))),
+                reasoning=f"{size}, {d:.2f} bytes/pixel"
+                + (", transparent background" if info.has_alpha else ""),
+            ))
+
+        # Stable sort keeps the earlier variant first on ties
+        ranking = sorted(raw, key=lambda idx: -raw[idx])
+        best = next(s for s in scores if s.variant == ranking[0])
+        return AvatarAutoSelection(
+            policy=policy,
+            method="heuristic",
+            selected_index=ranking[0],
+            ranking=ranking,
+            scores=scores,
+            reasoning=f"Highest resolution and detail: {best.reasoning}",
+        )
@@ -1,21 +1,58 @@
 import asyncio
 import logging
 import uuid
+from typing import Callable
 
+from app.ai.concurrency import AIMDLimiter
+from app.ai.rate_limit import track_overloads
 from app.jobs.store import JobStore
-from app.models.script import ScriptRequest
+from app.models.job import JobStatus
+from app.models.script import AvatarSelectionPolicy, ScriptRequest
 from app.services.pipeline_service import PipelineService
 from app.utils.csv_parser import parse_product_csv
 
 logger = logging.getLogger(__name__)
 
 
+class _BulkRun:
+    """Scheduling state of a running batch.
+
+    ``active`` jobs hold a concurrency slot; ``parked`` jobs wait for a
+    human avatar pick without a slot or a task (job_id -> stop watching).
+    """
+
+    def __init__(self, limiter: AIMDLimiter):
+        self.limiter = limiter
+        self.queued = 0
+        self.active: set[str] = set()
+        self.parked: dict[str, Callable[[], None]] = {}
+
+    def counts(self) -> dict:
+        return {"queued": self.queued, "active": len(self.active), "parked": len(self.parked)}
+
+
 class BulkService:
-    def __init__(self, pipeline_svc: PipelineService, job_store: JobStore):
+    def __init__(
+        self,
+        pipeline_svc: PipelineService,
+        job_store: JobStore,
+        max_concurrency: int | None = None,
+        avatar_selection: AvatarSelectionPolicy = "manual",
+    ):
+        """
+        Args:
+            max_concurrency: Ceiling the bulk limit may grow to. None keeps
+                the requested concurrency fixed.
+            avatar_selection: Avatar selection policy for batches started
+                without one; see ScriptRequest.avatar_selection.
+        """
         self.pipeline_svc = pipeline_svc
         self.job_store = job_store
+        self.max_concurrency = max_concurrency
+        self.avatar_selection = avatar_selection
         self._bulk_jobs: dict[str, list[str]] = {}  # bulk_id -> list of job_ids
         self._bulk_tasks: dict[str, asyncio.Task] = {}
+        self._bulk_runs: dict[str, _BulkRun] = {}
 
     async def process_csv(self, file_content: bytes) -> tuple[str, list[str]]:
         """Parse a CSV file and create jobs for each product row.
@@ -31,6 +68,8 @@ class BulkService:
                 product_name=row["product_name"],
                 specifications=row["specifications"],
                 image_url=row["image_url"],
+                # Re-running a CSV should not re-bill identical products
+                use_cache=True,
             )
             job = self.job_store.create_job(request)
             job_ids.append(job.job_id)
@@ -45,33 +84,160 @@ class BulkService:
         )
         return bulk_id, job_ids
 
-    async def start_bulk(self, bulk_id: str, concurrency: int = 2):
-        """Start processing multiple jobs with bounded concurrency."""
+    async def start_bulk(
+        self,
+        bulk_id: str,
+        concurrency: int = 2,
+        avatar_selection: AvatarSelectionPolicy | None = None,
+    ):
+        """Start processing multiple jobs with bounded concurrency.
+
+        *avatar_selection* applies to every job of the batch and defaults to
+        the service's policy, so unattended batches don't park on a human
+        avatar pick.
+        """
         job_ids = self._bulk_jobs.get(bulk_id)
         if job_ids is None:
             raise ValueError(f"Bulk {bulk_id} not found")
+        policy = avatar_selection or self.avatar_selection
 
         task = asyncio.create_task(
-            self._run_bulk(bulk_id, job_ids, concurrency),
+            self._run_bulk(bulk_id, job_ids, concurrency, policy),
             name=f"bulk-{bulk_id}",
         )
         self._bulk_tasks[bulk_id] = task
 
-    async def _run_bulk(self, bulk_id: str, job_ids: list[str], concurrency: int):
-        """Run multiple pipeline jobs with bounded concurrency."""
-        semaphore = asyncio.Semaphore(concurrency)
+    async def retry_failed(self, bulk_id: str, concurrency: int = 2) -> list[str]:
+        """Resume the batch's failed and cancelled jobs from their checkpoints.
+
+        Each job keeps its avatar selection policy and skips the stages and
+        scenes it already completed.  Returns the retried job ids.
+        """
+        job_ids = self._bulk_jobs.get(bulk_id)
+        if job_ids is None:
+            raise ValueError(f"Bulk {bulk_id} not found")
+        task = self._bulk_tasks.get(bulk_id)
+        if task is not None and not task.done():
+            raise RuntimeError(f"Bulk {bulk_id} is still running")
+
+        retry_ids = []
+        for jid in job_ids:
+            job = self.job_store.get_job(jid)
+            if job and job.status in (JobStatus.FAILED, JobStatus.CANCELLED):
+                retry_ids.append(jid)
+        if retry_ids:
+            self._bulk_tasks[bulk_id] = asyncio.create_task(
+                self._run_bulk(bulk_id, retry_ids, concurrency, None, resume=True),
+                name=f"bulk-{bulk_id}-retry",
+            )
+        return retry_ids
+
+    async def _run_bulk(
+        self,
+        bulk_id: str,
+        job_ids: list[str],
+        concurrency: int,
+        avatar_selection: AvatarSelectionPolicy | None,
+        resume: bool = False,
+    ):
+        """Run multiple pipeline jobs with adaptive bounded concurrency.
+
+        *concurrency* is the starting limit.  A job whose own genai calls hit
+        overload errors (429/503) halves the limit; jobs that completed
+        cleanly grow it additively up to ``max_concurrency``.
+
+        Jobs waiting for a manual avatar pick are parked: their task ends and
+        gives its slot back, and the job re-enters the queue at the storyboard
+        stage once the selection is saved.
+
+        A None *avatar_selection* keeps each job's own policy; *resume*
+        continues the jobs from their checkpoints.
+        """
+        limiter = AIMDLimiter(
+            f"bulk-{bulk_id}",
+            initial=concurrency,
+            max_limit=max(concurrency, self.max_concurrency or concurrency),
+        )
+        run = _BulkRun(limiter)
+        self._bulk_runs[bulk_id] = run
+        # (job_id, after_selection) entries; None wakes the dispatcher when
+        # the last job ends while parked
+        queue: asyncio.Queue[tuple[str, bool] | None] = asyncio.Queue()
+        for jid in job_ids:
+            queue.put_nowait((jid, False))
+        unfinished = len(job_ids)
+        tasks: set[asyncio.Task] = set()
 
-        async def run_one(job_id: str):
-            async with semaphore:
-                job = self.job_store.get_job(job_id)
-                if job is None:
-                    return
-                await self.pipeline_svc.run_full_pipeline(job_id, job.request)
+        def finish(job_id: str):
+            nonlocal unfinished
+            run.parked.pop(job_id, None)
+            unfinished -= 1
+            if unfinished == 0:
+                queue.put_nowait(None)
 
-        tasks = [run_one(jid) for jid in job_ids]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        def park(job_id: str):
+            def on_selected():
+                run.parked.pop(job_id, None)
+                run.queued += 1
+                queue.put_nowait((job_id, True))
+
+            run.parked[job_id] = self.pipeline_svc.park_for_avatar_selection(
+                job_id, on_selected=on_selected, on_ended=lambda: finish(job_id)
+            )
+
+        async def run_one(job_id: str, after_selection: bool):
+            run.active.add(job_id)
+            parked = False
+            # Only this job's own 429/503s count, not the rest of the process
+            with track_overloads() as overloads:
+                try:
+                    if after_selection:
+                        await self.pipeline_svc.resume_after_avatar_selection(job_id)
+                        return
+                    job = self.job_store.get_job(job_id)
+                    if job is None:
+                        return
+                    request = job.request
+                    if avatar_selection and request.avatar_selection != avatar_selection:
+                        request = request.model_copy(update={"avatar_selection": avatar_selection})
+                        self.job_store.update_job(job_id, request=request)
+                    parked = not await self.pipeline_svc.run_full_pipeline(
+                        job_id, request, park_for_selection=True, resume=resume
+                    )
+                finally:
+                    run.active.discard(job_id)
+                    if overloads.overloads:
+                        limiter.on_overload()
+                    elif self._completed(job_id):
+                        limiter.on_success()
+                    await limiter.release()
+                    if parked:
+                        park(job_id)
+                    else:
+                        finish(job_id)
+
+        run.queued = len(job_ids)
+        try:
+            while unfinished:
+                item = await queue.get()
+                if item is None:
+                    continue
+                await limiter.acquire()
+                run.queued -= 1
+                task = asyncio.create_task(run_one(*item), name=f"bulk-{bulk_id}-{item[0]}")
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for stop in list(run.parked.values()):
+                stop()
+            for task in list(tasks):
+                task.cancel()
         logger.info("Bulk %s completed: %d jobs processed", bulk_id, len(job_ids))
 
+    def _completed(self, job_id: str) -> bool:
+        state = self.job_store.get_wait_state(job_id)
+        return state is not None and state[0] == JobStatus.COMPLETED
+
     def get_bulk_status(self, bulk_id: str) -> dict:
         """Get status of all jobs in a bulk batch."""
         job_ids = self._bulk_jobs.get(bulk_id)
@@ -90,10 +256,21 @@ class BulkService:
 
         task = self._bulk_tasks.get(bulk_id)
         is_running = task is not None and not task.done()
+        run = self._bulk_runs.get(bulk_id)
 
         return {
             "bulk_id": bulk_id,
             "total_jobs": len(job_ids),
             "is_running": is_running,
+            "concurrency_limit": run.limiter.current_limit if run else None,
+            **(run.counts() if run and is_running else {"queued": 0, "active": 0, "parked": 0}),
             "jobs": jobs,
         }
+
+    def concurrency_stats(self) -> dict:
+        """Current adaptive limits and job counts for running bulk batches."""
+        return {
+            bulk_id: {**run.limiter.stats(), **run.counts()}
+            for bulk_id, run in self._bulk_runs.items()
+            if not self._bulk_tasks[bulk_id].done()
+        }
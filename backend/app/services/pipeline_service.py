@@ -1,22 +1,36 @@
 import asyncio
+import functools
 import logging
-
+import time
+import uuid
+from typing import Callable
+
+from app.ai.context_cache import ContextCacheManager
+from app.ai.image_prep import ImagePreparer
+from app.config import Settings
+from app.jobs.checkpoints import CheckpointStore, scene_unit
 from app.jobs.events import SSEBroadcaster
 from app.jobs.store import JobStore
-from app.models.job import JobStatus, JobStep
-from app.models.script import ScriptRequest
+from app.models.avatar import AvatarResponse
+from app.models.job import Job, JobStatus, JobStep
+from app.models.script import AvatarProfile, Scene, ScriptRequest, VideoScript
 from app.models.sse import SSEEventType
+from app.models.storyboard import StoryboardResult
+from app.models.video import VideoResult
 from app.services.avatar_service import AvatarService
 from app.services.review_service import ReviewService
 from app.services.script_service import ScriptService
 from app.services.stitch_service import StitchService
 from app.services.storyboard_service import StoryboardService
 from app.services.video_service import VideoService
+from app.storage.reference_assets import ReferenceAssetStore
+from app.utils.dag import DependencyFailed, TaskGraph
 
 logger = logging.getLogger(__name__)
 
-# How long to wait between checks for avatar selection (seconds)
-_AVATAR_POLL_INTERVAL = 1.0
+# Re-check interval while waiting for avatar selection; in-process updates
+# wake the wait immediately, this only catches other processes (seconds)
+_AVATAR_FALLBACK_POLL_INTERVAL = 10.0
 # Maximum time to wait for avatar selection (seconds)
 _AVATAR_WAIT_TIMEOUT = 600.0
 
@@ -32,6 +46,11 @@ class PipelineService:
         review_svc: ReviewService,
         job_store: JobStore,
         event_broadcaster: SSEBroadcaster,
+        settings: Settings,
+        context_cache: ContextCacheManager | None = None,
+        checkpoints: CheckpointStore | None = None,
+        reference_assets: ReferenceAssetStore | None = None,
+        image_preparer: ImagePreparer | None = None,
     ):
         self.script_svc = script_svc
         self.avatar_svc = avatar_svc
@@ -41,75 +60,693 @@ class PipelineService:
         self.review_svc = review_svc
         self.job_store = job_store
         self.broadcaster = event_broadcaster
+        self.settings = settings
+        self.context_cache = context_cache
+        self.checkpoints = checkpoints
+        self.reference_assets = reference_assets
+        self.image_preparer = image_preparer
 
-    async def run_full_pipeline(self, job_id: str, request: ScriptRequest):
+    async def run_full_pipeline(
+        self,
+        job_id: str,
+        request: ScriptRequest,
+        park_for_selection: bool = False,
+        resume: bool = False,
+    ) -> bool:
         """Run the full automated pipeline as a background task.
 
         Steps:
         1. Generate script
         2. Generate avatar variants
-        3. Wait for avatar selection
+        3. Wait for avatar selection, or pick one automatically when
+           ``request.avatar_selection`` is "gemini" or "heuristic"
         4. Generate storyboard with QC
         5. Generate videos with QC
         6. Stitch final commercial
+
+        The run's cached Gemini contexts are released when the job ends,
+        whatever the outcome.
+
+        Script parts are published as ``step_progress`` events as soon as
+        they are complete, and avatar generation starts from the
+        avatar_profile while the scenes are still being written.
+
+        With the ``dag`` pipeline executor, steps 4-5 and the per-clip stitch
+        preparation run per scene (see _run_scene_dag) rather than stage by
+        stage.
+
+        With *park_for_selection*, a manual avatar pick does not hold the
+        task: the method returns False once the variants are ready, and the
+        caller continues the job with ``resume_after_avatar_selection`` (see
+        ``park_for_avatar_selection``).  Returns True otherwise, whether the
+        job completed or failed.
+
+        Completed stages and scenes are checkpointed (app/jobs/checkpoints.py).
+        With *resume*, every unit whose checkpoint and artifacts are intact,
+        and whose upstream units were reused too, is skipped; the job
+        continues from the first incomplete unit.  A fresh run clears the
+        job's checkpoints.
         """
+        # Fix the run_id up front so the avatar stage can start mid-script
+        run_id = request.run_id or uuid.uuid4().hex[:12]
+        request = request.model_copy(update={"run_id": run_id})
+        avatar_task: asyncio.Task[AvatarResponse] | None = None
+        early_profile: AvatarProfile | None = None
+
+        def on_script_partial(kind: str, value: dict) -> None:
+            nonlocal avatar_task, early_profile
+            self.broadcaster.emit(
+                job_id,
+                SSEEventType.STEP_PROGRESS,
+                {"step": "script", "part": kind, "value": value},
+            )
+            if kind != "avatar_profile" or avatar_task is not None:
+                return
+            try:
+                early_profile = AvatarProfile(**value)
+            except Exception as exc:
+                logger.warning("Streamed avatar profile for job %s is invalid: %s", job_id, exc)
+                return
+            self.broadcaster.emit(
+                job_id, SSEEventType.STEP_STARTED, {"step": "avatar", "early": True}
+            )
+            avatar_task = asyncio.create_task(
+                self.avatar_svc.generate_avatars(run_id=run_id, avatar_profile=early_profile)
+            )
+
         try:
-            # Mark job as running
-            self.job_store.update_job(job_id, status=JobStatus.RUNNING)
-            self.broadcaster.emit(job_id, SSEEventType.JOB_STARTED)
+            # Mark job as running; the stored request keeps the run_id so a
+            # parked or failed job can be resumed
+            job = self.job_store.update_job(
+                job_id, status=JobStatus.RUNNING, error=None, request=request
+            )
+            reused = self._reusable_units(job) if resume else {}
+            if resume:
+                self.job_store.update_metadata(
+                    job_id,
+                    resumed_units=sorted(reused),
+                    resume_count=job.metadata.get("resume_count", 0) + 1,
+                )
+                logger.info(
+                    "Resuming job %s, reusing %d checkpointed units", job_id, len(reused)
+                )
+            elif self.checkpoints:
+                self.checkpoints.clear(job_id)
+            self.broadcaster.emit(
+                job_id, SSEEventType.JOB_STARTED, {"resumed": True} if resume else None
+            )
 
             # Step 1: Script generation
-            self.job_store.set_progress(job_id, JobStep.SCRIPT, 1, "Generating script...")
-            self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "script"})
+            if "script" in reused:
+                script = job.script
+                self.broadcaster.emit(
+                    job_id,
+                    SSEEventType.STEP_COMPLETED,
+                    {"step": "script", "run_id": run_id, "resumed": True},
+                )
+            else:
+                self.job_store.set_progress(job_id, JobStep.SCRIPT, 1, "Generating script...")
+                self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "script"})
+
+                script_response = await self.script_svc.generate_script(
+                    request, on_partial=on_script_partial
+                )
+                script = script_response.script
+
+                self.job_store.update_job(job_id, script=script)
+                self.job_store.update_metadata(
+                    job_id,
+                    script_cache_hit=script_response.cached,
+                    avatar_early_start=avatar_task is not None,
+                )
+                self._checkpoint(job_id, {
+                    "script": [
+                        script_response.product_image_path,
+                        self.script_svc.storage.get_url_path(run_id, "script.json"),
+                    ]
+                })
+                self.broadcaster.emit(
+                    job_id,
+                    SSEEventType.STEP_COMPLETED,
+                    {"step": "script", "run_id": run_id, "cached": script_response.cached},
+                )
+
+            # Step 2: Avatar generation (possibly already running)
+            if "avatar" in reused:
+                avatar_response = AvatarResponse(run_id=run_id, variants=job.avatar_variants)
+                self.broadcaster.emit(
+                    job_id,
+                    SSEEventType.STEP_COMPLETED,
+                    {
+                        "step": "avatar",
+                        "num_variants": len(avatar_response.variants),
+                        "resumed": True,
+                    },
+                )
+            else:
+                self.job_store.set_progress(
+                    job_id, JobStep.AVATAR, 2, "Generating avatar variants..."
+                )
+                if avatar_task is not None and early_profile != script.avatar_profile:
+                    # A retried stream produced a different profile: start over
+                    avatar_task.cancel()
+                    avatar_task = None
+                if avatar_task is None:
+                    self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "avatar"})
+                    avatar_task = asyncio.create_task(
+                        self.avatar_svc.generate_avatars(
+                            run_id=run_id,
+                            avatar_profile=script.avatar_profile,
+                        )
+                    )
+                avatar_response = await avatar_task
+
+                # A selection from an earlier attempt belongs to the old variants
+                self.job_store.update_job(
+                    job_id, avatar_variants=avatar_response.variants, selected_avatar=None
+                )
+                self._checkpoint(
+                    job_id, {"avatar": [v.image_path for v in avatar_response.variants]}
+                )
+                self.broadcaster.emit(
+                    job_id,
+                    SSEEventType.STEP_COMPLETED,
+                    {
+                        "step": "avatar",
+                        "num_variants": len(avatar_response.variants),
+                    },
+                )
+
+            # Step 3: Avatar selection (human, or automatic for unattended runs)
+            if "avatar_selection" in reused:
+                self.broadcaster.emit(
+                    job_id,
+                    SSEEventType.STEP_COMPLETED,
+                    {"step": "avatar_selection", "selected": job.selected_avatar, "resumed": True},
+                )
+            elif request.avatar_selection == "manual":
+                if resume and job.selected_avatar:
+                    # Its checkpoint did not verify: ask again
+                    self.job_store.update_job(job_id, selected_avatar=None)
+                self.job_store.set_progress(
+                    job_id, JobStep.AVATAR_SELECTION, 3, "Waiting for avatar selection..."
+                )
+                self.broadcaster.emit(
+                    job_id,
+                    SSEEventType.STEP_STARTED,
+                    {"step": "avatar_selection"},
+                )
+                if park_for_selection:
+                    return False
+
+                selected_avatar = await self._wait_for_avatar_selection(job_id)
+                self._checkpoint(job_id, {"avatar_selection": [selected_avatar]})
+
+                self.broadcaster.emit(
+                    job_id,
+                    SSEEventType.STEP_COMPLETED,
+                    {"step": "avatar_selection", "selected": selected_avatar},
+                )
+            else:
+                await self._auto_select_avatar(
+                    job_id, run_id, request.avatar_selection, avatar_response,
+                    script.avatar_profile,
+                )
+
+            await self._run_to_completion(job_id, run_id, script, reused)
+
+        except asyncio.CancelledError:
+            self._mark_cancelled(job_id)
+            raise
+
+        except Exception as exc:
+            logger.exception("Pipeline failed for job %s", job_id)
+            self._mark_failed(job_id, str(exc))
 
-            script_response = await self.script_svc.generate_script(request)
-            run_id = script_response.run_id
+        finally:
+            if avatar_task is not None and not avatar_task.done():
+                avatar_task.cancel()
+            await self._release_run(run_id)
+        return True
 
-            self.job_store.update_job(job_id, script=script_response.script)
+    async def resume_after_avatar_selection(self, job_id: str) -> None:
+        """Steps 4-6 for a job parked on avatar selection, once it has one."""
+        job = self.job_store.get_job(job_id)
+        if job is None:
+            return
+        run_id = job.request.run_id or job_id
+        try:
+            if not job.script or not job.selected_avatar:
+                raise ValueError("Script and avatar selection required before storyboard")
+            self._checkpoint(job_id, {"avatar_selection": [job.selected_avatar]})
             self.broadcaster.emit(
                 job_id,
                 SSEEventType.STEP_COMPLETED,
-                {"step": "script", "run_id": run_id},
+                {"step": "avatar_selection", "selected": job.selected_avatar},
             )
+            await self._run_to_completion(job_id, run_id, job.script, {})
 
-            # Step 2: Avatar generation
-            self.job_store.set_progress(job_id, JobStep.AVATAR, 2, "Generating avatar variants...")
-            self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "avatar"})
+        except asyncio.CancelledError:
+            self._mark_cancelled(job_id)
+            raise
+
+        except Exception as exc:
+            logger.exception("Pipeline failed for job %s", job_id)
+            self._mark_failed(job_id, str(exc))
+
+        finally:
+            await self._release_run(run_id)
+
+    async def _release_run(self, run_id: str) -> None:
+        """Drop the run's cached Gemini contexts, uploaded reference assets
+        and prepared reference images."""
+        if self.context_cache:
+            await self.context_cache.release(run_id)
+        if self.reference_assets:
+            await self.reference_assets.release(run_id)
+        if self.image_preparer:
+            self.image_preparer.release(run_id)
+
+    def park_for_avatar_selection(
+        self,
+        job_id: str,
+        on_selected: Callable[[], None],
+        on_ended: Callable[[], None],
+    ) -> Callable[[], None]:
+        """Watch a parked job without holding a task for it.
+
+        Calls *on_selected* once an avatar is selected, or marks the job
+        cancelled/failed and calls *on_ended* when it is cancelled or the
+        selection times out.  The same (status, selected_avatar) check as
+        ``_wait_for_avatar_selection`` runs on every save of the job and at
+        the fallback interval.  Returns a function that stops watching; the
+        callbacks never run before this returns, so callers can register it
+        first.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _AVATAR_WAIT_TIMEOUT
+        timer: asyncio.TimerHandle | None = None
+        done = False
+
+        def stop() -> None:
+            nonlocal done
+            done = True
+            unlisten()
+            if timer is not None:
+                timer.cancel()
+
+        def check(_job_id: str = job_id) -> None:
+            nonlocal timer
+            if done:
+                return
+            state = self.job_store.get_wait_state(job_id)
+            if state:
+                status, selected_avatar = state
+                if selected_avatar:
+                    stop()
+                    on_selected()
+                    return
+                if status == JobStatus.CANCELLED:
+                    stop()
+                    self._mark_cancelled(job_id)
+                    on_ended()
+                    return
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                stop()
+                self._mark_failed(
+                    job_id,
+                    f"Avatar selection timed out after {_AVATAR_WAIT_TIMEOUT}s for job {job_id}",
+                )
+                on_ended()
+                return
+            if timer is not None:
+                timer.cancel()
+            timer = loop.call_later(min(remaining, _AVATAR_FALLBACK_POLL_INTERVAL), check)
+
+        unlisten = self.job_store.signals.listen(job_id, check)
+        # Deferred: a selection saved while parking would otherwise call back
+        # before the caller holds the stop handle
+        loop.call_soon(check)
+        return stop
+
+    async def _run_to_completion(
+        self, job_id: str, run_id: str, script: VideoScript, reused: dict
+    ) -> None:
+        """Steps 4-6: storyboard, videos and stitch, then mark the job done."""
+        if self.settings.pipeline_executor == "dag":
+            await self._run_scene_dag(job_id, run_id, script, reused)
+        else:
+            await self._run_stages(job_id, run_id, script, reused)
+
+        # Step 6: Stitch
+        self.job_store.set_progress(job_id, JobStep.STITCH, 6, "Stitching final video...")
+        self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "stitch"})
+
+        final_path = await self.stitch_svc.stitch_videos(run_id=run_id)
+
+        # Create pending review
+        self.review_svc.create_review(job_id)
+
+        self.job_store.update_job(job_id, final_video_path=final_path)
+        self._checkpoint(job_id, {"stitch": [final_path]})
+        self.broadcaster.emit(
+            job_id,
+            SSEEventType.STEP_COMPLETED,
+            {"step": "stitch", "path": final_path},
+        )
+
+        # Done
+        self.job_store.update_job(job_id, status=JobStatus.COMPLETED)
+        self.broadcaster.emit(
+            job_id,
+            SSEEventType.JOB_COMPLETED,
+            {"final_video_path": final_path},
+        )
+
+    def resumable_units(self, job_id: str) -> list[str]:
+        """Units a resume of *job_id* would skip, in pipeline order."""
+        job = self.job_store.get_job(job_id)
+        return list(self._reusable_units(job)) if job else []
+
+    def _reusable_units(self, job: Job) -> dict[str, object]:
+        """Verified units of *job* that a resume can skip, with their results.
+
+        A stage is reused only if the stages before it were, and a scene's
+        units only if the avatar selection was.  A scene's video also needs
+        its storyboard and the previous scene's video reused: pipeline runs
+        chain scenes in both continuity modes (strict mode generates from
+        the previous video, parallel mode repairs continuity against it).
+        Values are the stored StoryboardResult/VideoResult for scene units
+        and None otherwise.
+        """
+        verified = self.checkpoints.verified(job) if self.checkpoints else set()
+        reused: dict[str, object] = {}
+        for unit, present in (
+            ("script", job.script is not None),
+            ("avatar", bool(job.avatar_variants)),
+            ("avatar_selection", bool(job.selected_avatar)),
+        ):
+            if unit not in verified or not present:
+                return reused
+            reused[unit] = None
+
+        storyboards = {r.scene_number: r for r in job.storyboard_results or []}
+        videos = {r.scene_number: r for r in job.video_results or []}
+        reused_videos: dict[str, object] = {}
+        chain_intact = True
+        for n in sorted(s.scene_number for s in job.script.scenes):
+            if n not in storyboards or scene_unit("storyboard", n) not in verified:
+                chain_intact = False
+                continue
+            reused[scene_unit("storyboard", n)] = storyboards[n]
+            if chain_intact and n in videos and scene_unit("video", n) in verified:
+                reused_videos[scene_unit("video", n)] = videos[n]
+            else:
+                chain_intact = False
+        reused.update(reused_videos)
+        return reused
+
+    def _checkpoint(self, job_id: str, units: dict[str, list[str]]) -> None:
+        if self.checkpoints:
+            self.checkpoints.record(job_id, units)
+
+    def _mark_cancelled(self, job_id: str) -> None:
+        self.job_store.update_job(
+            job_id,
+            status=JobStatus.CANCELLED,
+            error="Pipeline was cancelled",
+        )
+        self.broadcaster.emit(
+            job_id,
+            SSEEventType.JOB_FAILED,
+            {"error": "Pipeline was cancelled"},
+        )
+
+    def _mark_failed(self, job_id: str, error: str) -> None:
+        self.job_store.update_job(
+            job_id,
+            status=JobStatus.FAILED,
+            error=error,
+        )
+        self.broadcaster.emit(
+            job_id,
+            SSEEventType.JOB_FAILED,
+            {"error": error},
+        )
+
+    async def _run_scene_dag(
+        self, job_id: str, run_id: str, script: VideoScript, reused: dict
+    ) -> None:
+        """Steps 4-5 as per-scene units of one task graph.
+
+        Each scene runs storyboard -> video -> stitch prep (CFR re-encode) on
+        its own, so scene 1's video starts as soon as its storyboard passes
+        QC.  In strict continuity mode a scene's video also waits for the
+        previous scene's selected variant; in parallel mode the continuity
+        repair of scene N runs once scenes N-1 and N are final.  A failing
+        scene only stops its own downstream units; the job fails after the
+        rest finished, naming the failed scenes.
+
+        The storyboard/video stage events and progress are kept: a stage
+        starts with its first unit and completes with its last one.
+
+        Scene units in *reused* (see _reusable_units) return their stored
+        result instead of running.  Each finished storyboard and each scene
+        whose final video is in place is checkpointed.
+        """
+        scenes = sorted(script.scenes, key=lambda s: s.scene_number)
+        numbers = [s.scene_number for s in scenes]
+
+        def scene_progress(data: dict):
+            self.broadcaster.emit(job_id, SSEEventType.SCENE_PROGRESS, data)
+
+        mode, scene_kwargs = self.video_svc.scene_plan(
+            run_id=run_id,
+            script_scenes=script.scenes,
+            avatar_profile=script.avatar_profile,
+            on_progress=scene_progress,
+        )
+        strict = mode == "strict"
+        repair = mode == "parallel" and scene_kwargs["use_reference_images"]
+
+        reused_storyboards: dict[int, StoryboardResult] = {
+            n: reused[scene_unit("storyboard", n)]
+            for n in numbers
+            if scene_unit("storyboard", n) in reused
+        }
+        reused_videos: dict[int, VideoResult] = {
+            n: reused[scene_unit("video", n)] for n in numbers if scene_unit("video", n) in reused
+        }
+        if reused_storyboards:
+            logger.info(
+                "Job %s: reusing storyboards for scenes %s and videos for scenes %s",
+                job_id, sorted(reused_storyboards), sorted(reused_videos),
+            )
 
-            avatar_response = await self.avatar_svc.generate_avatars(
+        loop = asyncio.get_running_loop()
+        # Local path of each scene's winning variant, or None if it has none
+        selected: dict[int, asyncio.Future] = {n: loop.create_future() for n in numbers}
+        storyboards: dict[int, StoryboardResult] = {}
+        videos: dict[int, VideoResult] = {}
+
+        async def storyboard_unit(scene: Scene) -> StoryboardResult:
+            if scene.scene_number in reused_storyboards:
+                return reused_storyboards[scene.scene_number]
+            return await self.storyboard_svc.regenerate_single_scene(
                 run_id=run_id,
-                avatar_profile=script_response.script.avatar_profile,
+                scene=scene,
+                total_scenes=len(scenes),
+                on_progress=scene_progress,
             )
 
-            self.job_store.update_job(job_id, avatar_variants=avatar_response.variants)
-            self.broadcaster.emit(
-                job_id,
-                SSEEventType.STEP_COMPLETED,
-                {
-                    "step": "avatar",
-                    "num_variants": len(avatar_response.variants),
-                },
+        async def video_unit(i: int, scene: Scene) -> tuple[VideoResult, float]:
+            n = scene.scene_number
+            if n in reused_videos:
+                return reused_videos[n], 0.0
+            prev_last_frame_gcs = None
+            if strict and i > 0:
+                prev = numbers[i - 1]
+                prev_path = await selected[prev]
+                if prev_path is None:
+                    raise DependencyFailed(("video", n), ("video", prev))
+                prev_last_frame_gcs = await self.video_svc.upload_last_frame(run_id, prev, prev_path)
+
+            def on_variant_selected(path: str) -> None:
+                if not selected[n].done():
+                    selected[n].set_result(path)
+
+            return await self.video_svc.generate_scene(
+                storyboards[n],
+                scene,
+                scene_kwargs,
+                prev_scene_last_frame_gcs=prev_last_frame_gcs,
+                on_variant_selected=on_variant_selected,
             )
 
-            # Step 3: Wait for avatar selection
-            self.job_store.set_progress(
-                job_id, JobStep.AVATAR_SELECTION, 3, "Waiting for avatar selection..."
+        async def continuity_unit(i: int, scene: Scene) -> tuple[VideoResult, float] | None:
+            n, prev = scene.scene_number, numbers[i - 1]
+            if prev not in videos or n in reused_videos:
+                return None
+            try:
+                prev_last_frame_gcs = await self.video_svc.upload_last_frame(
+                    run_id, prev, self.video_svc.selected_video_path(run_id, prev),
+                )
+                if not prev_last_frame_gcs:
+                    return None
+                return await self.video_svc.repair_continuity(
+                    storyboards[n], scene, scene_kwargs, prev, prev_last_frame_gcs,
+                )
+            except Exception as exc:
+                logger.warning("Scene %d: continuity repair failed, keeping scene: %s", n, exc)
+                return None
+
+        async def stitch_prep_unit(n: int) -> None:
+            try:
+                await self.stitch_svc.prepare_scene(run_id, n)
+            except Exception as exc:
+                # Stitch re-encodes whatever was not prepared
+                logger.warning("Scene %d: stitch preparation failed: %s", n, exc)
+
+        remaining = {"storyboard": len(scenes), "video": 0}
+        started_stages: set[str] = set()
+
+        def on_start(node: tuple, stage: str | None) -> None:
+            if stage == "video" and stage not in started_stages:
+                started_stages.add(stage)
+                self.job_store.set_progress(job_id, JobStep.VIDEO, 5, "Generating videos...")
+                self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "video"})
+
+        def on_done(node: tuple, stage: str | None, outcome) -> None:
+            kind, n = node
+            failed = isinstance(outcome, BaseException)
+            if kind == "storyboard" and not failed:
+                storyboards[n] = outcome
+                self.job_store.update_job(
+                    job_id, storyboard_results=[storyboards[k] for k in sorted(storyboards)]
+                )
+                if n not in reused_storyboards:
+                    self._checkpoint(job_id, {scene_unit("storyboard", n): [outcome.image_path]})
+            elif kind in ("video", "continuity") and not failed and outcome is not None:
+                videos[n] = outcome[0]
+                self.job_store.update_job(
+                    job_id, video_results=[videos[k] for k in sorted(videos)]
+                )
+            if kind == "video" and not selected[n].done():
+                selected[n].set_result(
+                    None if failed else self.video_svc.selected_video_path(run_id, n)
+                )
+            if kind == "stitch_prep" and not failed and n not in reused_videos:
+                # The scene's final video (after any continuity repair)
+                self._checkpoint(
+                    job_id,
+                    {scene_unit("video", n): [self.video_svc.selected_video_path(run_id, n)]},
+                )
+
+            if stage not in remaining or isinstance(outcome, asyncio.CancelledError):
+                return
+            remaining[stage] -= 1
+            if remaining[stage] == 0 and (stage == "storyboard" or stage in started_stages):
+                results = storyboards if stage == "storyboard" else videos
+                self.broadcaster.emit(
+                    job_id,
+                    SSEEventType.STEP_COMPLETED,
+                    {
+                        "step": stage,
+                        "num_scenes": len(results),
+                        "failed_scenes": [k for k in numbers if k not in results],
+                    },
+                )
+
+        limits = {"storyboard": self.settings.max_concurrent_scenes}
+        if not strict:
+            # Strict scenes wait on their predecessor, which bounds them already
+            limits["video"] = self.settings.max_concurrent_scenes
+        graph = TaskGraph(limits=limits, on_start=on_start, on_done=on_done)
+        for i, scene in enumerate(scenes):
+            n = scene.scene_number
+            graph.add(("storyboard", n), functools.partial(storyboard_unit, scene), stage="storyboard")
+            graph.add(
+                ("video", n),
+                functools.partial(video_unit, i, scene),
+                deps=[("storyboard", n)],
+                stage="video",
             )
-            self.broadcaster.emit(
-                job_id,
-                SSEEventType.STEP_STARTED,
-                {"step": "avatar_selection"},
+            last = ("video", n)
+            if repair and i > 0:
+                prev = numbers[i - 1]
+                graph.add(
+                    ("continuity", n),
+                    functools.partial(continuity_unit, i, scene),
+                    deps=[last],
+                    after=[("continuity", prev) if i > 1 else ("video", prev)],
+                    stage="video",
+                )
+                last = ("continuity", n)
+            remaining["video"] += 2 if last[0] == "continuity" else 1
+            graph.add(("stitch_prep", n), functools.partial(stitch_prep_unit, n), deps=[last])
+
+        self.job_store.set_progress(job_id, JobStep.STORYBOARD, 4, "Generating storyboard...")
+        self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "storyboard"})
+
+        started = time.monotonic()
+        outcomes = await graph.run()
+        wall_clock = time.monotonic() - started
+
+        failed = {
+            n: self._root_cause(outcomes, n)
+            for n in numbers
+            if isinstance(outcomes[("stitch_prep", n)], BaseException)
+        }
+        self.job_store.update_metadata(
+            job_id,
+            scene_dag_wall_clock_seconds=round(wall_clock, 2),
+            scene_dag_critical_path_seconds=round(graph.critical_path_seconds(), 2),
+            failed_scenes=sorted(failed),
+        )
+        logger.info(
+            "Scene graph for job %s finished in %.0fs (critical path %.0fs, %d failed scenes)",
+            job_id, wall_clock, graph.critical_path_seconds(), len(failed),
+        )
+        if failed:
+            details = "; ".join(
+                f"scene {n}: {err or 'skipped after an earlier scene failed'}"
+                for n, err in sorted(failed.items())
             )
+            raise RuntimeError(f"{len(failed)} of {len(numbers)} scenes failed ({details})")
+
+    @staticmethod
+    def _root_cause(outcomes: dict, scene_number: int) -> BaseException | None:
+        """First real failure among a scene's units (skips are not causes)."""
+        for kind in ("storyboard", "video", "continuity", "stitch_prep"):
+            outcome = outcomes.get((kind, scene_number))
+            if isinstance(outcome, BaseException) and not isinstance(outcome, DependencyFailed):
+                return outcome
+        return None
+
+    async def _run_stages(
+        self, job_id: str, run_id: str, script: VideoScript, reused: dict
+    ) -> None:
+        """Steps 4-5 stage by stage: every storyboard, then every video.
+
+        A resume reuses a stage only when every scene of it (and of the
+        stages before it) is in *reused*; per-scene resume needs the ``dag``
+        executor.
+        """
+        numbers = [s.scene_number for s in script.scenes]
+        stored_storyboards = [reused.get(scene_unit("storyboard", n)) for n in numbers]
+        stored_videos = [reused.get(scene_unit("video", n)) for n in numbers]
 
-            selected_avatar = await self._wait_for_avatar_selection(job_id)
-
+        # Step 4: Storyboard generation with QC
+        if all(stored_storyboards):
+            storyboard_results = stored_storyboards
             self.broadcaster.emit(
                 job_id,
                 SSEEventType.STEP_COMPLETED,
-                {"step": "avatar_selection", "selected": selected_avatar},
+                {"step": "storyboard", "num_scenes": len(storyboard_results), "resumed": True},
             )
-
-            # Step 4: Storyboard generation with QC
+        else:
+            stored_videos = []
             self.job_store.set_progress(
                 job_id, JobStep.STORYBOARD, 4, "Generating storyboard..."
             )
@@ -120,108 +757,133 @@ class PipelineService:
 
             storyboard_response = await self.storyboard_svc.generate_storyboard(
                 run_id=run_id,
-                scenes=script_response.script.scenes,
+                scenes=script.scenes,
                 on_progress=storyboard_progress,
             )
+            storyboard_results = storyboard_response.results
 
             self.job_store.update_job(
-                job_id, storyboard_results=storyboard_response.results
+                job_id, storyboard_results=storyboard_results
             )
+            self._checkpoint(job_id, {
+                scene_unit("storyboard", r.scene_number): [r.image_path]
+                for r in storyboard_results
+            })
             self.broadcaster.emit(
                 job_id,
                 SSEEventType.STEP_COMPLETED,
                 {
                     "step": "storyboard",
-                    "num_scenes": len(storyboard_response.results),
+                    "num_scenes": len(storyboard_results),
                 },
             )
 
-            # Step 5: Video generation with QC
-            self.job_store.set_progress(job_id, JobStep.VIDEO, 5, "Generating videos...")
-            self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "video"})
-
-            def video_progress(data: dict):
-                self.broadcaster.emit(job_id, SSEEventType.SCENE_PROGRESS, data)
-
-            video_response = await self.video_svc.generate_videos(
-                run_id=run_id,
-                scenes_data=storyboard_response.results,
-                script_scenes=script_response.script.scenes,
-                avatar_profile=script_response.script.avatar_profile,
-                on_progress=video_progress,
-            )
-
-            self.job_store.update_job(job_id, video_results=video_response.results)
+        # Step 5: Video generation with QC
+        if stored_videos and all(stored_videos):
             self.broadcaster.emit(
                 job_id,
                 SSEEventType.STEP_COMPLETED,
-                {
-                    "step": "video",
-                    "num_scenes": len(video_response.results),
-                },
+                {"step": "video", "num_scenes": len(stored_videos), "resumed": True},
             )
+            return
 
-            # Step 6: Stitch
-            self.job_store.set_progress(job_id, JobStep.STITCH, 6, "Stitching final video...")
-            self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "stitch"})
+        self.job_store.set_progress(job_id, JobStep.VIDEO, 5, "Generating videos...")
+        self.broadcaster.emit(job_id, SSEEventType.STEP_STARTED, {"step": "video"})
 
-            final_path = await self.stitch_svc.stitch_videos(run_id=run_id)
+        def video_progress(data: dict):
+            self.broadcaster.emit(job_id, SSEEventType.SCENE_PROGRESS, data)
 
-            # Create pending review
-            self.review_svc.create_review(job_id)
-
-            self.job_store.update_job(job_id, final_video_path=final_path)
-            self.broadcaster.emit(
-                job_id,
-                SSEEventType.STEP_COMPLETED,
-                {"step": "stitch", "path": final_path},
-            )
+        video_response = await self.video_svc.generate_videos(
+            run_id=run_id,
+            scenes_data=storyboard_results,
+            script_scenes=script.scenes,
+            avatar_profile=script.avatar_profile,
+            on_progress=video_progress,
+        )
 
-            # Done
-            self.job_store.update_job(job_id, status=JobStatus.COMPLETED)
-            self.broadcaster.emit(
-                job_id,
-                SSEEventType.JOB_COMPLETED,
-                {"final_video_path": final_path},
-            )
+        self.job_store.update_job(job_id, video_results=video_response.results)
+        self._checkpoint(job_id, {
+            scene_unit("video", r.scene_number): [
+                self.video_svc.selected_video_path(run_id, r.scene_number)
+            ]
+            for r in video_response.results
+        })
+        self.broadcaster.emit(
+            job_id,
+            SSEEventType.STEP_COMPLETED,
+            {
+                "step": "video",
+                "num_scenes": len(video_response.results),
+            },
+        )
 
-        except asyncio.CancelledError:
-            self.job_store.update_job(
-                job_id,
-                status=JobStatus.CANCELLED,
-                error="Pipeline was cancelled",
-            )
-            self.broadcaster.emit(
-                job_id,
-                SSEEventType.JOB_FAILED,
-                {"error": "Pipeline was cancelled"},
-            )
-            raise
+    async def _auto_select_avatar(
+        self,
+        job_id: str,
+        run_id: str,
+        policy: str,
+        avatar_response: AvatarResponse,
+        avatar_profile: AvatarProfile,
+    ) -> str:
+        """Pick the avatar without waiting for a human and record why."""
+        self.job_store.set_progress(
+            job_id, JobStep.AVATAR_SELECTION, 3, f"Selecting avatar automatically ({policy})..."
+        )
+        self.broadcaster.emit(
+            job_id,
+            SSEEventType.STEP_STARTED,
+            {"step": "avatar_selection", "auto": True, "policy": policy},
+        )
 
-        except Exception as exc:
-            logger.exception("Pipeline failed for job %s", job_id)
-            self.job_store.update_job(
-                job_id,
-                status=JobStatus.FAILED,
-                error=str(exc),
-            )
-            self.broadcaster.emit(
-                job_id,
-                SSEEventType.JOB_FAILED,
-                {"error": str(exc)},
-            )
+        selection = await self.avatar_svc.auto_select(
+            run_id, avatar_response.variants, avatar_profile, policy
+        )
+        selected_avatar = await self.avatar_svc.select_avatar(run_id, selection.selected_index)
+        self.job_store.update_job(job_id, selected_avatar=selected_avatar)
+        self.job_store.update_metadata(job_id, avatar_auto_selection=selection.model_dump())
+        self._checkpoint(job_id, {"avatar_selection": [selected_avatar]})
+
+        self.broadcaster.emit(
+            job_id,
+            SSEEventType.STEP_COMPLETED,
+            {
+                "step": "avatar_selection",
+                "selected": selected_avatar,
+                "auto": True,
+                "policy": policy,
+                "method": selection.method,
+                "selected_index": selection.selected_index,
+                "reasoning": selection.reasoning,
+                "fallback_reason": selection.fallback_reason,
+            },
+        )
+        return selected_avatar
 
     async def _wait_for_avatar_selection(self, job_id: str) -> str:
-        """Poll the job store until an avatar is selected or timeout."""
-        elapsed = 0.0
-        while elapsed < _AVATAR_WAIT_TIMEOUT:
-            job = self.job_store.get_job(job_id)
-            if job and job.selected_avatar:
-                return job.selected_avatar
-            if job and job.status == JobStatus.CANCELLED:
-                raise asyncio.CancelledError("Job cancelled while waiting for avatar selection")
-            await asyncio.sleep(_AVATAR_POLL_INTERVAL)
-            elapsed += _AVATAR_POLL_INTERVAL
+        """Wait until an avatar is selected, the job is cancelled or timeout.
+
+        Sleeps on the job store's signal for this job, so a selection or
+        cancellation saved in this process resumes the pipeline at once; the
+        (status, selected_avatar) columns are re-read on each wake-up and at
+        a slow fallback interval for changes made by other processes.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _AVATAR_WAIT_TIMEOUT
+        with self.job_store.signals.subscribe(job_id) as waiter:
+            while True:
+                state = self.job_store.get_wait_state(job_id)
+                if state:
+                    status, selected_avatar = state
+                    if selected_avatar:
+                        return selected_avatar
+                    if status == JobStatus.CANCELLED:
+                        raise asyncio.CancelledError(
+                            "Job cancelled while waiting for avatar selection"
+                        )
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                await waiter.wait(min(remaining, _AVATAR_FALLBACK_POLL_INTERVAL))
 
         raise TimeoutError(
             f"Avatar selection timed out after {_AVATAR_WAIT_TIMEOUT}s for job {job_id}"
@@ -236,6 +898,7 @@ class PipelineService:
         if step == "script":
             result = await self.script_svc.generate_script(job.request)
             self.job_store.update_job(job_id, script=result.script)
+            self.job_store.update_metadata(job_id, script_cache_hit=result.cached)
             return result
 
         elif step == "avatar":
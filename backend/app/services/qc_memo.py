@@ -0,0 +1,89 @@
+import json
+import logging
+from datetime import datetime, timedelta
+
+from app.db import Database
+
+logger = logging.getLogger(__name__)
+
+
+class QCMemo:
+    """SQLite-backed memo of QC reports keyed by content hashes.
+
+    Keys combine the hashes of every input the QC model sees (or, for
+    write-once Veo outputs, their GCS URIs) with the QC prompt version and
+    model ID, so an identical evaluation (e.g. a manual
+    regen-scene call re-scoring an image that was already scored) is
+    answered from the table instead of calling Gemini again.
+
+    Entries older than *ttl_days* are dropped and the table is capped at
+    *max_entries* (oldest first), checked at startup and every
+    ``_PRUNE_EVERY`` writes.
+    """
+
+    _PRUNE_EVERY = 100
+
+    def __init__(self, db: Database, max_entries: int = 20_000, ttl_days: float = 30.0):
+        self.db = db
+        self.max_entries = max_entries
+        self.ttl_days = ttl_days
+        self._stats = {"hits": 0, "misses": 0, "pruned": 0}
+        self._puts = 0
+        self.prune()
+
+    def get(self, key: str) -> dict | None:
+        with self.db.connect() as conn:
+            row = conn.execute(
+                "SELECT report_json FROM qc_memo WHERE memo_key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE qc_memo SET hits = hits + 1 WHERE memo_key = ?", (key,)
+                )
+        if row is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return json.loads(row["report_json"])
+
+    def put(self, key: str, kind: str, report: dict) -> None:
+        with self.db.connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO qc_memo (memo_key, kind, report_json, created_at, hits)
+                   VALUES (?, ?, ?, ?, 0)""",
+                (key, kind, json.dumps(report), datetime.now().isoformat()),
+            )
+        self._puts += 1
+        if self._puts % self._PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop expired entries and the oldest ones beyond max_entries."""
+        cutoff = (datetime.now() - timedelta(days=self.ttl_days)).isoformat()
+        with self.db.connect() as conn:
+            removed = conn.execute("DELETE FROM qc_memo WHERE created_at < ?", (cutoff,)).rowcount
+            removed += conn.execute(
+                """DELETE FROM qc_memo WHERE memo_key NOT IN (
+                       SELECT memo_key FROM qc_memo ORDER BY created_at DESC LIMIT ?
+                   )""",
+                (self.max_entries,),
+            ).rowcount
+        if removed:
+            self._stats["pruned"] += removed
+            logger.info("Pruned %d QC memo entries", removed)
+        return removed
+
+    def stats(self) -> dict:
+        with self.db.connect() as conn:
+            rows = conn.execute(
+                "SELECT kind, COUNT(*) AS entries, SUM(hits) AS hits FROM qc_memo GROUP BY kind"
+            ).fetchall()
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            "stored": {
+                r["kind"]: {"entries": r["entries"], "lifetime_hits": r["hits"] or 0}
+                for r in rows
+            },
+        }
@@ -1,43 +1,334 @@
+import asyncio
+import hashlib
 import logging
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
 
 from app.ai.gemini import GeminiService
+from app.ai.prompts import STORYBOARD_QC_PROMPT_VERSION, VIDEO_QC_PROMPT_VERSION
 from app.config import Settings
 from app.models.common import QCScore
 from app.models.storyboard import StoryboardQCReport
 from app.models.video import VideoQCDimension, VideoQCReport, VideoVariant
+from app.services.qc_memo import QCMemo
+from app.storage.gcs import GCSStorage
+from app.storage.response_cache import cache_key
+from app.utils.batching import MicroBatcher
 
 logger = logging.getLogger(__name__)
 
 
 class QCService:
-    def __init__(self, gemini: GeminiService, settings: Settings):
+    def __init__(
+        self,
+        gemini: GeminiService,
+        settings: Settings,
+        memo: QCMemo | None = None,
+        gcs: GCSStorage | None = None,
+    ):
         self.gemini = gemini
         self.settings = settings
+        self.memo = memo
+        self.gcs = gcs
+        self.storyboard_batcher = MicroBatcher(
+            self._flush_storyboard_batch,
+            window=settings.storyboard_qc_batch_window_seconds,
+            max_size=settings.storyboard_qc_batch_max_frames,
+            expected=lambda group: self._storyboard_loops[group[0]],
+        )
+        # Scenes per run currently in a storyboard QC loop (see storyboard_loop)
+        self._storyboard_loops: Counter[str | None] = Counter()
+
+    @contextmanager
+    def storyboard_loop(self, run_id: str | None) -> Iterator[None]:
+        """Mark one scene of *run_id* as generating and QC-ing storyboards.
+
+        The batcher flushes a run's frames once every scene in a loop has
+        submitted one, so a lone scene (e.g. a single-frame regen) is scored
+        without waiting for the batch window.
+        """
+        self._storyboard_loops[run_id] += 1
+        try:
+            yield
+        finally:
+            self._storyboard_loops[run_id] -= 1
+            if self._storyboard_loops[run_id] <= 0:
+                del self._storyboard_loops[run_id]
+            self.storyboard_batcher.recheck()
 
     async def qc_storyboard(
         self,
         avatar_bytes: bytes,
         product_bytes: bytes,
         storyboard_bytes: bytes,
+        run_id: str | None = None,
     ) -> StoryboardQCReport:
-        """Run QC on a storyboard image against avatar and product references."""
-        raw = await self.gemini.qc_storyboard(
+        """Run QC on a storyboard image against avatar and product references.
+
+        Identical (avatar, product, storyboard) inputs are answered from the
+        QC memo when one is configured.  With storyboard_qc_batching on,
+        frames of the same run sharing the same references that arrive
+        within the batch window are scored together in one Gemini request.
+        *run_id* scopes the Gemini context cache.
+        """
+        avatar_hash = hashlib.sha256(avatar_bytes).hexdigest()
+        product_hash = hashlib.sha256(product_bytes).hexdigest()
+        key = self._storyboard_memo_key(avatar_hash, product_hash, storyboard_bytes)
+        if key:
+            memoized = self.memo.get(key)
+            if memoized is not None:
+                logger.info("Storyboard QC memo hit")
+                return StoryboardQCReport.model_validate(memoized)
+
+        raw = await self._score_storyboard(
+            avatar_bytes, product_bytes, storyboard_bytes, run_id, avatar_hash, product_hash
+        )
+        report = self._storyboard_report(raw)
+        if key:
+            self.memo.put(key, "storyboard", report.model_dump())
+        return report
+
+    async def qc_storyboard_and_rewrite(
+        self,
+        avatar_bytes: bytes,
+        product_bytes: bytes,
+        storyboard_bytes: bytes,
+        prompt: str | None,
+        threshold: int | None = None,
+        include_composition: bool = False,
+        run_id: str | None = None,
+    ) -> tuple[StoryboardQCReport, str | None]:
+        """QC a storyboard frame and, if it fails, rewrite its *prompt*.
+
+        With qc_fused_rewrite on, the Gemini request that scores the frame
+        also returns the rewritten prompt.  Fused requests go through the
+        storyboard batcher like plain ones, each frame carrying its own
+        prompt.  The rewrite is None when the frame passes, on a memo hit,
+        with fusing off, or when the model left it out; callers then fall
+        back to ``rewrite_prompt``.
+
+        A None *prompt* (a regen loop's last attempt) asks for the report
+        only, but still batches with the loop's fused requests: the batch
+        group holds the pass criterion, and every scene of a run has to be
+        in the same group for the batch to flush early.
+        """
+        if not self.settings.qc_fused_rewrite:
+            report = await self.qc_storyboard(
+                avatar_bytes, product_bytes, storyboard_bytes, run_id=run_id
+            )
+            return report, None
+
+        avatar_hash = hashlib.sha256(avatar_bytes).hexdigest()
+        product_hash = hashlib.sha256(product_bytes).hexdigest()
+        key = self._storyboard_memo_key(avatar_hash, product_hash, storyboard_bytes)
+        if key:
+            memoized = self.memo.get(key)
+            if memoized is not None:
+                logger.info("Storyboard QC memo hit")
+                return StoryboardQCReport.model_validate(memoized), None
+
+        raw = await self._score_storyboard(
+            avatar_bytes, product_bytes, storyboard_bytes, run_id, avatar_hash, product_hash,
+            prompt=prompt, threshold=threshold, include_composition=include_composition,
+        )
+        report = self._storyboard_report(raw)
+        if key:
+            self.memo.put(key, "storyboard", report.model_dump())
+        if prompt is None or self.storyboard_passes_qc(report, threshold, include_composition):
+            return report, None
+        return report, self._rewritten(raw, "storyboard")
+
+    async def _score_storyboard(
+        self,
+        avatar_bytes: bytes,
+        product_bytes: bytes,
+        storyboard_bytes: bytes,
+        run_id: str | None,
+        avatar_hash: str,
+        product_hash: str,
+        prompt: str | None = None,
+        threshold: int | None = None,
+        include_composition: bool = True,
+    ) -> dict:
+        """Raw QC report for one frame, batched when storyboard_qc_batching is on.
+
+        The pass criterion is part of the batch group, so frames whose
+        rewrites are judged against different thresholds aren't mixed.
+        """
+        if self.settings.storyboard_qc_batching:
+            return await self.storyboard_batcher.submit(
+                (run_id, avatar_hash, product_hash, threshold, include_composition),
+                (avatar_bytes, product_bytes, storyboard_bytes, prompt),
+            )
+        return await self.gemini.qc_storyboard(
             avatar_bytes=avatar_bytes,
             product_bytes=product_bytes,
             storyboard_bytes=storyboard_bytes,
+            run_id=run_id,
+            rewrite_prompt=prompt,
+            threshold=threshold,
+            include_composition=include_composition,
+        )
+
+    def _storyboard_memo_key(
+        self, avatar_hash: str, product_hash: str, storyboard_bytes: bytes
+    ) -> str | None:
+        if not self.memo:
+            return None
+        return cache_key(
+            kind="storyboard",
+            avatar=avatar_hash,
+            product=product_hash,
+            storyboard=hashlib.sha256(storyboard_bytes).hexdigest(),
+            prompt_version=STORYBOARD_QC_PROMPT_VERSION,
+            model=self.settings.gemini_flash_model,
         )
+
+    @staticmethod
+    def _rewritten(raw: dict, kind: str) -> str | None:
+        rewritten = (raw.get("rewritten_prompt") or "").strip()
+        if not rewritten:
+            logger.info("Fused %s QC failed without a rewritten prompt", kind)
+            return None
+        return rewritten
+
+    @staticmethod
+    def _storyboard_report(raw: dict) -> StoryboardQCReport:
         return StoryboardQCReport(
             avatar_validation=QCScore(**raw["avatar_validation"]),
             product_validation=QCScore(**raw["product_validation"]),
             composition_quality=QCScore(**raw.get("composition_quality", {"score": 0, "reason": "N/A"})),
         )
 
-    async def qc_video(self, video_uri: str, reference_uri: str) -> VideoQCReport:
-        """Run QC on a video against its reference product image."""
+    async def _flush_storyboard_batch(
+        self,
+        group: tuple[str | None, str, str, int | None, bool],
+        items: list[tuple[bytes, bytes, bytes, str | None]],
+    ) -> list[dict]:
+        """Score a micro-batch of frames that share avatar/product references.
+
+        Items carrying a prompt get the fused rewrite in the same request.
+        """
+        run_id, _, _, threshold, include_composition = group
+        avatar_bytes, product_bytes, _, _ = items[0]
+        frames = [frame for _, _, frame, _ in items]
+        prompts = [prompt for _, _, _, prompt in items]
+        if len(frames) > 1:
+            try:
+                raws = await self.gemini.qc_storyboard_batch(
+                    avatar_bytes=avatar_bytes,
+                    product_bytes=product_bytes,
+                    storyboard_frames=frames,
+                    run_id=run_id,
+                    rewrite_prompts=prompts,
+                    threshold=threshold,
+                    include_composition=include_composition,
+                )
+                logger.info("Scored %d storyboard frames in one QC request", len(frames))
+                return raws
+            except Exception as exc:
+                logger.warning(
+                    "Batched storyboard QC failed (%s), scoring %d frames individually",
+                    exc, len(frames),
+                )
+
+        return list(await asyncio.gather(*(
+            self.gemini.qc_storyboard(
+                avatar_bytes=avatar_bytes,
+                product_bytes=product_bytes,
+                storyboard_bytes=frame,
+                run_id=run_id,
+                rewrite_prompt=prompt,
+                threshold=threshold,
+                include_composition=include_composition,
+            )
+            for frame, prompt in zip(frames, prompts)
+        )))
+
+    async def qc_video(
+        self, video_uri: str, reference_uri: str, run_id: str | None = None
+    ) -> VideoQCReport:
+        """Run QC on a video against its reference product image.
+
+        With a QC memo and GCS configured, re-scoring a video URI that was
+        already scored against the same reference content skips Gemini.
+        """
+        key = self._video_memo_key(video_uri, reference_uri)
+        if key:
+            memoized = self.memo.get(key)
+            if memoized is not None:
+                logger.info("Video QC memo hit for %s", video_uri)
+                return VideoQCReport.model_validate(memoized)
+
         raw = await self.gemini.qc_video(
             video_uri=video_uri,
             reference_image_uri=reference_uri,
+            run_id=run_id,
         )
+        report = self._video_report(raw)
+        if key:
+            self.memo.put(key, "video", report.model_dump())
+        return report
+
+    async def qc_video_and_rewrite(
+        self,
+        video_uri: str,
+        reference_uri: str,
+        prompt: str,
+        threshold: int | None = None,
+        run_id: str | None = None,
+    ) -> tuple[VideoQCReport, str | None]:
+        """QC a video and, if it fails, rewrite its *prompt* in the same call.
+
+        See ``qc_storyboard_and_rewrite``; the video QC memo applies the same
+        way.
+        """
+        if not self.settings.qc_fused_rewrite:
+            return await self.qc_video(video_uri, reference_uri, run_id=run_id), None
+
+        key = self._video_memo_key(video_uri, reference_uri)
+        if key:
+            memoized = self.memo.get(key)
+            if memoized is not None:
+                logger.info("Video QC memo hit for %s", video_uri)
+                return VideoQCReport.model_validate(memoized), None
+
+        raw = await self.gemini.qc_video(
+            video_uri=video_uri,
+            reference_image_uri=reference_uri,
+            run_id=run_id,
+            rewrite_prompt=prompt,
+            threshold=threshold,
+        )
+        report = self._video_report(raw)
+        if key:
+            self.memo.put(key, "video", report.model_dump())
+        if self.video_passes_qc(report, threshold):
+            return report, None
+        return report, self._rewritten(raw, "video")
+
+    async def qc_video_comparative(
+        self, video_uris: list[str], reference_uri: str, run_id: str | None = None
+    ) -> tuple[list[VideoQCReport], list[int]]:
+        """Score and rank all variants of a scene side by side in one request.
+
+        Returns the per-variant reports (input order) and the ranking as
+        variant indices, best first.
+        """
+        raw = await self.gemini.qc_video_comparative(
+            video_uris=video_uris,
+            reference_image_uri=reference_uri,
+            run_id=run_id,
+        )
+        logger.info(
+            "Comparative QC ranked %d variants %s: %s",
+            len(video_uris), raw["ranking"], raw["ranking_reasoning"],
+        )
+        return [self._video_report(r) for r in raw["reports"]], raw["ranking"]
+
+    @staticmethod
+    def _video_report(raw: dict) -> VideoQCReport:
         return VideoQCReport(
             technical_distortion=VideoQCDimension(**raw["technical_distortion"]),
             cinematic_imperfections=VideoQCDimension(**raw["cinematic_imperfections"]),
@@ -53,6 +344,23 @@ class QCService:
             overall_verdict=raw.get("overall_verdict", ""),
         )
 
+    def _video_memo_key(self, video_uri: str, reference_uri: str) -> str | None:
+        # No GCS round trip: Veo writes every output under a new operation
+        # path, so the video URI identifies its content, and the reference
+        # image's content hash comes from the upload index
+        if not (self.memo and self.gcs):
+            return None
+        reference_sha = self.gcs.content_sha256(reference_uri)
+        if reference_sha is None:
+            return None
+        return cache_key(
+            kind="video",
+            video=video_uri,
+            reference=reference_sha,
+            prompt_version=VIDEO_QC_PROMPT_VERSION,
+            model=self.settings.gemini_flash_model,
+        )
+
     def storyboard_passes_qc(
         self,
         report: StoryboardQCReport,
@@ -127,7 +435,11 @@ class QCService:
         return await self.gemini.rewrite_prompt(original_prompt, qc_feedback)
 
     def select_best_video_variant(self, variants: list[VideoVariant]) -> int:
-        """Select the best video variant using weighted scoring.
+        """Select the best video variant.
+
+        When every scored variant carries a ``qc_rank`` from comparative QC,
+        the model's side-by-side ranking is used directly.  Otherwise the
+        variants are compared by weighted scoring.
 
         Weights (sum to 1.0):
           avatar_consistency       * 0.20
@@ -140,6 +452,10 @@ class QCService:
 
         Returns index of the best variant.
         """
+        scored = [v for v in variants if v.qc_report is not None]
+        if scored and all(v.qc_rank is not None for v in scored):
+            return min(scored, key=lambda v: v.qc_rank).index
+
         best_idx = 0
         best_score = -1.0
 
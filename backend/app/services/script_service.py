@@ -1,11 +1,15 @@
+import hashlib
 import json
 import logging
+import time
 import uuid
 from pathlib import Path
+from typing import Callable
 
 import httpx
 
 from app.ai.gemini import GeminiService
+from app.ai.prompts import SCRIPT_PROMPT_VERSION
 from app.config import Settings
 from app.models.script import (
     AvatarProfile,
@@ -16,26 +20,45 @@ from app.models.script import (
     VideoScript,
 )
 from app.storage.local import LocalStorage
+from app.storage.response_cache import ResponseCache, cache_key
 
 logger = logging.getLogger(__name__)
 
 
 class ScriptService:
-    def __init__(self, gemini: GeminiService, storage: LocalStorage, settings: Settings):
+    def __init__(
+        self,
+        gemini: GeminiService,
+        storage: LocalStorage,
+        settings: Settings,
+        cache: ResponseCache | None = None,
+    ):
         self.gemini = gemini
         self.storage = storage
         self.settings = settings
+        self.cache = cache
 
-    async def generate_script(self, request: ScriptRequest) -> ScriptResponse:
+    async def generate_script(
+        self,
+        request: ScriptRequest,
+        on_partial: Callable[[str, dict], None] | None = None,
+    ) -> ScriptResponse:
         """Generate a video script from product details and image.
 
         1. Generate unique run_id
         2. Load product image (local path or HTTP download)
         3. Save product image locally
-        4. Call Gemini to generate script
+        4. Call Gemini to generate script (or reuse a cached response for
+           identical inputs when request.use_cache is set)
         5. Parse into VideoScript model
         6. Save script.json
         7. Return ScriptResponse
+
+        *on_partial* is called with ``("avatar_profile", profile)`` and
+        ``("scene", scene)`` for each part of the script.  With
+        script_streaming enabled they arrive while Gemini is still writing
+        the rest of the script; otherwise (and on cache hits) right after
+        the full response.
         """
         run_id = request.run_id or uuid.uuid4().hex[:12]
 
@@ -72,18 +95,67 @@ class ScriptService:
         # Compute target duration from scene count (Veo generates 8s clips)
         target_duration = request.scene_count * 8
 
-        # Generate script via Gemini
-        raw_script = await self.gemini.generate_script(
+        script_params = dict(
             product_name=request.product_name,
             specs=request.specifications,
-            image_bytes=image_bytes,
             scene_count=request.scene_count,
             target_duration=target_duration,
             ad_tone=request.ad_tone,
-            model_id=request.gemini_model,
             max_words=request.max_dialogue_words_per_scene,
             custom_instructions=request.custom_instructions,
         )
+        image_sha256 = hashlib.sha256(image_bytes).hexdigest()
+
+        def script_key(model: str) -> str:
+            return cache_key(
+                image_sha256=image_sha256,
+                model=model,
+                prompt_version=SCRIPT_PROMPT_VERSION,
+                **script_params,
+            )
+
+        raw_script = None
+        use_cache = self.cache is not None and request.use_cache
+        if use_cache:
+            start = time.perf_counter()
+            model = request.gemini_model or self.settings.gemini_model
+            raw_script = self.cache.get(script_key(model))
+            if raw_script is not None:
+                logger.info(
+                    "Script cache hit for run_id=%s (%.1fms)",
+                    run_id, (time.perf_counter() - start) * 1000,
+                )
+
+        cached = raw_script is not None
+        streamed = False
+        if not cached:
+            on_event = None
+            if on_partial and self.settings.script_streaming:
+                streamed = True
+                start = time.perf_counter()
+
+                def on_event(event: tuple) -> None:
+                    if event[:2] == ("field", "avatar_profile"):
+                        logger.info(
+                            "Avatar profile streamed for run_id=%s after %.1fs",
+                            run_id, time.perf_counter() - start,
+                        )
+                        on_partial("avatar_profile", event[2])
+                    elif event[:2] == ("item", "scenes"):
+                        on_partial("scene", event[3])
+
+            # Generate script via Gemini
+            raw_script, model_used = await self.gemini.generate_script(
+                image_bytes=image_bytes,
+                model_id=request.gemini_model,
+                run_id=run_id,
+                on_event=on_event,
+                **script_params,
+            )
+        if on_partial and not streamed:
+            on_partial("avatar_profile", raw_script["avatar_profile"])
+            for scene in raw_script["scenes"]:
+                on_partial("scene", scene)
 
         # Parse into VideoScript model
         avatar_profile = AvatarProfile(**raw_script["avatar_profile"])
@@ -95,6 +167,11 @@ class ScriptService:
             scenes=scenes,
         )
 
+        # Only cache responses that parsed into a valid script, under the
+        # model that actually wrote it (a breaker fallback gets its own key)
+        if use_cache and not cached:
+            self.cache.put(script_key(model_used), raw_script)
+
         # Save script.json
         script_json = script.model_dump()
         self.storage.save_bytes(
@@ -109,6 +186,7 @@ class ScriptService:
             run_id=run_id,
             product_image_path=self.storage.to_url_path(product_image_path),
             script=script,
+            cached=cached,
         )
 
     async def update_script(self, run_id: str, script: VideoScript) -> ScriptResponse:
@@ -1,3 +1,5 @@
+import asyncio
+import hashlib
 import logging
 import re
 from pathlib import Path
@@ -8,6 +10,7 @@ from app.utils.ffmpeg import (
     concat_videos,
     concat_videos_with_transitions,
     normalize_audio,
+    preprocess_video,
 )
 
 logger = logging.getLogger(__name__)
@@ -24,9 +27,10 @@ class StitchService:
 
         1. Check ffmpeg availability
         2. Collect selected_video.mp4 files sorted by scene number
-        3. Concatenate with crossfade transitions
-        4. Normalize audio
-        5. Save to output/{run_id}/final/commercial.mp4
+        3. Bring each to CFR, reusing copies made by prepare_scene
+        4. Concatenate with crossfade transitions
+        5. Normalize audio
+        6. Save to output/{run_id}/final/commercial.mp4
         """
         if not check_ffmpeg():
             raise RuntimeError("ffmpeg is not installed or not found on PATH")
@@ -61,11 +65,15 @@ class StitchService:
         raw_output = str(final_dir / "commercial_raw.mp4")
         final_output = str(final_dir / "commercial.mp4")
 
+        cfr_paths = await asyncio.gather(*(self._cfr_copy(Path(p)) for p in video_paths))
+
         # Concatenate videos — use per-scene transitions if available
         if transitions:
-            await concat_videos_with_transitions(video_paths, raw_output, transitions)
+            await concat_videos_with_transitions(
+                cfr_paths, raw_output, transitions, preprocessed=True
+            )
         else:
-            await concat_videos(video_paths, raw_output)
+            await concat_videos(cfr_paths, raw_output, preprocessed=True)
 
         # Normalize audio
         await normalize_audio(raw_output, final_output)
@@ -77,3 +85,42 @@ class StitchService:
 
         logger.info("Stitched %d scenes into %s", len(video_paths), final_output)
         return self.storage.to_url_path(final_output)
+
+    async def prepare_scene(self, run_id: str, scene_number: int) -> str:
+        """CFR-encode a scene's selected video ahead of stitching.
+
+        Called as soon as the scene's variant is selected, so the per-clip
+        re-encode overlaps with the other scenes' generation instead of
+        running at stitch time.
+        """
+        if not check_ffmpeg():
+            raise RuntimeError("ffmpeg is not installed or not found on PATH")
+        video_file = self.storage.get_path(
+            run_id, "selected_video.mp4", subdir=f"scenes/scene_{scene_number}"
+        )
+        return await self._cfr_copy(video_file)
+
+    @staticmethod
+    async def _cfr_copy(video_file: Path) -> str:
+        """Path of a CFR copy of *video_file*, re-encoding unless one exists.
+
+        Copies are named after the source's content hash, so selecting a
+        different variant (copied with its original mtime) is never served
+        a stale copy.
+        """
+        digest = await asyncio.to_thread(_file_digest, video_file)
+        cfr_file = video_file.with_name(f"{video_file.stem}_cfr_{digest[:12]}.mp4")
+        if cfr_file.exists():
+            return str(cfr_file)
+        for stale in video_file.parent.glob(f"{video_file.stem}_cfr_*.mp4"):
+            stale.unlink(missing_ok=True)
+        # Write beside the target so a stitch never reads a partial copy
+        tmp_file = video_file.with_name(f"{video_file.stem}_cfr.tmp.mp4")
+        await preprocess_video(str(video_file), str(tmp_file))
+        tmp_file.replace(cfr_file)
+        return str(cfr_file)
+
+
+def _file_digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
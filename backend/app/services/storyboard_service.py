@@ -120,64 +120,71 @@ class StoryboardService:
         best_prompt = prompt
         regen_attempts = 0
 
-        for attempt in range(effective_max_regen + 1):
-            # Generate storyboard image
-            image_bytes = await self.gemini_image.generate_storyboard_image(
-                prompt=prompt,
-                avatar_bytes=avatar_bytes,
-                product_bytes=product_bytes,
-                image_model=image_model,
-                aspect_ratio=aspect_ratio,
-                image_size=image_size,
-            )
-
-            # Run QC
-            qc_report = await self.qc.qc_storyboard(
-                avatar_bytes=avatar_bytes,
-                product_bytes=product_bytes,
-                storyboard_bytes=image_bytes,
-            )
-
-            # Keep track of best result
-            if best_qc_report is None or (
-                qc_report.avatar_validation.score + qc_report.product_validation.score
-                > best_qc_report.avatar_validation.score + best_qc_report.product_validation.score
-            ):
-                best_image_bytes = image_bytes
-                best_qc_report = qc_report
-                best_prompt = prompt
-
-            if self.qc.storyboard_passes_qc(
-                qc_report,
-                threshold=qc_threshold,
-                include_composition=include_composition_qc,
-            ):
-                logger.info(
-                    "Scene %d passed QC on attempt %d",
-                    scene.scene_number,
-                    attempt + 1,
+        with self.qc.storyboard_loop(run_id):
+            for attempt in range(effective_max_regen + 1):
+                # Generate storyboard image
+                image_bytes = await self.gemini_image.generate_storyboard_image(
+                    prompt=prompt,
+                    avatar_bytes=avatar_bytes,
+                    product_bytes=product_bytes,
+                    image_model=image_model,
+                    aspect_ratio=aspect_ratio,
+                    image_size=image_size,
+                    run_id=run_id,
                 )
-                break
-
-            if attempt < effective_max_regen:
-                regen_attempts += 1
-                logger.info(
-                    "Scene %d failed QC (avatar=%d, product=%d), regenerating (attempt %d/%d)",
-                    scene.scene_number,
-                    qc_report.avatar_validation.score,
-                    qc_report.product_validation.score,
-                    regen_attempts,
-                    effective_max_regen,
+
+                # Run QC; unless this is the last attempt, a failing verdict
+                # can come back with the rewritten prompt in the same call
+                qc_report, rewritten = await self.qc.qc_storyboard_and_rewrite(
+                    avatar_bytes=avatar_bytes,
+                    product_bytes=product_bytes,
+                    storyboard_bytes=image_bytes,
+                    prompt=prompt if attempt < effective_max_regen else None,
+                    threshold=qc_threshold,
+                    include_composition=include_composition_qc,
+                    run_id=run_id,
                 )
-                # Rewrite prompt with QC feedback
-                prompt = await self.qc.rewrite_prompt(prompt, qc_report)
 
-                if on_progress:
-                    on_progress({
-                        "scene_number": scene.scene_number,
-                        "event": "regen_attempt",
-                        "attempt": regen_attempts,
-                    })
+                # Keep track of best result
+                if best_qc_report is None or (
+                    qc_report.avatar_validation.score + qc_report.product_validation.score
+                    > best_qc_report.avatar_validation.score + best_qc_report.product_validation.score
+                ):
+                    best_image_bytes = image_bytes
+                    best_qc_report = qc_report
+                    best_prompt = prompt
+
+                if self.qc.storyboard_passes_qc(
+                    qc_report,
+                    threshold=qc_threshold,
+                    include_composition=include_composition_qc,
+                ):
+                    logger.info(
+                        "Scene %d passed QC on attempt %d",
+                        scene.scene_number,
+                        attempt + 1,
+                    )
+                    break
+
+                if attempt < effective_max_regen:
+                    regen_attempts += 1
+                    logger.info(
+                        "Scene %d failed QC (avatar=%d, product=%d), regenerating (attempt %d/%d)",
+                        scene.scene_number,
+                        qc_report.avatar_validation.score,
+                        qc_report.product_validation.score,
+                        regen_attempts,
+                        effective_max_regen,
+                    )
+                    # Rewrite prompt with QC feedback
+                    prompt = rewritten or await self.qc.rewrite_prompt(prompt, qc_report)
+
+                    if on_progress:
+                        on_progress({
+                            "scene_number": scene.scene_number,
+                            "event": "regen_attempt",
+                            "attempt": regen_attempts,
+                        })
 
         # Save the best image
         image_path = self.storage.save_bytes(
@@ -218,7 +225,11 @@ class StoryboardService:
         custom_prompt: str | None = None,
         image_size: str = "2K",
     ) -> StoryboardResult:
-        """Regenerate a single scene's storyboard image."""
+        """Generate or regenerate a single scene's storyboard image.
+
+        Unlike generate_storyboard there is no concurrency bound; callers
+        scheduling several scenes bound them themselves.
+        """
         return await self._process_single_scene(
             run_id=run_id,
             scene=scene,
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import random
+import time
 from typing import Callable
 
 from app.ai.prompts import VIDEO_PROMPT_TEMPLATE_IMAGE, VIDEO_PROMPT_TEMPLATE_REFERENCE
@@ -8,11 +9,18 @@ from app.ai.veo import VeoService
 from app.config import Settings
 from app.models.script import AvatarProfile, Scene
 from app.models.storyboard import StoryboardResult
-from app.models.video import VideoQCReport, VideoResponse, VideoResult, VideoVariant
+from app.models.video import (
+    VideoQCReport,
+    VideoResponse,
+    VideoResult,
+    VideoTiming,
+    VideoVariant,
+)
 from app.services.qc_service import QCService
 from app.storage.gcs import GCSStorage
 from app.storage.local import LocalStorage
-from app.utils.ffmpeg import extract_last_frame
+from app.storage.variants import VariantStore
+from app.utils.ffmpeg import extract_first_frame, extract_last_frame, frame_similarity
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +32,14 @@ class VideoService:
         gcs: GCSStorage,
         qc: QCService,
         storage: LocalStorage,
+        variants: VariantStore,
         settings: Settings,
     ):
         self.veo = veo
         self.gcs = gcs
         self.qc = qc
         self.storage = storage
+        self.variants = variants
         self.settings = settings
 
     async def generate_videos(
@@ -51,10 +61,90 @@ class VideoService:
         use_reference_images: bool = True,
         negative_prompt_extra: str = "",
         generate_audio: bool = True,
+        continuity_mode: str | None = None,
     ) -> VideoResponse:
         """Generate video variants for all scenes with QC and auto-selection.
 
-        Uses bounded concurrency via asyncio.Semaphore.
+        continuity_mode picks between strict last-frame chaining ("strict")
+        and speculative all-at-once generation with continuity repair
+        ("parallel"); see _generate_chained and _generate_parallel.
+        """
+        mode, scene_kwargs = self.scene_plan(
+            run_id=run_id,
+            script_scenes=script_scenes,
+            avatar_profile=avatar_profile,
+            on_progress=on_progress,
+            num_variants=num_variants,
+            seed=seed,
+            resolution=resolution,
+            veo_model=veo_model,
+            aspect_ratio=aspect_ratio,
+            duration_seconds=duration_seconds,
+            compression_quality=compression_quality,
+            qc_threshold=qc_threshold,
+            max_qc_regen_attempts=max_qc_regen_attempts,
+            use_reference_images=use_reference_images,
+            negative_prompt_extra=negative_prompt_extra,
+            generate_audio=generate_audio,
+            continuity_mode=continuity_mode,
+        )
+
+        # Build a lookup from scene_number -> Scene
+        scene_lookup = {s.scene_number: s for s in script_scenes}
+        sorted_scenes = sorted(scenes_data, key=lambda s: s.scene_number)
+
+        started = time.monotonic()
+        if mode == "parallel":
+            results, scene_seconds, regen_scenes = await self._generate_parallel(
+                run_id, sorted_scenes, scene_lookup, scene_kwargs,
+            )
+        else:
+            results, scene_seconds = await self._generate_chained(
+                run_id, sorted_scenes, scene_lookup, scene_kwargs,
+            )
+            regen_scenes = []
+        wall_clock = time.monotonic() - started
+
+        serial_seconds = sum(scene_seconds.values())
+        timing = VideoTiming(
+            continuity_mode=mode,
+            wall_clock_seconds=round(wall_clock, 2),
+            scene_seconds={n: round(t, 2) for n, t in scene_seconds.items()},
+            serial_seconds=round(serial_seconds, 2),
+            saved_seconds=round(max(0.0, serial_seconds - wall_clock), 2),
+            continuity_regen_scenes=regen_scenes,
+        )
+        logger.info(
+            "Video generation (%s) finished in %.0fs (serial %.0fs, %d continuity regens)",
+            mode, wall_clock, serial_seconds, len(regen_scenes),
+        )
+        return VideoResponse(results=results, timing=timing)
+
+    def scene_plan(
+        self,
+        run_id: str,
+        script_scenes: list[Scene],
+        avatar_profile: AvatarProfile,
+        on_progress: Callable | None = None,
+        num_variants: int | None = None,
+        seed: int | None = None,
+        resolution: str = "720p",
+        veo_model: str | None = None,
+        aspect_ratio: str = "9:16",
+        duration_seconds: int = 8,
+        compression_quality: str = "optimized",
+        qc_threshold: int | None = None,
+        max_qc_regen_attempts: int = 2,
+        use_reference_images: bool = True,
+        negative_prompt_extra: str = "",
+        generate_audio: bool = True,
+        continuity_mode: str | None = None,
+    ) -> tuple[str, dict]:
+        """Run-level preparation shared by every scene of a run.
+
+        Normalizes avatar descriptions across scenes, fixes the Veo seed and
+        resolves the continuity mode.  Returns the mode and the keyword
+        arguments for ``generate_scene``.
         """
         # Validate avatar description consistency across scenes
         descriptions = {
@@ -78,71 +168,224 @@ class VideoService:
             logger.info("Auto-generated Veo seed: %d", seed)
 
         effective_variants = num_variants or self.settings.max_video_variants
-        semaphore = asyncio.Semaphore(self.settings.max_concurrent_scenes)
+        mode = continuity_mode or self.settings.video_continuity_mode
+        if mode not in ("strict", "parallel"):
+            raise ValueError(f"Unknown continuity mode: {mode}")
 
-        # Build a lookup from scene_number -> Scene
-        scene_lookup = {s.scene_number: s for s in script_scenes}
+        scene_kwargs = dict(
+            run_id=run_id,
+            avatar_profile=avatar_profile,
+            on_progress=on_progress,
+            num_variants=effective_variants,
+            seed=seed,
+            resolution=resolution,
+            veo_model=veo_model,
+            aspect_ratio=aspect_ratio,
+            duration_seconds=duration_seconds,
+            compression_quality=compression_quality,
+            qc_threshold=qc_threshold,
+            max_qc_regen_attempts=max_qc_regen_attempts,
+            use_reference_images=use_reference_images,
+            negative_prompt_extra=negative_prompt_extra,
+            generate_audio=generate_audio,
+        )
+        return mode, scene_kwargs
 
-        # Process scenes sequentially so we can extract the last frame of
-        # each scene and pass it as an asset reference to the next scene,
-        # maintaining visual continuity across the ad.
-        sorted_scenes = sorted(scenes_data, key=lambda s: s.scene_number)
-        results: list[VideoResult] = []
+    async def _generate_chained(
+        self,
+        run_id: str,
+        sorted_scenes: list[StoryboardResult],
+        scene_lookup: dict[int, Scene],
+        scene_kwargs: dict,
+    ) -> tuple[list[VideoResult], dict[int, float]]:
+        """Strict continuity: each scene uses the previous scene's last frame.
+
+        Scene N+1 starts as soon as scene N has chosen its winning variant;
+        scene N's remaining bookkeeping finishes in the background.
+        """
+        loop = asyncio.get_running_loop()
+        tasks: list[asyncio.Task] = []
         prev_last_frame_gcs: str | None = None
 
-        for sb_result in sorted_scenes:
-            scene = scene_lookup[sb_result.scene_number]
-            result = await self._process_single_scene(
-                run_id=run_id,
-                sb_result=sb_result,
-                scene=scene,
-                avatar_profile=avatar_profile,
-                on_progress=on_progress,
-                num_variants=effective_variants,
-                seed=seed,
-                resolution=resolution,
-                veo_model=veo_model,
-                aspect_ratio=aspect_ratio,
-                duration_seconds=duration_seconds,
-                compression_quality=compression_quality,
-                qc_threshold=qc_threshold,
-                max_qc_regen_attempts=max_qc_regen_attempts,
-                use_reference_images=use_reference_images,
-                negative_prompt_extra=negative_prompt_extra,
-                prev_scene_last_frame_gcs=prev_last_frame_gcs,
-                generate_audio=generate_audio,
-            )
-            results.append(result)
-
-            # Extract last frame from the selected video for next scene
-            try:
-                selected_video_local = str(self.storage.get_path(
-                    run_id,
-                    f"variant_{result.selected_index}.mp4",
-                    subdir=f"scenes/scene_{sb_result.scene_number}/video_variants",
-                ))
-                last_frame_local = str(self.storage.get_path(
-                    run_id,
-                    "last_frame.png",
-                    subdir=f"scenes/scene_{sb_result.scene_number}",
+        try:
+            for sb_result in sorted_scenes:
+                selected: asyncio.Future = loop.create_future()
+                task = asyncio.create_task(self.generate_scene(
+                    sb_result,
+                    scene_lookup[sb_result.scene_number],
+                    scene_kwargs,
+                    prev_scene_last_frame_gcs=prev_last_frame_gcs,
+                    on_variant_selected=selected.set_result,
                 ))
-                await extract_last_frame(selected_video_local, last_frame_local)
-                gcs_path = f"pipeline/{run_id}/scenes/scene_{sb_result.scene_number}/last_frame.png"
-                prev_last_frame_gcs = await asyncio.to_thread(
-                    self.gcs.upload_file, last_frame_local, gcs_path,
+                tasks.append(task)
+
+                await asyncio.wait({selected, task}, return_when=asyncio.FIRST_COMPLETED)
+                if not selected.done():
+                    task.result()  # re-raise the scene failure
+                    selected.set_result(self.selected_video_path(run_id, sb_result.scene_number))
+
+                prev_last_frame_gcs = await self.upload_last_frame(
+                    run_id, sb_result.scene_number, selected.result(),
                 )
-                logger.info(
-                    "Scene %d: extracted last frame → %s",
-                    sb_result.scene_number, prev_last_frame_gcs,
+
+            timed = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        results = [result for result, _ in timed]
+        scene_seconds = {result.scene_number: secs for result, secs in timed}
+        return results, scene_seconds
+
+    async def _generate_parallel(
+        self,
+        run_id: str,
+        sorted_scenes: list[StoryboardResult],
+        scene_lookup: dict[int, Scene],
+        scene_kwargs: dict,
+    ) -> tuple[list[VideoResult], dict[int, float], list[int]]:
+        """Speculative mode: start every scene at once without last-frame refs.
+
+        Afterwards walk the scenes in order and regenerate only those whose
+        first frame fails the continuity check against the previous scene's
+        real last frame.
+        """
+        semaphore = asyncio.Semaphore(self.settings.max_concurrent_scenes)
+
+        async def run_scene(sb_result: StoryboardResult) -> tuple[VideoResult, float]:
+            async with semaphore:
+                return await self.generate_scene(
+                    sb_result, scene_lookup[sb_result.scene_number], scene_kwargs,
                 )
-            except Exception as exc:
-                logger.warning(
-                    "Scene %d: failed to extract last frame: %s",
-                    sb_result.scene_number, exc,
+
+        timed = await asyncio.gather(*(run_scene(sb) for sb in sorted_scenes))
+        results = [result for result, _ in timed]
+        scene_seconds = {result.scene_number: secs for result, secs in timed}
+        regen_scenes: list[int] = []
+
+        # Last frames only feed Veo as asset references
+        if not scene_kwargs["use_reference_images"]:
+            return results, scene_seconds, regen_scenes
+
+        prev_last_frame_gcs: str | None = None
+        for i, sb_result in enumerate(sorted_scenes):
+            scene_num = sb_result.scene_number
+            if prev_last_frame_gcs:
+                repaired = await self.repair_continuity(
+                    sb_result,
+                    scene_lookup[scene_num],
+                    scene_kwargs,
+                    prev_scene_number=sorted_scenes[i - 1].scene_number,
+                    prev_last_frame_gcs=prev_last_frame_gcs,
                 )
-                prev_last_frame_gcs = None
+                if repaired:
+                    regen_scenes.append(scene_num)
+                    results[i], secs = repaired
+                    scene_seconds[scene_num] += secs
+
+            prev_last_frame_gcs = await self.upload_last_frame(
+                run_id, scene_num, self.selected_video_path(run_id, scene_num),
+            )
+
+        return results, scene_seconds, regen_scenes
+
+    async def generate_scene(
+        self,
+        sb_result: StoryboardResult,
+        scene: Scene,
+        scene_kwargs: dict,
+        prev_scene_last_frame_gcs: str | None = None,
+        on_variant_selected: Callable[[str], None] | None = None,
+    ) -> tuple[VideoResult, float]:
+        """Generate, QC and select one scene's video; returns it with its duration.
 
-        return VideoResponse(results=results)
+        *scene_kwargs* comes from ``scene_plan``.
+        """
+        started = time.monotonic()
+        result = await self._process_single_scene(
+            sb_result=sb_result,
+            scene=scene,
+            prev_scene_last_frame_gcs=prev_scene_last_frame_gcs,
+            on_variant_selected=on_variant_selected,
+            **scene_kwargs,
+        )
+        return result, time.monotonic() - started
+
+    async def repair_continuity(
+        self,
+        sb_result: StoryboardResult,
+        scene: Scene,
+        scene_kwargs: dict,
+        prev_scene_number: int,
+        prev_last_frame_gcs: str,
+    ) -> tuple[VideoResult, float] | None:
+        """Regenerate a parallel-mode scene whose opening breaks continuity.
+
+        Compares the scene's first frame with the previous scene's last frame
+        and, below ``continuity_ssim_threshold``, regenerates it with that
+        frame as a reference.  Returns None when the scene is kept.
+        """
+        run_id, scene_num = scene_kwargs["run_id"], sb_result.scene_number
+        score = await self._continuity_score(run_id, prev_scene_number, scene_num)
+        if score is None or score >= self.settings.continuity_ssim_threshold:
+            return None
+        logger.info(
+            "Scene %d: continuity check failed (ssim=%.2f < %.2f), regenerating "
+            "with scene %d last frame",
+            scene_num, score, self.settings.continuity_ssim_threshold, prev_scene_number,
+        )
+        return await self.generate_scene(
+            sb_result, scene, scene_kwargs, prev_scene_last_frame_gcs=prev_last_frame_gcs,
+        )
+
+    def selected_video_path(self, run_id: str, scene_number: int) -> str:
+        return str(self.storage.get_path(
+            run_id, "selected_video.mp4", subdir=f"scenes/scene_{scene_number}",
+        ))
+
+    async def upload_last_frame(
+        self, run_id: str, scene_number: int, video_local: str
+    ) -> str | None:
+        """Extract a scene's last frame and upload it for the next scene's references."""
+        try:
+            last_frame_local = str(self.storage.get_path(
+                run_id, "last_frame.png", subdir=f"scenes/scene_{scene_number}",
+            ))
+            await extract_last_frame(video_local, last_frame_local)
+            gcs_path = f"pipeline/{run_id}/scenes/scene_{scene_number}/last_frame.png"
+            last_frame_gcs = await asyncio.to_thread(
+                self.gcs.upload_file_cached, last_frame_local, gcs_path, run_id,
+            )
+            logger.info(
+                "Scene %d: extracted last frame → %s", scene_number, last_frame_gcs,
+            )
+            return last_frame_gcs
+        except Exception as exc:
+            logger.warning(
+                "Scene %d: failed to extract last frame: %s", scene_number, exc,
+            )
+            return None
+
+    async def _continuity_score(
+        self, run_id: str, prev_scene_number: int, scene_number: int
+    ) -> float | None:
+        """SSIM between the previous scene's last frame and this scene's first frame."""
+        prev_last_frame = str(self.storage.get_path(
+            run_id, "last_frame.png", subdir=f"scenes/scene_{prev_scene_number}",
+        ))
+        first_frame = str(self.storage.get_path(
+            run_id, "first_frame.png", subdir=f"scenes/scene_{scene_number}",
+        ))
+        try:
+            await extract_first_frame(self.selected_video_path(run_id, scene_number), first_frame)
+            return await frame_similarity(prev_last_frame, first_frame)
+        except Exception as exc:
+            logger.warning(
+                "Scene %d: continuity check failed to run, keeping scene: %s",
+                scene_number, exc,
+            )
+            return None
 
     async def _process_single_scene(
         self,
@@ -165,8 +408,13 @@ class VideoService:
         prev_scene_last_frame_gcs: str | None = None,
         generate_audio: bool = True,
         previous_qc_report: "VideoQCReport | None" = None,
+        on_variant_selected: Callable[[str], None] | None = None,
     ) -> VideoResult:
-        """Process a single scene: upload to GCS, generate videos, QC, select best."""
+        """Process a single scene: upload to GCS, generate videos, QC, select best.
+
+        on_variant_selected is called with the local path of the winning
+        variant as soon as selection is final, before bookkeeping.
+        """
         effective_variants = num_variants or self.settings.max_video_variants
         scene_num = sb_result.scene_number
 
@@ -183,10 +431,11 @@ class VideoService:
         avatar_local = str(self.storage.get_path(run_id, "avatar_selected.png"))
         gcs_avatar_path = f"pipeline/{run_id}/avatar_selected.png"
 
+        # Content-addressed: unchanged product/avatar images are not re-uploaded
         storyboard_gcs_uri, product_gcs_uri, avatar_gcs_uri = await asyncio.gather(
-            asyncio.to_thread(self.gcs.upload_file, storyboard_local, gcs_storyboard_path),
-            asyncio.to_thread(self.gcs.upload_file, product_local, gcs_product_path),
-            asyncio.to_thread(self.gcs.upload_file, avatar_local, gcs_avatar_path),
+            asyncio.to_thread(self.gcs.upload_file_cached, storyboard_local, gcs_storyboard_path, run_id),
+            asyncio.to_thread(self.gcs.upload_file_cached, product_local, gcs_product_path, run_id),
+            asyncio.to_thread(self.gcs.upload_file_cached, avatar_local, gcs_avatar_path, run_id),
         )
 
         # Build asset reference image list for Veo character/product consistency
@@ -260,42 +509,12 @@ class VideoService:
             generate_audio=generate_audio,
         )
 
-        # 4. Download all variants from GCS to local in parallel
-        local_paths = []
-        for i in range(len(video_gcs_uris)):
-            local_path = self.storage.get_path(
-                run_id,
-                f"variant_{i}.mp4",
-                subdir=f"scenes/scene_{scene_num}/video_variants",
-            )
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            local_paths.append(local_path)
-        await asyncio.gather(*(
-            asyncio.to_thread(self.gcs.download_to_local, uri, str(lp))
-            for uri, lp in zip(video_gcs_uris, local_paths)
-        ))
-        variants: list[VideoVariant] = [
-            VideoVariant(index=i, video_path=self.storage.to_url_path(str(lp)))
-            for i, lp in enumerate(local_paths)
-        ]
-
-        # 5. Run QC on all variants in parallel
-        qc_tasks = [
-            self.qc.qc_video(video_uri=video_gcs_uris[i], reference_uri=product_gcs_uri)
-            for i in range(len(variants))
-        ]
-        qc_results = await asyncio.gather(*qc_tasks, return_exceptions=True)
-        for i, result in enumerate(qc_results):
-            if isinstance(result, Exception):
-                logger.warning(
-                    "Video QC failed for scene %d variant %d: %s",
-                    scene_num, i, result,
-                )
-            else:
-                variants[i].qc_report = result
-
-        # 6. Auto-select best variant
-        selected_idx = self.qc.select_best_video_variant(variants)
+        # 4-6. Stream each variant into QC, re-selecting the leader as each
+        # QC report arrives
+        variants, selected_idx, rewrites = await self._stream_variants(
+            run_id, scene_num, video_gcs_uris, product_gcs_uri, qc_threshold, on_progress,
+            rewrite_prompt=prompt if max_qc_regen_attempts > 0 else None,
+        )
 
         # 7. QC feedback loop: if best variant fails QC, rewrite prompt and regenerate
         regen_attempts = 0
@@ -316,7 +535,9 @@ class VideoService:
                     feedback = self.qc.build_video_qc_feedback(selected_variant.qc_report)
                     regen_ctx = f"QC regen attempt {regen_attempts}:\n{feedback}"
                     qc_rewrite_context = f"{qc_rewrite_context}\n\n{regen_ctx}" if qc_rewrite_context else regen_ctx
-                    prompt = await self.qc.rewrite_video_prompt(prompt, selected_variant.qc_report)
+                    prompt = rewrites.get(selected_idx) or await self.qc.rewrite_video_prompt(
+                        prompt, selected_variant.qc_report
+                    )
 
                 # Regenerate all variants with improved prompt
                 regen_output_uri = self.gcs.get_veo_output_uri(run_id) + f"scene_{scene_num}_regen{regen_round + 1}/"
@@ -336,49 +557,23 @@ class VideoService:
                     generate_audio=generate_audio,
                 )
 
-                # Download and replace variants in parallel
-                regen_local_paths = []
-                for i in range(len(video_gcs_uris)):
-                    local_path = self.storage.get_path(
-                        run_id,
-                        f"variant_{i}.mp4",
-                        subdir=f"scenes/scene_{scene_num}/video_variants",
-                    )
-                    local_path.parent.mkdir(parents=True, exist_ok=True)
-                    regen_local_paths.append(local_path)
-                await asyncio.gather(*(
-                    asyncio.to_thread(self.gcs.download_to_local, uri, str(lp))
-                    for uri, lp in zip(video_gcs_uris, regen_local_paths)
-                ))
-                variants = [
-                    VideoVariant(index=i, video_path=self.storage.to_url_path(str(lp)))
-                    for i, lp in enumerate(regen_local_paths)
-                ]
-
-                # Re-run QC in parallel
-                regen_qc_tasks = [
-                    self.qc.qc_video(video_uri=video_gcs_uris[i], reference_uri=product_gcs_uri)
-                    for i in range(len(variants))
-                ]
-                regen_qc_results = await asyncio.gather(*regen_qc_tasks, return_exceptions=True)
-                for i, result in enumerate(regen_qc_results):
-                    if isinstance(result, Exception):
-                        logger.warning(
-                            "Video QC failed for scene %d variant %d (regen %d): %s",
-                            scene_num, i, regen_round + 1, result,
-                        )
-                    else:
-                        variants[i].qc_report = result
-
-                # Re-select best
-                selected_idx = self.qc.select_best_video_variant(variants)
+                variants, selected_idx, rewrites = await self._stream_variants(
+                    run_id, scene_num, video_gcs_uris, product_gcs_uri, qc_threshold, on_progress,
+                    regen_round=regen_round + 1,
+                    rewrite_prompt=prompt if regen_round + 1 < max_qc_regen_attempts else None,
+                )
                 selected_variant = next((v for v in variants if v.index == selected_idx), variants[0])
 
-        # 8. Copy best to selected_video.mp4
-        source_local = str(self.storage.get_path(
-            run_id, f"variant_{selected_idx}.mp4",
-            subdir=f"scenes/scene_{scene_num}/video_variants",
-        ))
+        # 8. Materialize only the winner locally and copy it to selected_video.mp4;
+        # the other variants stay in GCS until someone asks for them
+        source_local = str(await self.variants.materialize(run_id, scene_num, selected_idx))
+        self.variants.pin(run_id, scene_num, selected_idx)
+        if on_variant_selected:
+            on_variant_selected(source_local)
+
+        for variant in variants:
+            if variant.index == selected_idx:
+                variant.video_path = self.storage.to_url_path(source_local)
         selected_path = self.storage.save_file(
             run_id=run_id,
             filename="selected_video.mp4",
@@ -410,6 +605,137 @@ class VideoService:
 
         return result
 
+    async def _stream_variants(
+        self,
+        run_id: str,
+        scene_num: int,
+        video_gcs_uris: list[str],
+        product_gcs_uri: str,
+        qc_threshold: int | None,
+        on_progress: Callable | None,
+        regen_round: int = 0,
+        rewrite_prompt: str | None = None,
+    ) -> tuple[list[VideoVariant], int, dict[int, str]]:
+        """Feed each Veo output URI into QC.
+
+        QC reads the GCS URI directly, so nothing is downloaded until the
+        selection is final.  QC reports are consumed as they complete,
+        re-running selection and emitting a ``variant_qc`` progress event
+        for each.  With early accept
+        enabled, remaining QC calls are cancelled once a variant clears the
+        threshold by ``video_qc_early_accept_margin`` on every dimension.
+
+        In ``comparative`` QC mode all variants are scored and ranked in one
+        request instead, falling back to per-variant QC if that call fails.
+
+        With *rewrite_prompt* (another regen round may follow), per-variant
+        QC uses the fused QC + rewrite call, so a failing leader already
+        carries the next round's prompt.
+
+        Returns the variants (non-winners point at the proxy URL), the
+        selected index and the rewritten prompts of failing variants keyed
+        by variant index.
+        """
+        self.variants.record_variants(run_id, scene_num, video_gcs_uris)
+        variants = [
+            VideoVariant(
+                index=i,
+                video_path=self.variants.proxy_url(run_id, scene_num, i),
+                gcs_uri=uri,
+            )
+            for i, uri in enumerate(video_gcs_uris)
+        ]
+        rewrites: dict[int, str] = {}
+
+        if self.settings.video_qc_mode == "comparative" and len(variants) > 1:
+            try:
+                reports, ranking = await self.qc.qc_video_comparative(
+                    video_uris=video_gcs_uris, reference_uri=product_gcs_uri, run_id=run_id
+                )
+            except Exception as exc:
+                logger.warning(
+                    "Comparative video QC failed for scene %d (round %d), "
+                    "falling back to per-variant QC: %s",
+                    scene_num, regen_round, exc,
+                )
+            else:
+                for i, report in enumerate(reports):
+                    variants[i].qc_report = report
+                for rank, i in enumerate(ranking, start=1):
+                    variants[i].qc_rank = rank
+                selected_idx = self.qc.select_best_video_variant(variants)
+                if on_progress:
+                    for variant in variants:
+                        on_progress({
+                            "scene_number": scene_num,
+                            "event": "variant_qc",
+                            "variant_index": variant.index,
+                            "regen_round": regen_round,
+                            "qc_report": variant.qc_report.model_dump(),
+                            "qc_rank": variant.qc_rank,
+                            "selected_index": selected_idx,
+                        })
+                return variants, selected_idx, rewrites
+
+        async def qc_one(i: int) -> tuple[int, VideoQCReport | Exception]:
+            try:
+                if rewrite_prompt is None:
+                    return i, await self.qc.qc_video(
+                        video_uri=video_gcs_uris[i], reference_uri=product_gcs_uri, run_id=run_id
+                    )
+                report, rewritten = await self.qc.qc_video_and_rewrite(
+                    video_uri=video_gcs_uris[i],
+                    reference_uri=product_gcs_uri,
+                    prompt=rewrite_prompt,
+                    threshold=qc_threshold,
+                    run_id=run_id,
+                )
+                if rewritten:
+                    rewrites[i] = rewritten
+                return i, report
+            except Exception as exc:
+                return i, exc
+
+        threshold = qc_threshold or self.settings.video_qc_threshold
+        early_accept_threshold = min(10, threshold + self.settings.video_qc_early_accept_margin)
+        qc_tasks = [asyncio.create_task(qc_one(i)) for i in range(len(variants))]
+        selected_idx = 0
+        try:
+            for next_done in asyncio.as_completed(qc_tasks):
+                i, result = await next_done
+                if isinstance(result, Exception):
+                    logger.warning(
+                        "Video QC failed for scene %d variant %d (round %d): %s",
+                        scene_num, i, regen_round, result,
+                    )
+                    continue
+                variants[i].qc_report = result
+                selected_idx = self.qc.select_best_video_variant(variants)
+                if on_progress:
+                    on_progress({
+                        "scene_number": scene_num,
+                        "event": "variant_qc",
+                        "variant_index": i,
+                        "regen_round": regen_round,
+                        "qc_report": result.model_dump(),
+                        "selected_index": selected_idx,
+                    })
+                if self.settings.video_qc_early_accept and self.qc.video_passes_qc(
+                    result, threshold=early_accept_threshold
+                ):
+                    pending = sum(1 for t in qc_tasks if not t.done())
+                    if pending:
+                        logger.info(
+                            "Scene %d: variant %d clearly passes QC, skipping %d pending QC calls",
+                            scene_num, i, pending,
+                        )
+                    break
+        finally:
+            for task in qc_tasks:
+                task.cancel()
+
+        return variants, selected_idx, rewrites
+
     async def regenerate_single_scene(
         self,
         run_id: str,
@@ -458,20 +784,11 @@ class VideoService:
     ) -> str:
         """Select a different video variant for a scene.
 
-        Copies the chosen variant to selected_video.mp4 and returns its URL path.
+        Downloads the variant from GCS if it was never materialized, copies
+        it to selected_video.mp4 and returns its URL path.
         """
-        source_local = str(self.storage.get_path(
-            run_id,
-            f"variant_{variant_index}.mp4",
-            subdir=f"scenes/scene_{scene_number}/video_variants",
-        ))
-        if not self.storage.get_path(
-            run_id, f"variant_{variant_index}.mp4",
-            subdir=f"scenes/scene_{scene_number}/video_variants",
-        ).exists():
-            raise FileNotFoundError(
-                f"Variant {variant_index} not found for scene {scene_number}"
-            )
+        source_local = str(await self.variants.materialize(run_id, scene_number, variant_index))
+        self.variants.pin(run_id, scene_number, variant_index)
 
         selected_path = self.storage.save_file(
             run_id=run_id,
@@ -1,4 +1,7 @@
 from app.storage.gcs import GCSStorage
 from app.storage.local import LocalStorage
+from app.storage.reference_assets import ReferenceAssetStore
+from app.storage.response_cache import ResponseCache
+from app.storage.variants import VariantStore
 
-__all__ = ["GCSStorage", "LocalStorage"]
+__all__ = ["GCSStorage", "LocalStorage", "ReferenceAssetStore", "ResponseCache", "VariantStore"]
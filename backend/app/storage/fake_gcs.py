@@ -0,0 +1,116 @@
+"""Local filesystem stand-in for a google-cloud-storage bucket.
+
+Implements the subset of the ``Bucket``/``Blob`` API that ``GCSStorage`` and
+``RangeDownloader`` use, backed by a directory on disk.  Enable it for
+offline development by setting ``GCS_FAKE_ROOT``; benchmarks and ad-hoc
+checks can also construct it directly and inject latency, per-stream
+bandwidth limits and transient failures.
+"""
+
+import base64
+import random
+import time
+from pathlib import Path
+
+import google_crc32c
+
+
+class FakeTransientError(ConnectionError):
+    """Injected failure, shaped like a dropped connection."""
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.size: int | None = None
+        self.crc32c: str | None = None
+        self.generation: int | None = None
+
+    @property
+    def _path(self) -> Path:
+        return self.bucket.root / self.name
+
+    def exists(self) -> bool:
+        return self._path.is_file()
+
+    def reload(self) -> None:
+        if not self.exists():
+            raise FileNotFoundError(f"gs://{self.bucket.name}/{self.name}")
+        stat = self._path.stat()
+        self.size = stat.st_size
+        self.generation = stat.st_mtime_ns
+        crc = google_crc32c.Checksum()
+        with open(self._path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                crc.update(chunk)
+        self.crc32c = base64.b64encode(crc.digest()).decode("ascii")
+
+    def upload_from_filename(self, filename: str, content_type: str | None = None) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_bytes(Path(filename).read_bytes())
+
+    def upload_from_string(self, data: bytes | str, content_type: str | None = None) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_bytes(data.encode() if isinstance(data, str) else data)
+
+    def delete(self) -> None:
+        if not self.exists():
+            raise FileNotFoundError(f"gs://{self.bucket.name}/{self.name}")
+        self._path.unlink()
+
+    def download_as_bytes(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        if_generation_match: int | None = None,
+    ) -> bytes:
+        """Read a byte range; like GCS, *end* is inclusive."""
+        if if_generation_match is not None and self._path.stat().st_mtime_ns != if_generation_match:
+            raise FileNotFoundError(f"Generation mismatch for gs://{self.bucket.name}/{self.name}")
+        with open(self._path, "rb") as f:
+            f.seek(start or 0)
+            length = -1 if end is None else end - (start or 0) + 1
+            data = f.read(length)
+        self.bucket._simulate_transfer(len(data))
+        return data
+
+    def download_to_filename(self, filename: str) -> None:
+        data = self.download_as_bytes()
+        Path(filename).write_bytes(data)
+
+
+class FakeBucket:
+    def __init__(
+        self,
+        root: str,
+        name: str = "fake-bucket",
+        latency: float = 0.0,
+        stream_bandwidth: float | None = None,
+        failure_rate: float = 0.0,
+    ):
+        """
+        Args:
+            latency: Seconds added to every read request.
+            stream_bandwidth: Bytes/second a single read can sustain; None
+                means unlimited.
+            failure_rate: Probability that a read raises FakeTransientError.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.latency = latency
+        self.stream_bandwidth = stream_bandwidth
+        self.failure_rate = failure_rate
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+    def _simulate_transfer(self, nbytes: int) -> None:
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise FakeTransientError("Injected transient read failure")
+        delay = self.latency
+        if self.stream_bandwidth:
+            delay += nbytes / self.stream_bandwidth
+        if delay:
+            time.sleep(delay)
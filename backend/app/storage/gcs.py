@@ -1,13 +1,80 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 
+import google_crc32c
 from google.cloud import storage
 
+from app.storage.downloader import RangeDownloader
+from app.storage.fake_gcs import FakeBucket
+
+logger = logging.getLogger(__name__)
+
+
+def _file_digests(path: str) -> tuple[str, str]:
+    """Return (sha256 hex, base64 crc32c) for a local file in one pass."""
+    sha = hashlib.sha256()
+    crc = google_crc32c.Checksum()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+            crc.update(chunk)
+    return sha.hexdigest(), base64.b64encode(crc.digest()).decode("ascii")
+
 
 class GCSStorage:
-    def __init__(self, bucket_name: str, project_id: str):
-        self.client = storage.Client(project=project_id)
-        self.bucket = self.client.bucket(bucket_name)
-        self.bucket_name = bucket_name
+    def __init__(
+        self,
+        bucket_name: str,
+        project_id: str,
+        index_path: str | None = None,
+        global_dedup: bool = False,
+        downloader: RangeDownloader | None = None,
+        fake_root: str = "",
+        index_max_entries: int = 50_000,
+        index_flush_interval: float = 30.0,
+    ):
+        """
+        Args:
+            index_max_entries: Upload index size; the least recently used
+                entries are evicted beyond it.
+            index_flush_interval: Minimum seconds between index file writes;
+                ``flush_index`` writes pending changes immediately.
+        """
+        if fake_root:
+            # Offline mode: a local directory stands in for the bucket
+            self.client = None
+            self.bucket = FakeBucket(fake_root, name=bucket_name or "fake-bucket")
+        else:
+            self.client = storage.Client(project=project_id)
+            self.bucket = self.client.bucket(bucket_name)
+        self.bucket_name = bucket_name or self.bucket.name
+        self.downloader = downloader or RangeDownloader()
+
+        # Content-addressed upload index: "<scope>:<sha256>" -> gs:// URI, in
+        # least- to most-recently used order, plus the reverse URI -> keys map
+        self.index_path = Path(index_path) if index_path else None
+        self.global_dedup = global_dedup
+        self.index_max_entries = index_max_entries
+        self.index_flush_interval = index_flush_interval
+        self._index: OrderedDict[str, str] = OrderedDict()
+        self._keys_by_uri: dict[str, set[str]] = {}
+        self._index_lock = threading.Lock()
+        self._index_dirty = False
+        self._index_flushed_at = time.monotonic()
+        self._upload_stats = {"hits": 0, "remote_hits": 0, "misses": 0, "bytes_skipped": 0}
+        if self.index_path and self.index_path.exists():
+            try:
+                for key, uri in json.loads(self.index_path.read_text()).items():
+                    self._put(key, uri)
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning("Ignoring unreadable GCS upload index %s: %s", self.index_path, exc)
 
     def upload_bytes(
         self, data: bytes, dest_path: str, content_type: str = "image/png"
@@ -21,12 +88,121 @@ class GCSStorage:
         blob.upload_from_filename(source_path)
         return f"gs://{self.bucket_name}/{dest_path}"
 
+    def upload_file_cached(self, source_path: str, dest_path: str, scope: str) -> str:
+        """Upload a file unless identical content is already in GCS.
+
+        Content is keyed by sha256 per *scope* (typically the run_id), and
+        also globally when ``global_dedup`` is enabled.  An index hit returns
+        the recorded URI without touching GCS.  On a miss the destination
+        blob is checked first: if it exists with a matching crc32c the
+        upload is skipped.
+        """
+        sha, crc = _file_digests(source_path)
+        size = Path(source_path).stat().st_size
+        scoped_key = f"{scope}:{sha}"
+        global_key = f"*:{sha}"
+
+        with self._index_lock:
+            uri = self._index.get(scoped_key)
+            if uri is None and self.global_dedup:
+                uri = self._index.get(global_key)
+            if uri is not None:
+                for key in (scoped_key, global_key):
+                    if key in self._index:
+                        self._index.move_to_end(key)
+                self._upload_stats["hits"] += 1
+                self._upload_stats["bytes_skipped"] += size
+                return uri
+
+        blob = self.bucket.blob(dest_path)
+        uri = f"gs://{self.bucket_name}/{dest_path}"
+        if blob.exists():
+            blob.reload()
+            if blob.crc32c == crc:
+                self._record(uri, scoped_key, global_key, "remote_hits", size)
+                return uri
+
+        blob.upload_from_filename(source_path)
+        self._record(uri, scoped_key, global_key, "misses", 0)
+        return uri
+
+    def _record(
+        self, uri: str, scoped_key: str, global_key: str, outcome: str, bytes_skipped: int
+    ) -> None:
+        with self._index_lock:
+            self._upload_stats[outcome] += 1
+            self._upload_stats["bytes_skipped"] += bytes_skipped
+            # The blob at this URI now holds new content; forget older hashes
+            for key in self._keys_by_uri.pop(uri, set()):
+                self._index.pop(key, None)
+            self._put(scoped_key, uri)
+            self._put(global_key, uri)
+            self._index_dirty = True
+            if time.monotonic() - self._index_flushed_at >= self.index_flush_interval:
+                self._write_index()
+
+    def _put(self, key: str, uri: str) -> None:
+        """Index *key* -> *uri*, evicting the least recently used entries."""
+        old = self._index.pop(key, None)
+        if old is not None:
+            self._discard_key(old, key)
+        self._index[key] = uri
+        self._keys_by_uri.setdefault(uri, set()).add(key)
+        while len(self._index) > self.index_max_entries:
+            evicted, evicted_uri = self._index.popitem(last=False)
+            self._discard_key(evicted_uri, evicted)
+
+    def _discard_key(self, uri: str, key: str) -> None:
+        keys = self._keys_by_uri.get(uri)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_uri[uri]
+
+    def flush_index(self) -> None:
+        """Write pending upload index changes to disk."""
+        with self._index_lock:
+            if self._index_dirty:
+                self._write_index()
+
+    def _write_index(self) -> None:
+        # Caller holds _index_lock
+        self._index_flushed_at = time.monotonic()
+        if not self.index_path:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps(self._index))
+            os.replace(tmp_path, self.index_path)
+        except OSError as exc:
+            logger.warning("Failed to write GCS upload index %s: %s", self.index_path, exc)
+            return
+        self._index_dirty = False
+
+    def upload_stats(self) -> dict:
+        with self._index_lock:
+            stats = dict(self._upload_stats)
+            stats["indexed_blobs"] = len(self._keys_by_uri)
+        lookups = stats["hits"] + stats["remote_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            round((stats["hits"] + stats["remote_hits"]) / lookups, 3) if lookups else 0.0
+        )
+        return stats
+
+    def content_sha256(self, gcs_uri: str) -> str | None:
+        """sha256 of what ``upload_file_cached`` last wrote to *gcs_uri*, if indexed."""
+        with self._index_lock:
+            keys = self._keys_by_uri.get(gcs_uri)
+            return next(iter(keys)).split(":", 1)[1] if keys else None
+
+    def delete(self, gcs_uri: str) -> None:
+        self.bucket.blob(gcs_uri.replace(f"gs://{self.bucket_name}/", "")).delete()
+
     def download_to_local(self, gcs_uri: str, local_path: str) -> str:
         blob_path = gcs_uri.replace(f"gs://{self.bucket_name}/", "")
         blob = self.bucket.blob(blob_path)
-        Path(local_path).parent.mkdir(parents=True, exist_ok=True)
-        blob.download_to_filename(local_path)
-        return local_path
+        return self.downloader.download(blob, local_path)
 
     def get_veo_output_uri(self, run_id: str) -> str:
         return f"gs://{self.bucket_name}/pipeline/{run_id}/videos/"
@@ -0,0 +1,103 @@
+"""Run-scoped reference assets uploaded once and passed to Gemini by URI.
+
+In ``gcs`` asset mode, each reference image of a run (avatar, product,
+after preparation) is uploaded once under
+``pipeline/<run_id>/refs/<sha256[:16]>.<ext>`` and later calls reference
+the ``gs://`` URI instead of inlining base64 bytes per scene and attempt.
+Uploads are memoized per (run, content hash) as shared tasks, so scenes
+running concurrently wait on a single upload.  ``release`` deletes a
+run's uploads once it is finished.  With ``gcs_fake_root`` set, the local
+fake bucket stands in for GCS.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+
+from app.storage.gcs import GCSStorage
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/heic": "heic",
+    "image/heif": "heif",
+}
+
+
+class ReferenceAssetStore:
+    def __init__(self, gcs: GCSStorage, max_runs: int = 64):
+        self.gcs = gcs
+        self.max_runs = max_runs
+        self._runs: OrderedDict[str, dict[str, asyncio.Task]] = OrderedDict()
+        self._stats = {
+            "uploads": 0,
+            "reuses": 0,
+            "upload_failures": 0,
+            "bytes_uploaded": 0,
+            "bytes_not_resent": 0,
+            "deleted": 0,
+        }
+
+    async def uri(self, run_id: str, data: bytes, mime_type: str) -> str:
+        """Return the gs:// URI of *data* for *run_id*, uploading it on first use."""
+        assets = self._runs.get(run_id)
+        if assets is None:
+            assets = self._runs[run_id] = {}
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+        else:
+            self._runs.move_to_end(run_id)
+
+        digest = hashlib.sha256(data).hexdigest()
+        task = assets.get(digest)
+        if task is None:
+            task = assets[digest] = asyncio.ensure_future(
+                self._upload(run_id, digest, data, mime_type)
+            )
+        else:
+            self._stats["reuses"] += 1
+            self._stats["bytes_not_resent"] += len(data)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # Let the next call retry the upload
+            if assets.get(digest) is task:
+                del assets[digest]
+            raise
+
+    async def _upload(self, run_id: str, digest: str, data: bytes, mime_type: str) -> str:
+        ext = _EXTENSIONS.get(mime_type, "bin")
+        dest_path = f"pipeline/{run_id}/refs/{digest[:16]}.{ext}"
+        try:
+            uri = await asyncio.to_thread(self.gcs.upload_bytes, data, dest_path, mime_type)
+        except Exception:
+            self._stats["upload_failures"] += 1
+            raise
+        self._stats["uploads"] += 1
+        self._stats["bytes_uploaded"] += len(data)
+        logger.info("Uploaded reference asset %s (%d bytes)", uri, len(data))
+        return uri
+
+    async def release(self, run_id: str) -> None:
+        """Forget the URIs recorded for *run_id* and delete their blobs.
+
+        A later call for the run uploads its references again.
+        """
+        assets = self._runs.pop(run_id, None)
+        if not assets:
+            return
+        results = await asyncio.gather(*assets.values(), return_exceptions=True)
+        uris = [uri for uri in results if isinstance(uri, str)]
+        for uri in uris:
+            try:
+                await asyncio.to_thread(self.gcs.delete, uri)
+            except Exception as exc:
+                logger.warning("Failed to delete reference asset %s: %s", uri, exc)
+        self._stats["deleted"] += len(uris)
+
+    def stats(self) -> dict:
+        return {**self._stats, "tracked_runs": len(self._runs)}
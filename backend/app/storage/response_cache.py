@@ -0,0 +1,95 @@
+"""Content-addressed on-disk cache for JSON model responses.
+
+Entries are stored as ``<sha256>.json`` files under a directory and keyed by
+a digest of everything that determines the response (input hashes,
+parameters, model ID, prompt version).  Reads refresh the file's mtime so
+eviction is least-recently-used; entries older than the TTL are treated as
+misses and removed.  The directory is shared by every process using the same
+output dir.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(**parts) -> str:
+    """Stable digest of keyword parts (values must be JSON-serialisable)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, root: str, max_bytes: int, ttl_seconds: float):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except FileNotFoundError:
+            self._stats["misses"] += 1
+            return None
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Dropping unreadable cache entry %s: %s", path.name, exc)
+            path.unlink(missing_ok=True)
+            self._stats["misses"] += 1
+            return None
+
+        if time.time() - entry.get("stored_at", 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None
+
+        # Touch for LRU ordering
+        os.utime(path)
+        self._stats["hits"] += 1
+        return entry["value"]
+
+    def put(self, key: str, value: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"stored_at": time.time(), "value": value}))
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for path in self.root.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                self._stats["evicted"] += 1
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        files = list(self.root.glob("*.json")) if self.root.exists() else []
+        stats["entries"] = len(files)
+        stats["bytes"] = sum(f.stat().st_size for f in files if f.exists())
+        return stats
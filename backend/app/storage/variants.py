@@ -0,0 +1,131 @@
+"""Lazy store for Veo video variants.
+
+Veo writes every variant to GCS, but only the QC winner is needed locally.
+Variants are recorded by GCS URI in a per-scene manifest and downloaded
+only when something asks for them (the selected winner, a reviewer opening
+a variant through the proxy endpoint, or ``select_variant``).  Lazily
+materialized files are tracked in an LRU and evicted once the cache exceeds
+its byte budget; pinned files (scene winners) are never evicted.  Pins are
+kept in the manifest, and the LRU is rebuilt from the files on disk at
+startup.
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+
+from app.storage.gcs import GCSStorage
+from app.storage.local import LocalStorage
+
+logger = logging.getLogger(__name__)
+
+
+class VariantStore:
+    def __init__(self, local: LocalStorage, gcs: GCSStorage, max_cached_bytes: int):
+        self.local = local
+        self.gcs = gcs
+        self.max_cached_bytes = max_cached_bytes
+        self._inflight: dict[Path, asyncio.Task] = {}
+        # Evictable (unpinned) local files -> size in bytes, oldest first
+        self._lru: OrderedDict[Path, int] = OrderedDict()
+        self._seed()
+
+    def _seed(self) -> None:
+        """Track unpinned variant files left by earlier processes, oldest first."""
+        files = []
+        for manifest_path in self.local.base_dir.glob("*/scenes/scene_*/video_variants/manifest.json"):
+            try:
+                pinned = json.loads(manifest_path.read_text()).get("pinned", [])
+            except (OSError, json.JSONDecodeError):
+                continue
+            pinned_names = {f"variant_{i}.mp4" for i in pinned}
+            for path in manifest_path.parent.glob("variant_*.mp4"):
+                if path.name not in pinned_names:
+                    stat = path.stat()
+                    files.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(files):
+            self._lru[path] = size
+        if files:
+            logger.info("Tracking %d cached video variants from disk", len(files))
+            self._evict()
+
+    def _subdir(self, scene_number: int) -> str:
+        return f"scenes/scene_{scene_number}/video_variants"
+
+    def local_path(self, run_id: str, scene_number: int, index: int) -> Path:
+        return self.local.get_path(run_id, f"variant_{index}.mp4", subdir=self._subdir(scene_number))
+
+    def proxy_url(self, run_id: str, scene_number: int, index: int) -> str:
+        return f"/api/v1/assets/{run_id}/video-variants/{scene_number}/{index}"
+
+    def _manifest_path(self, run_id: str, scene_number: int) -> Path:
+        return self.local.get_path(run_id, "manifest.json", subdir=self._subdir(scene_number))
+
+    def _load_manifest(self, run_id: str, scene_number: int) -> dict:
+        path = self._manifest_path(run_id, scene_number)
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text())
+
+    def record_variants(self, run_id: str, scene_number: int, gcs_uris: list[str]) -> None:
+        """Record a new round of variants, dropping stale local copies."""
+        manifest_path = self._manifest_path(run_id, scene_number)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in manifest_path.parent.glob("variant_*.mp4"):
+            self._lru.pop(stale, None)
+            stale.unlink(missing_ok=True)
+        manifest = {str(i): uri for i, uri in enumerate(gcs_uris)}
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+
+    def gcs_uri(self, run_id: str, scene_number: int, index: int) -> str | None:
+        return self._load_manifest(run_id, scene_number).get(str(index))
+
+    async def materialize(self, run_id: str, scene_number: int, index: int) -> Path:
+        """Return the local path for a variant, downloading it on first use.
+
+        Concurrent requests for the same variant share one download.
+        """
+        path = self.local_path(run_id, scene_number, index)
+        if path.exists() and path not in self._inflight:
+            if path in self._lru:
+                self._lru.move_to_end(path)
+            return path
+
+        task = self._inflight.get(path)
+        if task is None:
+            uri = self.gcs_uri(run_id, scene_number, index)
+            if uri is None:
+                raise FileNotFoundError(
+                    f"Variant {index} not found for scene {scene_number}"
+                )
+            task = asyncio.create_task(self._download(uri, path))
+            self._inflight[path] = task
+        return await asyncio.shield(task)
+
+    async def _download(self, uri: str, path: Path) -> Path:
+        try:
+            await asyncio.to_thread(self.gcs.download_to_local, uri, str(path))
+        finally:
+            self._inflight.pop(path, None)
+        self._lru[path] = path.stat().st_size
+        self._evict()
+        return path
+
+    def pin(self, run_id: str, scene_number: int, index: int) -> None:
+        """Exclude a variant's local file from eviction (e.g. the scene winner)."""
+        self._lru.pop(self.local_path(run_id, scene_number, index), None)
+        manifest = self._load_manifest(run_id, scene_number)
+        pinned = manifest.get("pinned", [])
+        if index not in pinned:
+            manifest["pinned"] = [*pinned, index]
+            self._manifest_path(run_id, scene_number).write_text(json.dumps(manifest, indent=2))
+
+    def _evict(self) -> None:
+        total = sum(self._lru.values())
+        while total > self.max_cached_bytes and len(self._lru) > 1:
+            path, size = self._lru.popitem(last=False)
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.info("Evicted cached video variant %s (%d bytes)", path, size)
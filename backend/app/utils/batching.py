@@ -0,0 +1,101 @@
+"""Async micro-batcher.
+
+Callers ``submit`` items under a group key; items for the same group that
+arrive within ``window`` seconds of the first one (or until ``max_size`` is
+reached) are flushed together through one ``flush`` call, and each caller
+gets back its own result.
+
+When the caller knows how many submitters a group can have (``expected``),
+a group is flushed as soon as all of them submitted, so a lone submitter
+never waits out the window.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        flush: Callable[[Hashable, list[Any]], Awaitable[list[Any]]],
+        window: float = 1.0,
+        max_size: int = 8,
+        expected: Callable[[Hashable], int | None] | None = None,
+    ):
+        """
+        Args:
+            flush: ``flush(group, items)`` returning one result per item, in
+                order.  An exception fails every item in the batch.
+            expected: ``expected(group)`` returning how many items the group
+                can get at most right now, or None if unknown.
+        """
+        self.flush = flush
+        self.window = window
+        self.max_size = max_size
+        self.expected = expected
+        self._pending: dict[Hashable, list[tuple[Any, asyncio.Future]]] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        # Running flushes; the loop only keeps weak references to tasks
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, group: Hashable, item: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(group, [])
+        pending.append((item, future))
+        if self._full(group):
+            self._dispatch(group)
+        elif group not in self._timers:
+            self._timers[group] = asyncio.get_running_loop().call_later(
+                self.window, self._dispatch, group
+            )
+        return await future
+
+    def recheck(self) -> None:
+        """Flush groups that are now complete, e.g. after a submitter left."""
+        for group in [g for g in self._pending if self._full(g)]:
+            self._dispatch(group)
+
+    def _full(self, group: Hashable) -> bool:
+        limit = self.max_size
+        expected = self.expected(group) if self.expected else None
+        if expected is not None:
+            limit = min(limit, max(expected, 1))
+        return len(self._pending.get(group, ())) >= limit
+
+    def _dispatch(self, group: Hashable) -> None:
+        timer = self._timers.pop(group, None)
+        if timer:
+            timer.cancel()
+        batch = self._pending.pop(group, [])
+        if batch:
+            task = asyncio.create_task(self._run(group, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, group: Hashable, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.flush(group, [item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch flush returned {len(results)} results for {len(batch)} items")
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
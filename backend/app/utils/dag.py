@@ -0,0 +1,154 @@
+"""Async task graph with per-stage concurrency limits.
+
+Nodes are coroutine factories keyed by a hashable id.  ``run`` starts every
+node as soon as its dependencies have succeeded, so independent chains (e.g.
+the storyboard -> video -> stitch prep units of different scenes) progress
+at their own pace instead of stage by stage.
+
+* ``deps``: nodes that must succeed; if one fails, the node is skipped with
+  ``DependencyFailed`` and so are its own dependents.
+* ``after``: ordering-only dependencies; the node waits for them to finish
+  but runs whatever their outcome.
+* ``stage``: nodes of a stage listed in ``limits`` share a semaphore, which
+  is acquired only once the dependencies are met.
+
+Failures are isolated to the nodes downstream of them; ``run`` returns each
+node's result or exception.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyFailed(Exception):
+    """A node was skipped because one of its dependencies failed."""
+
+    def __init__(self, node: Hashable, dependency: Hashable):
+        super().__init__(f"{node} skipped: dependency {dependency} failed")
+        self.node = node
+        self.dependency = dependency
+
+
+class _Node:
+    def __init__(self, fn, deps, after, stage):
+        self.fn = fn
+        self.deps = list(deps)
+        self.after = list(after)
+        self.stage = stage
+
+
+class TaskGraph:
+    def __init__(
+        self,
+        limits: dict[str, int] | None = None,
+        on_start: Callable[[Hashable, str | None], None] | None = None,
+        on_done: Callable[[Hashable, str | None, Any], None] | None = None,
+    ):
+        """
+        Args:
+            limits: Maximum concurrently running nodes per stage.
+            on_start: ``on_start(node, stage)`` when a node begins running.
+            on_done: ``on_done(node, stage, outcome)`` when a node finishes,
+                fails or is skipped; *outcome* is the result or exception.
+        """
+        self.limits = limits or {}
+        self.on_start = on_start
+        self.on_done = on_done
+        self._nodes: dict[Hashable, _Node] = {}
+        self.timings: dict[Hashable, tuple[float, float]] = {}
+
+    def add(
+        self,
+        node: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        deps: Iterable[Hashable] = (),
+        after: Iterable[Hashable] = (),
+        stage: str | None = None,
+    ) -> None:
+        if node in self._nodes:
+            raise ValueError(f"Duplicate task graph node {node}")
+        self._nodes[node] = _Node(fn, deps, after, stage)
+
+    async def run(self) -> dict[Hashable, Any]:
+        """Run every node; returns ``{node: result or exception}``."""
+        for node, spec in self._nodes.items():
+            for dep in spec.deps + spec.after:
+                if dep not in self._nodes:
+                    raise ValueError(f"Node {node} depends on unknown node {dep}")
+
+        semaphores = {stage: asyncio.Semaphore(n) for stage, n in self.limits.items()}
+        tasks: dict[Hashable, asyncio.Task] = {}
+        started = time.monotonic()
+
+        async def run_node(node: Hashable, spec: _Node) -> Any:
+            try:
+                waits = [tasks[d] for d in spec.deps + spec.after]
+                if waits:
+                    await asyncio.wait(waits)
+                for dep in spec.deps:
+                    if tasks[dep].cancelled() or tasks[dep].exception() is not None:
+                        raise DependencyFailed(node, dep)
+
+                semaphore = semaphores.get(spec.stage)
+                if semaphore:
+                    await semaphore.acquire()
+                try:
+                    begin = time.monotonic() - started
+                    if self.on_start:
+                        self.on_start(node, spec.stage)
+                    result = await spec.fn()
+                    self.timings[node] = (begin, time.monotonic() - started)
+                finally:
+                    if semaphore:
+                        semaphore.release()
+            except asyncio.CancelledError as exc:
+                if self.on_done:
+                    self.on_done(node, spec.stage, exc)
+                raise
+            except Exception as exc:
+                if not isinstance(exc, DependencyFailed):
+                    logger.warning("Task graph node %s failed: %s", node, exc)
+                if self.on_done:
+                    self.on_done(node, spec.stage, exc)
+                raise
+            if self.on_done:
+                self.on_done(node, spec.stage, result)
+            return result
+
+        for node, spec in self._nodes.items():
+            tasks[node] = asyncio.create_task(run_node(node, spec))
+        try:
+            await asyncio.wait(tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            # Let cancelled nodes unwind (on_done callbacks, semaphore
+            # releases) before the caller sees the graph finish
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        outcomes: dict[Hashable, Any] = {}
+        for node, task in tasks.items():
+            if task.cancelled():
+                outcomes[node] = asyncio.CancelledError(f"{node} was cancelled")
+            else:
+                outcomes[node] = task.exception() or task.result()
+        return outcomes
+
+    def critical_path_seconds(self) -> float:
+        """Longest chain of node run times along ``deps``/``after`` edges."""
+        memo: dict[Hashable, float] = {}
+
+        def longest(node: Hashable) -> float:
+            if node not in memo:
+                spec = self._nodes[node]
+                begin, end = self.timings.get(node, (0.0, 0.0))
+                memo[node] = (end - begin) + max(
+                    (longest(d) for d in spec.deps + spec.after), default=0.0
+                )
+            return memo[node]
+
+        return max((longest(node) for node in self._nodes), default=0.0)
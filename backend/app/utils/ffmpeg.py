@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import re
 import shutil
 import subprocess
 import tempfile
@@ -65,7 +66,89 @@ async def extract_last_frame(video_path: str, output_path: str) -> str:
     return output_path
 
 
-async def _preprocess_video(input_path: str, output_path: str) -> str:
+async def extract_first_frame(video_path: str, output_path: str) -> str:
+    """Extract the first frame from a video as a PNG image."""
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        "ffmpeg", "-y",
+        "-i", video_path,
+        "-frames:v", "1",
+        "-update", "1",
+        output_path,
+    ]
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg extract_first_frame failed: {stderr.decode()[-500:]}")
+    return output_path
+
+
+async def frame_similarity(image_a: str, image_b: str) -> float:
+    """Return the SSIM (0-1) between two images using ffmpeg's ssim filter.
+
+    image_b is scaled to image_a's dimensions first so frames from clips
+    with different resolutions can still be compared.
+    """
+    cmd = [
+        "ffmpeg",
+        "-i", image_a,
+        "-i", image_b,
+        "-lavfi", "[1:v][0:v]scale2ref[b][a];[a][b]ssim",
+        "-f", "null", "-",
+    ]
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    output = stderr.decode()
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg ssim failed: {output[-500:]}")
+    match = re.search(r"All:([0-9.]+)", output)
+    if not match:
+        raise RuntimeError(f"ffmpeg ssim produced no score: {output[-500:]}")
+    return float(match.group(1))
+
+
+async def transcode_image(
+    data: bytes,
+    width: int,
+    height: int,
+    output_format: str = "jpeg",
+    jpeg_qscale: int = 3,
+) -> bytes:
+    """Scale an encoded image to width x height and re-encode it in memory.
+
+    output_format is ``"jpeg"`` (qscale 2-31, lower is better) or ``"png"``
+    for images that need their alpha channel.
+    """
+    codec = ["-c:v", "mjpeg", "-q:v", str(jpeg_qscale)] if output_format == "jpeg" else ["-c:v", "png"]
+    cmd = [
+        "ffmpeg", "-v", "error",
+        "-i", "pipe:0",
+        "-vf", f"scale={width}:{height}:flags=lanczos",
+        "-frames:v", "1",
+        *codec,
+        "-f", "image2pipe", "pipe:1",
+    ]
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate(data)
+    if proc.returncode != 0 or not stdout:
+        raise RuntimeError(f"ffmpeg transcode_image failed: {stderr.decode()[-500:]}")
+    return stdout
+
+
+async def preprocess_video(input_path: str, output_path: str) -> str:
     """Re-encode a single video to ensure CFR and consistent format.
 
     Veo 3.1 outputs can have VFR timestamps that break xfade.
@@ -91,13 +174,32 @@ async def _preprocess_video(input_path: str, output_path: str) -> str:
     return output_path
 
 
+async def _to_cfr(video_paths: list[str], tmpdir: str, preprocessed: bool) -> list[str]:
+    """CFR copies of *video_paths* in *tmpdir*, or the inputs if already CFR."""
+    if preprocessed:
+        return list(video_paths)
+    cfr_paths: list[str] = []
+    preprocess_tasks = []
+    for i, path in enumerate(video_paths):
+        cfr_path = str(Path(tmpdir) / f"cfr_{i}.mp4")
+        cfr_paths.append(cfr_path)
+        preprocess_tasks.append(preprocess_video(path, cfr_path))
+    await asyncio.gather(*preprocess_tasks)
+    logger.info("Pre-processed %d videos to CFR", len(cfr_paths))
+    return cfr_paths
+
+
 async def concat_videos(
-    video_paths: list[str], output_path: str, crossfade_duration: float = 0.5
+    video_paths: list[str],
+    output_path: str,
+    crossfade_duration: float = 0.5,
+    preprocessed: bool = False,
 ) -> str:
     """Concatenate multiple videos with crossfade transitions.
 
     Strategy:
-    1. Pre-process each video to CFR 24fps (Veo outputs can be VFR)
+    1. Pre-process each video to CFR 24fps (Veo outputs can be VFR), unless
+       *preprocessed* says the inputs already went through preprocess_video
     2. If 6+ videos, use simple concat demuxer (xfade gets unstable with many inputs)
     3. Otherwise use xfade filter for smooth transitions
     """
@@ -112,15 +214,7 @@ async def concat_videos(
 
     # Pre-process all videos to CFR
     with tempfile.TemporaryDirectory() as tmpdir:
-        cfr_paths: list[str] = []
-        preprocess_tasks = []
-        for i, path in enumerate(video_paths):
-            cfr_path = str(Path(tmpdir) / f"cfr_{i}.mp4")
-            cfr_paths.append(cfr_path)
-            preprocess_tasks.append(_preprocess_video(path, cfr_path))
-
-        await asyncio.gather(*preprocess_tasks)
-        logger.info("Pre-processed %d videos to CFR", len(cfr_paths))
+        cfr_paths = await _to_cfr(video_paths, tmpdir, preprocessed)
 
         if len(video_paths) <= 3:
             # Use xfade for small number of videos
@@ -234,6 +328,7 @@ async def concat_videos_with_transitions(
     video_paths: list[str],
     output_path: str,
     transitions: list[dict],
+    preprocessed: bool = False,
 ) -> str:
     """Concatenate videos using per-scene transition types and durations.
 
@@ -245,6 +340,7 @@ async def concat_videos_with_transitions(
     so len(transitions) should be len(video_paths) - 1.
 
     Falls back to concat_videos() if anything goes wrong with xfade.
+    *preprocessed* skips the CFR pass, as in concat_videos().
     """
     if not video_paths:
         raise ValueError("No video paths provided")
@@ -264,13 +360,7 @@ async def concat_videos_with_transitions(
 
     # Pre-process all videos to CFR
     with tempfile.TemporaryDirectory() as tmpdir:
-        cfr_paths: list[str] = []
-        preprocess_tasks = []
-        for i, path in enumerate(video_paths):
-            cfr_path = str(Path(tmpdir) / f"cfr_{i}.mp4")
-            cfr_paths.append(cfr_path)
-            preprocess_tasks.append(_preprocess_video(path, cfr_path))
-        await asyncio.gather(*preprocess_tasks)
+        cfr_paths = await _to_cfr(video_paths, tmpdir, preprocessed)
 
         # Check if any transitions are "cut" (no effect) — those get 0 duration
         # If all are cuts, use simple demuxer
@@ -0,0 +1,106 @@
+"""Lightweight image header inspection (format, dimensions, transparency).
+
+Reads only the container headers, so the real MIME type of an uploaded
+reference can be determined without decoding it.
+"""
+
+import struct
+from dataclasses import dataclass
+
+# Formats Gemini accepts as inline image parts
+GEMINI_IMAGE_MIME_TYPES = {"image/png", "image/jpeg", "image/webp", "image/heic", "image/heif"}
+
+
+@dataclass
+class ImageInfo:
+    mime_type: str
+    width: int | None = None
+    height: int | None = None
+    has_alpha: bool = False
+
+
+def sniff_mime(data: bytes, default: str = "image/png") -> str:
+    """Detect the image MIME type from magic bytes."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if data[4:8] == b"ftyp":
+        brand = data[8:12]
+        if brand in (b"heic", b"heix", b"heim", b"heis"):
+            return "image/heic"
+        if brand in (b"mif1", b"msf1"):
+            return "image/heif"
+        if brand == b"avif":
+            return "image/avif"
+    return default
+
+
+def _png_info(data: bytes) -> ImageInfo:
+    width, height, _, color_type = struct.unpack(">IIBB", data[16:26])
+    # Color types 4 and 6 carry an alpha channel; a tRNS chunk adds
+    # transparency to palette/greyscale/RGB images
+    has_alpha = color_type in (4, 6) or b"tRNS" in data[: data.find(b"IDAT")]
+    return ImageInfo("image/png", width, height, has_alpha)
+
+
+def _jpeg_info(data: bytes) -> ImageInfo:
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        # SOF0..SOF15, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[i + 5 : i + 9])
+            return ImageInfo("image/jpeg", width, height)
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        (length,) = struct.unpack(">H", data[i + 2 : i + 4])
+        i += 2 + length
+    return ImageInfo("image/jpeg")
+
+
+def _webp_info(data: bytes) -> ImageInfo:
+    chunk = data[12:16]
+    if chunk == b"VP8X":
+        has_alpha = bool(data[20] & 0x10)
+        width = 1 + int.from_bytes(data[24:27], "little")
+        height = 1 + int.from_bytes(data[27:30], "little")
+        return ImageInfo("image/webp", width, height, has_alpha)
+    if chunk == b"VP8L":
+        bits = int.from_bytes(data[21:25], "little")
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+        return ImageInfo("image/webp", width, height, bool(bits >> 28 & 1))
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", data[26:30])
+        return ImageInfo("image/webp", width & 0x3FFF, height & 0x3FFF)
+    return ImageInfo("image/webp")
+
+
+def probe_image(data: bytes) -> ImageInfo:
+    """Return the format, dimensions and transparency of an encoded image.
+
+    Dimensions are None when the header cannot be parsed.
+    """
+    mime_type = sniff_mime(data, default="application/octet-stream")
+    try:
+        if mime_type == "image/png":
+            return _png_info(data)
+        if mime_type == "image/jpeg":
+            return _jpeg_info(data)
+        if mime_type == "image/webp":
+            return _webp_info(data)
+        if mime_type == "image/gif":
+            width, height = struct.unpack("<HH", data[6:10])
+            return ImageInfo(mime_type, width, height, has_alpha=True)
+    except (struct.error, IndexError):
+        pass
+    return ImageInfo(mime_type)
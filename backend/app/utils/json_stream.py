@@ -0,0 +1,152 @@
+"""Incremental parser for a streamed top-level JSON object.
+
+``JSONStreamParser.feed`` accepts text chunks as they arrive and returns the
+parts of the object that have become complete since the last call:
+
+* ``("field", key, value)`` once a top-level field's value is closed
+* ``("item", key, index, value)`` once an element of a top-level array is
+  closed, before the array itself is finished
+
+Only completed values are decoded, so each event carries exactly what the
+final document will contain.  Text before the opening brace (e.g. a code
+fence) is ignored.
+"""
+
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class JSONStreamParser:
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._done = False
+        # Top-level object: "key" -> "colon" -> "value" -> "in_value"/"after"
+        self._state = "key"
+        self._key: str | None = None
+        self._key_start = 0
+        self._value_start = 0
+        # Elements of a top-level array value
+        self._in_array = False
+        self._item_state = "item"
+        self._item_start = 0
+        self._items = 0
+
+    def feed(self, text: str) -> list[tuple]:
+        self._buf += text
+        events: list[tuple] = []
+        buf = self._buf
+        while self._pos < len(buf) and not self._done:
+            i = self._pos
+            c = buf[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == "key":
+                        self._key = json.loads(buf[self._key_start : i + 1])
+                        self._state = "colon"
+                continue
+
+            depth = self._depth
+            if depth == 0:
+                if c == "{":
+                    self._depth = 1
+            elif depth == 1:
+                self._top_level(c, i, events)
+            else:
+                self._nested(c, i, events)
+        return events
+
+    def _top_level(self, c: str, i: int, events: list[tuple]) -> None:
+        state = self._state
+        if state == "key":
+            if c == '"':
+                self._in_string = True
+                self._key_start = i
+            elif c == "}":
+                self._depth = 0
+                self._done = True
+        elif state == "colon":
+            if c == ":":
+                self._state = "value"
+        elif state == "value":
+            if c.isspace():
+                return
+            self._value_start = i
+            self._state = "in_value"
+            if c in "{[":
+                self._depth = 2
+                self._in_array = c == "["
+                self._item_state = "item"
+                self._items = 0
+            elif c == '"':
+                self._in_string = True
+        elif state in ("in_value", "after"):
+            # Scalars and strings end at the next separator
+            if c in ",}":
+                if state == "in_value":
+                    self._emit_field(self._buf[self._value_start : i], events)
+                self._state = "key"
+                if c == "}":
+                    self._depth = 0
+                    self._done = True
+
+    def _nested(self, c: str, i: int, events: list[tuple]) -> None:
+        items = self._in_array and self._depth == 2
+        if c in "{[":
+            if items and self._item_state == "item":
+                self._item_start = i
+                self._item_state = "in_item"
+            self._depth += 1
+        elif c in "}]":
+            self._depth -= 1
+            if self._depth == 1:
+                if items and self._item_state == "in_item":
+                    self._emit_item(self._buf[self._item_start : i], events)
+                self._emit_field(self._buf[self._value_start : i + 1], events)
+                self._state = "after"
+                self._in_array = False
+            elif self._in_array and self._depth == 2:
+                self._emit_item(self._buf[self._item_start : i + 1], events)
+                self._item_state = "item"
+        elif items and c == ",":
+            if self._item_state == "in_item":
+                self._emit_item(self._buf[self._item_start : i], events)
+            self._item_state = "item"
+        else:
+            if items and self._item_state == "item" and not c.isspace():
+                # Scalar or string element
+                self._item_start = i
+                self._item_state = "in_item"
+            if c == '"':
+                self._in_string = True
+
+    def _decode(self, text: str) -> tuple[bool, Any]:
+        try:
+            return True, json.loads(text)
+        except json.JSONDecodeError as exc:
+            logger.debug("Skipping undecodable streamed value: %s", exc)
+            return False, None
+
+    def _emit_field(self, text: str, events: list[tuple]) -> None:
+        ok, value = self._decode(text)
+        if ok:
+            events.append(("field", self._key, value))
+
+    def _emit_item(self, text: str, events: list[tuple]) -> None:
+        ok, value = self._decode(text)
+        if ok:
+            events.append(("item", self._key, self._items, value))
+        self._items += 1
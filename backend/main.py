@@ -7,10 +7,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from app.api import assets, bulk, config_api, input, jobs, logs, pipeline, review
+from app.api import assets, bulk, config_api, input, jobs, logs, metrics, pipeline, review
 from app.api.health import router as health_router
 from app.db_migrate import migrate_from_json
-from app.dependencies import get_broadcaster, get_database, get_job_store, get_task_runner
+from app.dependencies import (
+    get_broadcaster,
+    get_database,
+    get_gcs_storage,
+    get_job_store,
+    get_task_runner,
+)
 from app.utils.sse_log_handler import SSELogHandler
 
 logging.basicConfig(
@@ -39,6 +45,10 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    # Persist upload index changes not yet written by the throttled flush
+    if get_gcs_storage.cache_info().currsize:
+        get_gcs_storage().flush_index()
+
 
 app = FastAPI(
     title="Genflow Ad Studio API",
@@ -76,6 +86,7 @@ app.include_router(assets.router)
 app.include_router(config_api.router)
 app.include_router(input.router)
 app.include_router(logs.router)
+app.include_router(metrics.router)
 
 # Serve production frontend build if available
 _static_path = _backend_dir / "static"
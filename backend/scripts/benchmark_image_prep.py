@@ -0,0 +1,123 @@
+"""Benchmark reference-image preparation: payload bytes and call latency.
+
+For each call purpose (qc, script, generation) the script reports the inline
+payload of the original image versus the prepared one, the one-off
+transcode cost, and the upload time at a given client bandwidth.  With
+--live it also times real storyboard QC calls against Gemini, sending the
+original references and then the prepared ones.
+
+Requires ffmpeg.  Without --image a 2K 9:16 test card PNG is generated.
+
+Usage:
+    cd backend
+    source .venv/bin/activate
+    python scripts/benchmark_image_prep.py --image product.jpg --upload-mbps 5
+    python scripts/benchmark_image_prep.py --live --calls 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure backend/ is on sys.path so `app.*` imports work
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.ai.image_prep import ImagePreparer  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.utils.images import probe_image  # noqa: E402
+
+KB = 1024
+MB = 1024 * 1024
+
+
+def _test_card(tmp: str) -> bytes:
+    path = Path(tmp) / "card.png"
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-y",
+            "-f", "lavfi", "-i", "testsrc2=size=1152x2048",
+            "-frames:v", "1", str(path),
+        ],
+        check=True,
+    )
+    return path.read_bytes()
+
+
+async def _prepare_all(preparer: ImagePreparer, data: bytes, upload_bps: float) -> None:
+    info = probe_image(data)
+    print(f"Source: {info.mime_type} {info.width}x{info.height}, {len(data) / KB:.0f} KB")
+    print(f"  {'purpose':<12} {'original':>10} {'prepared':>10} {'ratio':>7} {'prep':>8} {'upload before/after':>22}")
+    for purpose in preparer.max_side:
+        start = time.perf_counter()
+        prepared = await preparer.prepare(data, purpose, run_id="bench")
+        prep = time.perf_counter() - start
+        # Second lookup for the same run is a memo hit
+        await preparer.prepare(data, purpose, run_id="bench")
+        before, after = len(data) / upload_bps, len(prepared.data) / upload_bps
+        print(
+            f"  {purpose:<12} {len(data) / KB:>8.0f}KB {len(prepared.data) / KB:>8.0f}KB "
+            f"{len(prepared.data) / len(data):>7.2f} {prep * 1000:>6.0f}ms "
+            f"{before:>10.2f}s / {after:.2f}s"
+        )
+
+
+async def _live(preparer: ImagePreparer, data: bytes, calls: int) -> None:
+    from google import genai
+
+    from app.ai.gemini import GeminiService
+
+    settings = get_settings()
+    client = genai.Client(vertexai=True, project=settings.project_id, location=settings.region)
+    services = {
+        "original": GeminiService(client, settings),
+        "prepared": GeminiService(client, settings, images=preparer),
+    }
+    for label, svc in services.items():
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await svc.qc_storyboard(data, data, data, run_id="bench")
+            latencies.append(time.perf_counter() - start)
+        print(
+            f"  live qc_storyboard ({label:<8}) median {statistics.median(latencies):.2f}s, "
+            f"max {max(latencies):.2f}s over {calls} calls"
+        )
+
+
+async def _run(preparer: ImagePreparer, data: bytes, args: argparse.Namespace) -> None:
+    # One event loop: the preparer memoizes tasks bound to it
+    await _prepare_all(preparer, data, args.upload_mbps * MB)
+    if args.live:
+        await _live(preparer, data, args.calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--image", help="Reference image to prepare (default: generated 2K PNG)")
+    parser.add_argument("--upload-mbps", type=float, default=5.0, help="Client upload bandwidth (MB/s)")
+    parser.add_argument("--live", action="store_true", help="Also time real QC calls against Gemini")
+    parser.add_argument("--calls", type=int, default=3)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    preparer = ImagePreparer(
+        max_side=settings.image_prep_max_side,
+        jpeg_qscale=settings.image_prep_jpeg_qscale,
+    )
+    if not preparer.enabled:
+        sys.exit("ffmpeg not found on PATH")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Path(args.image).read_bytes() if args.image else _test_card(tmp)
+        asyncio.run(_run(preparer, data, args))
+    print(f"  stats: {preparer.stats()}")
+
+
+if __name__ == "__main__":
+    main()
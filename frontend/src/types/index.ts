@@ -8,6 +8,8 @@ export interface ScriptRequest {
   max_dialogue_words_per_scene?: number;
   custom_instructions?: string;
   run_id?: string;
+  use_cache?: boolean;
+  avatar_selection?: 'manual' | 'gemini' | 'heuristic';
 }
 
 export interface AvatarProfile {
@@ -55,6 +57,7 @@ export interface ScriptResponse {
   run_id: string;
   product_image_path: string;
   script: VideoScript;
+  cached?: boolean;
 }
 
 export interface ScriptUpdateRequest {
@@ -152,7 +155,9 @@ export interface VideoQCReport {
 export interface VideoVariant {
   index: number;
   video_path: string;
+  gcs_uri?: string | null;
   qc_report?: VideoQCReport;
+  qc_rank?: number | null;
 }
 
 export interface VideoResult {
@@ -246,6 +251,8 @@ export interface Job {
   video_results?: VideoResult[];
   final_video_path?: string;
   error?: string;
+  metadata?: Record<string, unknown>;
+  checkpoints?: Record<string, { completed_at: string; artifacts: Record<string, number | null> }>;
 }
 
 export interface LogEntry {